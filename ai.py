@@ -0,0 +1,142 @@
+"""
+Intelligence des monstres, exécutée par la boucle de jeu.
+
+Chaque monstre suit une petite machine à états :
+idle -> chase (un joueur entre dans le rayon d'aggro) -> attack (à portée)
+-> leash (cible perdue ou trop loin du point d'apparition) -> idle.
+
+Le travail d'un tick part des joueurs : seuls les monstres proches d'un
+joueur (requête spatiale dans son instance) et ceux déjà engagés (chase,
+attack, leash) sont examinés ; les zones sans joueur ne coûtent rien. Au plus
+budget monstres sont mis à jour par tick, les moins récemment mis à jour
+d'abord ; un monstre en retard avance du temps écoulé depuis sa dernière
+mise à jour (plafonné).
+"""
+import heapq
+import math
+from typing import Callable, Dict
+
+import config
+
+IDLE = 'idle'
+CHASE = 'chase'
+ATTACK = 'attack'
+LEASH = 'leash'
+
+
+class MonsterAI:
+    """Étape d'IA des monstres ; strike(monstre, joueur) applique une attaque"""
+
+    def __init__(self, players, monsters, strike: Callable,
+                 aggro_radius: float = config.MONSTER_AGGRO_RADIUS,
+                 leash_radius: float = config.MONSTER_LEASH_RADIUS,
+                 speed: float = config.MONSTER_SPEED,
+                 attack_interval: float = config.MONSTER_ATTACK_INTERVAL,
+                 budget: int = config.MONSTER_AI_BUDGET):
+        self.players = players
+        self.monsters = monsters
+        self.strike = strike
+        self.aggro_radius = aggro_radius
+        self.leash_radius = leash_radius
+        self.speed = speed
+        self.attack_interval = attack_interval
+        self.budget = budget
+        self.max_step = 0.5  # Secondes simulées au plus par mise à jour
+        self.awake: Dict[str, object] = {}  # Monstres engagés (clé de la grille -> monstre)
+        self.updated_total = 0
+        self.deferred_total = 0  # Candidats repoussés au tick suivant par le budget
+        self.strikes_total = 0
+
+    def candidates(self) -> Dict[str, object]:
+        """Monstres vivants proches d'un joueur vivant, plus les monstres engagés"""
+        found = {}
+        alive = lambda monster: monster.alive
+        for player in self.players.values():
+            if not player.alive:
+                continue
+            instance = player.dungeon_instance
+            for monster in self.monsters.query_radius(player.x, player.y, self.aggro_radius, instance, alive):
+                found[monster.store_key] = monster
+        for key, monster in list(self.awake.items()):
+            if self.monsters.get(key) is not monster or not monster.alive:
+                # Monstre mort, recréé ou retiré avec son instance
+                del self.awake[key]
+                monster.ai_state, monster.target_player = IDLE, None
+            else:
+                found[key] = monster
+        return found
+
+    def tick(self, now: float) -> int:
+        """Met à jour au plus budget monstres ; retourne le nombre de monstres mis à jour"""
+        found = self.candidates()
+        if len(found) > self.budget:
+            selected = heapq.nsmallest(self.budget, found.items(), key=lambda item: item[1].ai_updated)
+            self.deferred_total += len(found) - self.budget
+        else:
+            selected = found.items()
+        for key, monster in selected:
+            if monster.ai_updated < 0:
+                dt = 0.0  # Premier passage : pas de rattrapage
+            else:
+                dt = min(self.max_step, now - monster.ai_updated)
+            monster.ai_updated = now
+            self.step(key, monster, dt, now)
+        self.updated_total += len(selected)
+        return len(selected)
+
+    def target_of(self, monster):
+        player = self.players.get(monster.target_player) if monster.target_player else None
+        if (player is None or not player.alive
+                or player.dungeon_instance != monster.dungeon_instance):
+            return None
+        return player
+
+    def step(self, key: str, monster, dt: float, now: float):
+        state = monster.ai_state
+        if state == IDLE:
+            nearest = self.players.nearest(monster.x, monster.y, 1, monster.dungeon_instance,
+                                           max_radius=self.aggro_radius, predicate=lambda p: p.alive)
+            if not nearest:
+                return
+            monster.target_player = nearest[0].id
+            monster.ai_state = state = CHASE
+            self.awake[key] = monster
+
+        if state == LEASH:
+            if self.move_towards(monster, monster.home_x, monster.home_y, dt):
+                monster.ai_state = IDLE
+                del self.awake[key]
+            return
+
+        # Cible perdue, hors de portée de poursuite, ou monstre trop loin de chez lui : retour
+        target = self.target_of(monster)
+        distance = math.hypot(target.x - monster.x, target.y - monster.y) if target is not None else math.inf
+        if (distance > self.leash_radius
+                or math.hypot(monster.x - monster.home_x, monster.y - monster.home_y) > self.leash_radius):
+            monster.target_player = None
+            monster.ai_state = LEASH
+            return
+
+        if distance > config.ATTACK_RANGE:
+            monster.ai_state = CHASE
+            self.move_towards(monster, target.x, target.y, dt, stop_at=config.ATTACK_RANGE * 0.8)
+            return
+
+        monster.ai_state = ATTACK
+        if now - monster.last_attack >= self.attack_interval:
+            monster.last_attack = now
+            self.strikes_total += 1
+            self.strike(monster, target)
+
+    def move_towards(self, monster, x: float, y: float, dt: float, stop_at: float = 0.0) -> bool:
+        """Avance vers (x, y) ; True si le monstre y est arrivé (à stop_at près)"""
+        dx, dy = x - monster.x, y - monster.y
+        distance = math.hypot(dx, dy)
+        if distance <= stop_at + 1e-6:
+            return True
+        travel = min(self.speed * dt, distance - stop_at)
+        if travel <= 0:
+            return False
+        monster.x += dx / distance * travel
+        monster.y += dy / distance * travel
+        return travel >= distance - stop_at - 1e-6
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark mémoire des entités : octets par monstre, joueur et objet au sol
+avec les dataclasses à __slots__ du serveur, comparés aux anciennes
+dataclasses à __dict__ (dungeon_instance ajouté dynamiquement).
+
+Usage: python bench_entity_memory.py [nombre]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import server
+
+
+@dataclass
+class LegacyMonster:
+    """Monster avant __slots__"""
+    id: str
+    x: float
+    y: float
+    hp: int
+    max_hp: int
+    attack: int
+    defense: int
+    xp_reward: int
+    alive: bool = True
+    target_player: str = None
+    is_boss: bool = False
+    boss_abilities: List[str] = field(default_factory=list)
+
+
+@dataclass
+class LegacyPlayer:
+    """Player avant __slots__"""
+    id: str
+    name: str
+    x: float = 1600
+    y: float = 1200
+    hp: int = 100
+    max_hp: int = 100
+    level: int = 1
+    xp: int = 0
+    xp_to_next: int = 100
+    attack: int = 10
+    defense: int = 5
+    speed: int = 5
+    skill_points: int = 0
+    alive: bool = True
+    player_class: str = "Warrior"
+    mana: int = 50
+    max_mana: int = 50
+    critical_chance: float = 0.1
+    last_ability_use: float = 0
+    inventory: Dict[str, Any] = field(default_factory=dict)
+    equipped: Dict[str, Any] = field(default_factory=dict)
+    gold: int = 0
+    socket: Any = None
+    dungeon_instance: str = ""
+
+
+@dataclass
+class LegacyDroppedItem:
+    """DroppedItem avant __slots__"""
+    drop_id: str
+    item_id: str
+    x: float
+    y: float
+    drop_time: float
+
+
+def make_monster(cls, i):
+    monster = cls(id=f"monster_{i}", x=i % 3200 + 0.5, y=i % 2400 + 0.5, hp=50 + i % 7, max_hp=60,
+                  attack=10, defense=3, xp_reward=20)
+    monster.dungeon_instance = "" if i % 10 else f"dungeon_instance_{i % 7}"
+    return monster
+
+
+def make_player(cls, i):
+    return cls(id=f"player_{i}", name=f"Joueur{i}", x=i % 3200 + 0.5, y=i % 2400 + 0.5)
+
+
+def make_drop(cls, i):
+    return cls(f"drop_{i}", "health_potion", i % 3200 + 0.5, i % 2400 + 0.5, time.time())
+
+
+def object_size(entity):
+    """Taille de l'objet seul (plus son __dict__ s'il en a un)"""
+    size = sys.getsizeof(entity)
+    if hasattr(entity, '__dict__'):
+        size += sys.getsizeof(entity.__dict__)
+    return size
+
+
+def bytes_per_entity(factory, cls, count):
+    """Mémoire allouée par entité, valeurs des champs comprises (chaînes, floats, listes)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = [factory(cls, i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    size = (after - before - sys.getsizeof(entities)) / count
+    single = object_size(entities[0])
+    del entities
+    return size, single
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    print(f"=== Mémoire des entités ({count} de chaque) ===")
+    print(f"{'entité':>12} | {'__dict__ (o)':>12} | {'__slots__ (o)':>13} | {'gain':>5} | {'objet seul':>14}")
+    for name, factory, legacy, slotted in (
+            ("Monster", make_monster, LegacyMonster, server.Monster),
+            ("Player", make_player, LegacyPlayer, server.Player),
+            ("DroppedItem", make_drop, LegacyDroppedItem, server.DroppedItem)):
+        before, before_object = bytes_per_entity(factory, legacy, count)
+        after, after_object = bytes_per_entity(factory, slotted, count)
+        print(f"{name:>12} | {before:>12.0f} | {after:>13.0f} | {1 - after / before:>5.0%} | "
+              f"{before_object:>5} -> {after_object:>4}")
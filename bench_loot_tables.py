@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Microbenchmark des tirages de butin : ancienne sélection (regroupement du
+catalogue par rareté à chaque tirage) contre les tables d'alias précompilées.
+
+Usage: python bench_loot_tables.py [tirages]
+"""
+
+import random
+import sys
+import time
+
+import server
+
+
+def legacy_select(items):
+    """select_random_item avant les tables de butin"""
+    rarity_weights = {'common': 60, 'uncommon': 25, 'rare': 12, 'epic': 2, 'legendary': 1}
+    items_by_rarity = {}
+    for item_id, item in items.items():
+        items_by_rarity.setdefault(item.rarity, []).append(item_id)
+    rarity_choices = [rarity for rarity in rarity_weights if rarity in items_by_rarity]
+    weights = [rarity_weights[rarity] for rarity in rarity_choices]
+    chosen_rarity = random.choices(rarity_choices, weights=weights)[0]
+    return random.choice(items_by_rarity[chosen_rarity])
+
+
+def legacy_boss(items):
+    """Choix légendaire de drop_boss_loot avant les tables de butin"""
+    return random.choice([item_id for item_id, item in items.items() if item.rarity == "legendary"])
+
+
+def draws_per_second(function, draws):
+    start = time.perf_counter()
+    for _ in range(draws):
+        function()
+    return draws / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    draws = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    game_server = server.GameServer("localhost", 0)
+    items = game_server.items
+    loot = game_server.loot
+    print(f"=== Tirages de butin ({len(items)} objets au catalogue, {draws} tirages) ===")
+    print(f"{'table':>8} | {'ancien (tirages/s)':>18} | {'alias (tirages/s)':>17} | {'gain':>5}")
+    for name, legacy in (('monster', legacy_select), ('boss', legacy_boss)):
+        before = draws_per_second(lambda: legacy(items), draws)
+        after = draws_per_second(lambda: loot.draw(name), draws)
+        print(f"{name:>8} | {before:>18,.0f} | {after:>17,.0f} | {after / before:>4.1f}x")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de charge : compare les modes réseau threadé et asyncio du serveur.
+
+Lance le serveur dans un sous-processus pour chaque mode, connecte N bots qui
+se déplacent en continu et mesure le débit de game_state reçu par bot.
+
+Usage: python bench_network_modes.py [nombre_de_bots] [durée_en_secondes]
+"""
+
+import json
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+
+def find_free_port():
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    probe.bind(("localhost", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+
+def wait_for_server(port, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("localhost", port), timeout=0.5).close()
+            return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def run_bot(port, index, stop_event, results):
+    """Bot: rejoint la partie, bouge à 10 Hz et compte les game_state reçus"""
+    states = 0
+    received_bytes = 0
+    try:
+        client = socket.create_connection(("localhost", port), timeout=5.0)
+        client.send((json.dumps({'type': 'join', 'name': f'Bot{index}', 'class': 'Archer'}) + '\n').encode())
+        client.settimeout(0.1)
+        buffer = b""
+        last_move = 0.0
+        while not stop_event.is_set():
+            now = time.time()
+            if now - last_move >= 0.1:
+                move = {'type': 'move', 'x': random.randint(100, 3100), 'y': random.randint(100, 2300)}
+                client.send((json.dumps(move) + '\n').encode())
+                last_move = now
+            try:
+                data = client.recv(65536)
+            except socket.timeout:
+                continue
+            if not data:
+                break
+            received_bytes += len(data)
+            complete, _, buffer = (buffer + data).rpartition(b"\n")
+            states += complete.count(b'"type": "game_state"')
+        client.close()
+    except OSError:
+        pass
+    results[index] = (states, received_bytes)
+
+
+def bench_mode(mode, bots, duration):
+    port = find_free_port()
+    process = subprocess.Popen([sys.executable, "server.py", "--port", str(port), "--mode", mode],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_for_server(port):
+            print(f"❌ Le serveur ({mode}) n'a pas démarré")
+            return
+        stop_event = threading.Event()
+        results = {}
+        threads = [threading.Thread(target=run_bot, args=(port, i, stop_event, results), daemon=True)
+                   for i in range(bots)]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop_event.set()
+        for thread in threads:
+            thread.join(timeout=2.0)
+
+        total_states = sum(states for states, _ in results.values())
+        total_bytes = sum(received for _, received in results.values())
+        per_bot_rate = total_states / max(1, len(results)) / duration
+        print(f"{mode:>9} | {bots} bots | {per_bot_rate:6.1f} game_state/s par bot "
+              f"| {total_bytes / duration / 1024:9.1f} Ko/s au total")
+    finally:
+        process.terminate()
+        process.wait(timeout=5)
+
+
+if __name__ == "__main__":
+    bot_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    print(f"=== Benchmark modes réseau ({bot_count} bots, {seconds:.0f}s) ===")
+    for network_mode in ("threaded", "asyncio"):
+        bench_mode(network_mode, bot_count, seconds)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark du codec binaire des game_state : taille et temps d'encodage/décodage
+comparés au JSON, pour un monde avec de plus en plus de joueurs.
+
+Usage: python bench_snapshot_codec.py
+"""
+
+import json
+import random
+import time
+
+import server
+from snapshot_codec import decode_snapshot, encode_snapshot
+
+
+def build_server(player_count):
+    game_server = server.GameServer("localhost", 0)
+    item_ids = list(game_server.items.keys())
+    for i in range(player_count):
+        player = server.Player(id=f"player_{i}", name=f"Joueur{i}",
+                               player_class=random.choice(["Warrior", "Mage", "Archer", "Rogue"]),
+                               x=random.uniform(0, 3200), y=random.uniform(0, 2400))
+        for item_id in random.sample(item_ids, 6):
+            player.inventory[item_id] = server.ItemStack(item=game_server.items[item_id], quantity=random.randint(1, 5))
+        game_server.players[player.id] = player
+    for i in range(20):
+        game_server.dropped_items[f"drop_{i}"] = server.DroppedItem(
+            f"drop_{i}", random.choice(item_ids), random.uniform(0, 3200), random.uniform(0, 2400), time.time())
+    return game_server
+
+
+def measure(function, argument, repeat=200):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(argument)
+    return (time.perf_counter() - start) / repeat * 1e6  # µs
+
+
+if __name__ == "__main__":
+    print("=== Codec des snapshots : JSON vs binaire ===")
+    print(f"{'joueurs':>8} | {'JSON (o)':>9} | {'binaire (o)':>11} | {'ratio':>5} | "
+          f"{'enc JSON':>9} | {'enc bin':>8} | {'dec JSON':>9} | {'dec bin':>8}")
+    for players in (1, 10, 50, 100):
+        state = build_server(players).create_world_game_state()
+        json_bytes = json.dumps(state).encode('utf-8')
+        binary = encode_snapshot(state)
+        encode_json_us = measure(lambda s: json.dumps(s).encode('utf-8'), state)
+        encode_binary_us = measure(encode_snapshot, state)
+        decode_json_us = measure(json.loads, json_bytes)
+        decode_binary_us = measure(decode_snapshot, memoryview(binary))
+        print(f"{players:>8} | {len(json_bytes):>9} | {len(binary):>11} | {len(json_bytes) / len(binary):>5.1f} | "
+              f"{encode_json_us:>7.0f}µs | {encode_binary_us:>6.0f}µs | {decode_json_us:>7.0f}µs | {decode_binary_us:>6.0f}µs")
@@ -5,6 +5,10 @@ import threading
 import sys
 from typing import Dict, Optional
 
+from framing import CLIENT_HELLO, FRAME_SNAPSHOT, WIRE_FRAMED, FrameDecoder, FrameError, decode_json, encode_message
+from snapshot_codec import decode_snapshot
+from delta import apply_delta
+
 # Initialize Pygame
 pygame.init()
 
@@ -51,6 +55,10 @@ class GameClient:
         self.running = True
         self.connected = False
         self.socket = None
+        self.send_lock = threading.Lock()  # Acquittements (thread réseau) et actions (thread principal)
+        self.snapshot_baselines = {}  # tick -> game_state complet, bases des deltas
+        self.my_private = {}  # Vue privée de notre joueur (inventaire, stats, progression)
+        self.manifest = None  # Données statiques du serveur (gardées d'une connexion à l'autre)
         self.my_player_id = None
         self.players = {}
         self.monsters = {}
@@ -89,6 +97,8 @@ class GameClient:
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.connect((host, port))
+            # Annoncer le format à préfixe de longueur (sinon le serveur reste en JSON par lignes)
+            self.socket.sendall(CLIENT_HELLO)
             self.connected = True
             
             # Start listening for messages
@@ -100,48 +110,74 @@ class GameClient:
             return False
     
     def listen_for_messages(self):
-        buffer = ""
+        decoder = FrameDecoder(mode=WIRE_FRAMED)
         while self.connected:
             try:
-                data = self.socket.recv(4096).decode('utf-8')
-                if not data:
+                if decoder.recv_into(self.socket) == 0:
                     break
                 
-                buffer += data
-                
-                # Process complete messages (separated by newlines)
-                while '\n' in buffer:
-                    message_str, buffer = buffer.split('\n', 1)
-                    if message_str.strip():
-                        try:
-                            message = json.loads(message_str.strip())
-                            self.process_server_message(message)
-                        except json.JSONDecodeError as e:
-                            print(f"Erreur JSON: {e}")
-                            continue
-                        except Exception as e:
-                            print(f"Erreur traitement message: {e}")
-                            continue
+                # Process complete frames (décodées depuis le tampon, sans copie)
+                for kind, payload in decoder.frames():
+                    try:
+                        message = self.decode_frame(kind, payload)
+                        self.process_server_message(message)
+                    except json.JSONDecodeError as e:
+                        print(f"Erreur JSON: {e}")
+                        continue
+                    except Exception as e:
+                        print(f"Erreur traitement message: {e}")
+                        continue
                 
+            except FrameError as e:
+                print(f"Flux invalide: {e}")
+                break
             except Exception as e:
                 print(f"Erreur réception: {e}")
                 break
         
         self.connected = False
     
+    def decode_frame(self, kind, payload):
+        """Décode une frame serveur : game_state binaire ou message JSON"""
+        if kind == FRAME_SNAPSHOT:
+            return decode_snapshot(payload)
+        return decode_json(payload)
+    
     def process_server_message(self, message):
         msg_type = message.get('type')
         
         if msg_type == 'joined':
             self.my_player_id = message['player_id']
             self.players[self.my_player_id] = message['player']
+
+        elif msg_type == 'manifest':
+            self.manifest = message
+            self.dungeons = message['dungeons']
+
+        elif msg_type == 'player_private':
+            self.my_private = message['private']
+            self.update_player(self.players.get(self.my_player_id))
             
         elif msg_type == 'game_state':
-            self.players = message['players']
-            self.monsters = message['monsters']
-            if 'dropped_items' in message:
-                self.dropped_items = message['dropped_items']
+            self.apply_game_state(message)
             
+        elif msg_type == 'game_state_delta':
+            baseline = self.snapshot_baselines.get(message['baseline'])
+            if baseline is None:
+                return  # Base inconnue : le serveur renverra une keyframe
+            self.apply_game_state(apply_delta(baseline, message))
+
+        elif msg_type == 'interest_update':
+            # Entités sorties de notre zone d'intérêt : ne plus les afficher
+            tables = {'players': self.players, 'monsters': self.monsters, 'dropped_items': self.dropped_items}
+            for table, entity_ids in message.get('left', {}).items():
+                entities = tables.get(table)
+                if entities is None:
+                    continue
+                for entity_id in entity_ids:
+                    if entity_id != self.my_player_id:
+                        entities.pop(entity_id, None)
+
         elif msg_type == 'combat_result':
             self.combat_log.append(message['log'])
             if len(self.combat_log) > 3:  # Réduire à 3 lignes max
@@ -149,8 +185,7 @@ class GameClient:
             
             # Update player and monster state
             if 'player' in message:
-                player_data = message['player']
-                self.players[player_data['id']] = player_data
+                self.update_player(message['player'])
             
             if 'monster' in message:
                 monster_data = message['monster']
@@ -163,8 +198,7 @@ class GameClient:
             
             # Update player state
             if 'player' in message:
-                player_data = message['player']
-                self.players[player_data['id']] = player_data
+                self.update_player(message['player'])
                 
         elif msg_type == 'item_picked_up':
             item_name = message.get('item_name', 'Objet')
@@ -219,11 +253,35 @@ class GameClient:
             if bonus_text:
                 self.dungeon_notifications.append(f"💰 {bonus_text}")
     
+    def update_player(self, player_data):
+        """Remplace un joueur (vue publique) ; le nôtre garde sa vue privée"""
+        if player_data is None:
+            return
+        if player_data['id'] == self.my_player_id:
+            player_data = {**player_data, **self.my_private}
+        self.players[player_data['id']] = player_data
+    
+    def apply_game_state(self, game_state):
+        """Applique un game_state complet et acquitte son tick"""
+        # Copie des tables : les entrées sont remplacées par les messages de combat
+        self.players = dict(game_state['players'])
+        self.monsters = dict(game_state['monsters'])
+        if 'dropped_items' in game_state:
+            self.dropped_items = dict(game_state['dropped_items'])
+        self.update_player(self.players.get(self.my_player_id))
+        
+        tick = game_state.get('tick')
+        if tick is not None:
+            self.snapshot_baselines[tick] = game_state
+            for old_tick in [t for t in self.snapshot_baselines if t < tick - 64]:
+                del self.snapshot_baselines[old_tick]
+            self.send_message({'type': 'ack', 'tick': tick})
+    
     def send_message(self, message):
         if self.connected:
             try:
-                message_str = json.dumps(message) + '\n'
-                self.socket.send(message_str.encode('utf-8'))
+                with self.send_lock:
+                    self.socket.sendall(encode_message(message, WIRE_FRAMED))
             except Exception as e:
                 print(f"Erreur envoi: {e}")
                 self.connected = False
@@ -339,8 +397,12 @@ class GameClient:
             message = {
                 'type': 'join',
                 'name': self.player_name,
-                'class': self.selected_class
+                'class': self.selected_class,
+                'snapshot_format': 'binary',  # game_state compact (snapshot_codec)
+                'delta': True  # Deltas depuis le dernier tick acquitté
             }
+            if self.manifest:
+                message['manifest_version'] = self.manifest['version']  # Déjà en cache
             self.send_message(message)
             self.input_active = False
     
@@ -353,7 +415,7 @@ class GameClient:
             if not player['alive']:
                 return
             
-            speed = player['speed']
+            speed = player.get('speed', 5)
             dx, dy = 0, 0
             
             if pygame.K_LEFT in self.keys_pressed or pygame.K_a in self.keys_pressed:
@@ -606,7 +668,7 @@ class GameClient:
             return
         
         player = self.players[self.my_player_id]
-        if player['skill_points'] > 0:
+        if player.get('skill_points', 0) > 0:
             message = {
                 'type': 'upgrade_stat',
                 'stat': stat
@@ -1050,7 +1112,7 @@ class GameClient:
         self.screen.blit(title, title_rect)
         
         # Available points
-        points_text = self.font.render(f"Points disponibles: {player['skill_points']}", True, YELLOW)
+        points_text = self.font.render(f"Points disponibles: {player.get('skill_points', 0)}", True, YELLOW)
         points_rect = points_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 60))
         self.screen.blit(points_text, points_rect)
         
@@ -1066,7 +1128,7 @@ class GameClient:
         
         y_offset = SCREEN_HEIGHT // 2 - 50
         for upgrade_text, _ in upgrades:
-            color = WHITE if player['skill_points'] > 0 else GRAY
+            color = WHITE if player.get('skill_points', 0) > 0 else GRAY
             text = pygame.font.Font(None, 20).render(upgrade_text, True, color)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
             self.screen.blit(text, text_rect)
@@ -1300,7 +1362,8 @@ class GameClient:
             
             # Ne dessiner que si visible à l'écran
             if -10 <= screen_x <= SCREEN_WIDTH + 10 and -10 <= screen_y <= SCREEN_HEIGHT + 10:
-                rarity = item_data.get('item_rarity', 'common')
+                item = self.manifest_item(item_data)
+                rarity = item.get('rarity', 'common')
                 color = RARITY_COLORS.get(rarity, WHITE)
                 
                 # Dessiner un petit carré pour l'objet
@@ -1310,9 +1373,16 @@ class GameClient:
                 # Nom de l'objet au survol (approximatif)
                 mouse_pos = pygame.mouse.get_pos()
                 if abs(mouse_pos[0] - screen_x) < 20 and abs(mouse_pos[1] - screen_y) < 20:
-                    name_text = pygame.font.Font(None, 18).render(item_data.get('item_name', 'Item'), True, color)
+                    name_text = pygame.font.Font(None, 18).render(item.get('name', 'Item'), True, color)
                     self.screen.blit(name_text, (screen_x + 10, screen_y - 10))
     
+    def manifest_item(self, item_data):
+        """Objet du manifeste référencé par un objet au sol ({} si inconnu)"""
+        index = item_data.get('item')
+        if self.manifest is None or index is None or index >= len(self.manifest['items']):
+            return {}
+        return self.manifest['items'][index]
+    
     def draw_dungeon_portals(self):
         """Dessine les portails de donjons sur la carte"""
         if not self.my_player_id or self.my_player_id not in self.players:
@@ -3,12 +3,49 @@
 # Paramètres réseau
 SERVER_HOST = 'localhost'
 SERVER_PORT = 12345
+SERVER_BACKLOG = 128  # File d'attente des connexions entrantes (listen)
+SERVER_NETWORK_MODE = 'threaded'  # 'threaded' (un thread par client) ou 'asyncio'
+SERVER_COMMAND_QUEUE = False  # True : messages mis en file par le réseau, appliqués par la boucle de jeu
+SEND_QUEUE_MAX_MESSAGES = 256  # Messages fiables en attente avant déconnexion d'un client lent
+DELTA_MAX_BASELINE_AGE = 30  # Ticks : au-delà, keyframe complète au lieu d'un delta
+
+# Zone d'intérêt (snapshots du monde)
+INTEREST_ENABLED = True
+INTEREST_CELL_SIZE = 200  # Les joueurs d'une même cellule partagent la même vue
+INTEREST_NEAR_RADIUS = 700  # Entités envoyées à chaque tick
+INTEREST_FAR_RADIUS = 1400  # Entités envoyées au rythme réduit ; au-delà, rien
+INTEREST_FAR_INTERVAL = 10  # Ticks entre deux rafraîchissements de l'anneau lointain
+
+# Index spatial des entités du serveur
+SPATIAL_CELL_SIZE = 128  # Côté des cellules de la grille (pixels)
 
 # Paramètres de jeu
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 GAME_UPDATE_RATE = 30  # FPS pour les mises à jour du serveur
+GAME_LOOP_MAX_CATCH_UP = 3  # Ticks enchaînés au plus pour rattraper un retard, le reste est sauté
+TICK_PROFILE_WINDOW = 300  # Ticks gardés par le profileur pour les percentiles (10 s)
+TICK_PROFILE_DUMP = ''  # Fichier JSON du profil des ticks écrit à l'arrêt ('' : aucun)
+METRICS_ENABLED = False  # Métriques Prometheus servies en HTTP (GET /metrics)
+METRICS_HOST = '127.0.0.1'  # Local uniquement
+METRICS_PORT = 9105
+MONSTER_TABLE_NUMPY = None  # Colonnes des monstres : None = NumPy s'il est installé, False = listes Python
+MONSTER_REGEN_ENABLED = False  # Régénération des monstres blessés hors combat (mécanique désactivée par défaut)
+MONSTER_REGEN_AMOUNT = 2  # HP rendus toutes les 2 secondes aux monstres blessés
+MONSTER_REGEN_DELAY = 5.0  # Secondes sans dégâts avant que la régénération reprenne
+DROPPED_ITEM_LIFETIME = 120.0  # Secondes avant la disparition d'un objet au sol
+DROPPED_ITEM_EXPIRY_BUCKET = 1.0  # Tranche de temps des expirations (retard maximal)
+MONSTER_AI_ENABLED = True
+MONSTER_AI_BUDGET = 200  # Monstres mis à jour au plus par tick
+MONSTER_AGGRO_RADIUS = 150  # Distance à laquelle un monstre repère un joueur
+MONSTER_LEASH_RADIUS = 400  # Distance au point d'apparition au-delà de laquelle il abandonne
+MONSTER_SPEED = 60  # Pixels par seconde
+MONSTER_ATTACK_INTERVAL = 1.5  # Secondes entre deux attaques d'un monstre
+REGEN_INTERVAL = 2  # Secondes entre deux régénérations (mana des joueurs, HP des monstres)
+ORPHAN_SWEEP_INTERVAL = 30  # Secondes entre deux balayages des monstres d'instances disparues
+DORMANT_ZONES_ENABLED = True  # Zones sans joueur endormies, rattrapées à leur réveil
+ZONE_OBSERVE_RADIUS = 700  # Un joueur observe les zones à moins de cette distance
 
 # Paramètres des joueurs
 PLAYER_START_HP = 100
@@ -0,0 +1,101 @@
+"""
+Compression delta des game_state (partagé par le serveur et le client).
+
+Chaque snapshot porte un numéro de tick. Un client qui a demandé les deltas
+acquitte les ticks reçus ; le serveur lui envoie alors seulement ce qui a
+changé depuis le dernier tick acquitté (champs modifiés, entités ajoutées ou
+supprimées). Si cette base est trop ancienne ou inconnue, il renvoie un
+snapshot complet (keyframe).
+
+Les game_state enregistrés comme bases ne doivent plus être modifiés :
+les deux côtés partagent leurs dictionnaires au lieu de les copier.
+"""
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+TABLES = ('players', 'monsters', 'dropped_items')  # Les donjons sont dans le manifeste
+
+_MISSING = object()
+
+
+class SnapshotHistory:
+    """Snapshots envoyés à un client (par tick) et dernier tick acquitté"""
+
+    def __init__(self, max_age: int):
+        self.max_age = max_age
+        self.states: Dict[int, dict] = {}
+        self.ticks = deque()
+        self.acked_tick = -1
+        self.keyframes_sent = 0
+        self.deltas_sent = 0
+
+    def record(self, tick: int, state: dict):
+        self.states[tick] = state
+        self.ticks.append(tick)
+        while self.ticks and self.ticks[0] < tick - self.max_age:
+            self.states.pop(self.ticks.popleft(), None)
+
+    def acknowledge(self, tick: int):
+        # Les acquittements peuvent arriver dans le désordre
+        if tick > self.acked_tick:
+            self.acked_tick = tick
+
+    def baseline(self, tick: int) -> Optional[Tuple[int, dict]]:
+        """Base utilisable pour le tick courant, ou None s'il faut une keyframe"""
+        acked = self.acked_tick
+        if acked < 0 or tick - acked > self.max_age:
+            return None
+        state = self.states.get(acked)
+        if state is None:
+            return None
+        return acked, state
+
+
+def diff_table(old: dict, new: dict) -> dict:
+    """Changements d'une table d'entités : {'changed': {id: champs}, 'removed': [ids]}"""
+    changed = {}
+    for entity_id, entity in new.items():
+        previous = old.get(entity_id)
+        if previous is None:
+            changed[entity_id] = entity
+        elif previous is not entity:
+            fields = {key: value for key, value in entity.items() if previous.get(key, _MISSING) != value}
+            if fields:
+                changed[entity_id] = fields
+    removed = [entity_id for entity_id in old if entity_id not in new]
+    table_delta = {}
+    if changed:
+        table_delta['changed'] = changed
+    if removed:
+        table_delta['removed'] = removed
+    return table_delta
+
+
+def make_delta(baseline_tick: int, baseline: dict, state: dict) -> dict:
+    """Message game_state_delta de baseline vers state"""
+    delta = {'type': 'game_state_delta', 'tick': state['tick'], 'baseline': baseline_tick}
+    for table in TABLES:
+        table_delta = diff_table(baseline.get(table, {}), state.get(table, {}))
+        if table_delta:
+            delta[table] = table_delta
+    return delta
+
+
+def apply_delta(baseline: dict, delta: dict) -> dict:
+    """Reconstruit le game_state complet à partir de la base et du delta"""
+    state = {'type': 'game_state', 'tick': delta['tick']}
+    for table in TABLES:
+        base_table = baseline.get(table, {})
+        table_delta = delta.get(table)
+        if not table_delta:
+            state[table] = base_table
+            continue
+        new_table = dict(base_table)
+        for entity_id, fields in table_delta.get('changed', {}).items():
+            entity = dict(new_table.get(entity_id) or {})
+            entity.update(fields)
+            new_table[entity_id] = entity
+        for entity_id in table_delta.get('removed', []):
+            new_table.pop(entity_id, None)
+        state[table] = new_table
+    return state
@@ -0,0 +1,146 @@
+"""
+Effets d'état temporaires (Charge, Furtivité, Rage, Invisibilité...).
+
+Chaque entité porte ses effets actifs (Player.effects, Monster.effects) ;
+le champ reste à None tant que l'entité n'a jamais reçu d'effet, et y revient
+quand son dernier effet prend fin (la plupart des monstres n'en ont pas). Un
+effet a une durée, une règle de cumul et des modificateurs de stats
+(additifs et multiplicatifs). Les expirations sont des minuteries du
+TimerQueue : un seul tas, vidé par la boucle de jeu. Les stats dérivées ne
+sont recalculées (callback on_change) que lorsque l'ensemble des effets d'une
+entité change : ré-appliquer un effet déjà actif ne fait que repousser son
+expiration.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+# Règles de cumul quand l'effet est déjà actif
+REFRESH = 'refresh'  # Repousse l'expiration
+STACK = 'stack'  # Ajoute une pile (jusqu'à max_stacks) et repousse l'expiration
+IGNORE = 'ignore'  # Garde l'effet actuel tel quel
+
+
+@dataclass(slots=True, frozen=True)
+class EffectSpec:
+    """Définition d'un effet ; les modificateurs sont par pile"""
+    name: str
+    duration: float
+    add: Tuple[Tuple[str, float], ...] = ()
+    mult: Tuple[Tuple[str, float], ...] = ()
+    stacking: str = REFRESH
+    max_stacks: int = 1
+
+
+EFFECTS = {
+    'charge': EffectSpec('charge', 10.0, add=(('attack', 5),)),
+    'stealth': EffectSpec('stealth', 8.0, add=(('critical_chance', 0.5),)),
+    'rage': EffectSpec('rage', 10.0, mult=(('attack', 1.5),)),
+    'invisibility': EffectSpec('invisibility', 8.0, mult=(('defense', 2.0),)),
+}
+
+
+class ActiveEffect:
+    """Effet posé sur une entité"""
+    __slots__ = ('spec', 'stacks', 'timer')
+
+    def __init__(self, spec: EffectSpec):
+        self.spec = spec
+        self.stacks = 1
+        self.timer = None
+
+
+class EffectSet(dict):
+    """Effets actifs d'une entité (nom -> ActiveEffect).
+
+    base garde la valeur d'origine des stats modifiées pour les entités sans
+    couches de stats (monstres)."""
+    __slots__ = ('base',)
+
+    def __init__(self):
+        super().__init__()
+        self.base: Dict[str, float] = {}
+
+    def modifiers(self) -> Dict[str, Tuple[float, float]]:
+        """Modificateurs cumulés par stat : (ajout, multiplicateur)"""
+        totals: Dict[str, Tuple[float, float]] = {}
+        for active in self.values():
+            for stat, value in active.spec.add:
+                add, mult = totals.get(stat, (0, 1))
+                totals[stat] = (add + value * active.stacks, mult)
+            for stat, value in active.spec.mult:
+                add, mult = totals.get(stat, (0, 1))
+                totals[stat] = (add, mult * value ** active.stacks)
+        return totals
+
+    def apply_to(self, entity):
+        """Écrit base * multiplicateur + ajout sur l'entité, puis restaure les stats libérées"""
+        modifiers = self.modifiers()
+        for stat in [stat for stat in self.base if stat not in modifiers]:
+            setattr(entity, stat, self.base.pop(stat))
+        for stat, (add, mult) in modifiers.items():
+            base = self.base.setdefault(stat, getattr(entity, stat))
+            setattr(entity, stat, type(base)(base * mult + add))
+
+
+class StatusEffects:
+    """Pose et expiration des effets ; les expirations passent par le TimerQueue"""
+
+    def __init__(self, timers, on_change: Callable):
+        self.timers = timers
+        self.on_change = on_change  # on_change(entity) quand ses effets changent
+        self.applied_total = 0
+        self.expired_total = 0
+
+    def apply(self, entity, spec: EffectSpec, owner=None) -> ActiveEffect:
+        """Pose spec sur entity selon sa règle de cumul"""
+        effects = entity.effects
+        if effects is None:
+            effects = entity.effects = EffectSet()
+        active = effects.get(spec.name)
+        if active is None:
+            active = effects[spec.name] = ActiveEffect(spec)
+            changed = True
+        elif spec.stacking == IGNORE:
+            return active
+        else:
+            changed = spec.stacking == STACK and active.stacks < spec.max_stacks
+            if changed:
+                active.stacks += 1
+            active.timer.cancel()
+        active.timer = self.timers.schedule(spec.duration, self.expire, entity, active, owner=owner)
+        self.applied_total += 1
+        if changed:
+            self.on_change(entity)
+        return active
+
+    def expire(self, entity, active: ActiveEffect):
+        effects = entity.effects
+        if effects is not None and effects.get(active.spec.name) is active:
+            del effects[active.spec.name]
+            self.expired_total += 1
+            self.changed(entity)
+
+    def remove(self, entity, name: str) -> bool:
+        """Retire un effet avant son expiration"""
+        effects = entity.effects
+        active: Optional[ActiveEffect] = effects.pop(name, None) if effects is not None else None
+        if active is None:
+            return False
+        active.timer.cancel()
+        self.changed(entity)
+        return True
+
+    def changed(self, entity):
+        """Recalcule puis libère l'ensemble d'effets devenu vide (stats de base restaurées)"""
+        self.on_change(entity)
+        effects = entity.effects
+        if not effects and not effects.base:
+            entity.effects = None
+
+    def clear(self, entity):
+        """Annule tous les effets d'une entité retirée du jeu (sans recalcul)"""
+        if entity.effects is None:
+            return
+        for active in entity.effects.values():
+            active.timer.cancel()
+        entity.effects = None
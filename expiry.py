@@ -0,0 +1,67 @@
+"""
+Expiration groupée par tranches de temps.
+
+Chaque clé (un objet au sol par exemple) est rangée dans la tranche de
+bucket_seconds qui contient son heure d'expiration. pop_expired() vide les
+tranches entièrement passées : le coût d'un tick ne dépend que du nombre de
+clés qui expirent, pas du nombre de clés suivies. Une clé expire donc au plus
+bucket_seconds après son heure exacte.
+"""
+import math
+from typing import Dict, Hashable, List, Optional
+
+
+class ExpiryBuckets:
+    """Clés rangées par tranche d'expiration"""
+
+    def __init__(self, bucket_seconds: float = 1.0):
+        self.bucket_seconds = bucket_seconds
+        self.buckets: Dict[int, set] = {}
+        self.bucket_of: Dict[Hashable, int] = {}
+        self.next_bucket: Optional[int] = None  # Plus petite tranche pas encore vidée
+
+    def add(self, key: Hashable, expires_at: float):
+        self.discard(key)
+        # Tranche qui se termine après l'heure d'expiration
+        bucket = math.ceil(expires_at / self.bucket_seconds)
+        self.buckets.setdefault(bucket, set()).add(key)
+        self.bucket_of[key] = bucket
+        if self.next_bucket is None or bucket < self.next_bucket:
+            self.next_bucket = bucket
+
+    def discard(self, key: Hashable):
+        bucket = self.bucket_of.pop(key, None)
+        if bucket is None:
+            return
+        keys = self.buckets.get(bucket)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.buckets[bucket]
+
+    def pop_expired(self, now: float) -> List[Hashable]:
+        """Retire et retourne les clés des tranches terminées"""
+        if self.next_bucket is None:
+            return []
+        last = math.floor(now / self.bucket_seconds)
+        expired = []
+        if last - self.next_bucket > len(self.buckets):
+            # Long saut dans le temps : parcourir les tranches existantes plutôt que l'intervalle
+            due = sorted(bucket for bucket in self.buckets if bucket <= last)
+        else:
+            due = range(self.next_bucket, last + 1)
+        for bucket in due:
+            keys = self.buckets.pop(bucket, None)
+            if keys:
+                for key in keys:
+                    del self.bucket_of[key]
+                expired.extend(keys)
+        if last >= self.next_bucket:
+            self.next_bucket = min(self.buckets) if self.buckets else None
+        return expired
+
+    def __len__(self):
+        return len(self.bucket_of)
+
+    def __contains__(self, key):
+        return key in self.bucket_of
@@ -0,0 +1,204 @@
+"""
+Découpage des messages réseau (partagé par le serveur et le client).
+
+Format "framed" : chaque message est précédé d'un en-tête de 5 octets
+(longueur du contenu sur 4 octets big-endian + type de frame sur 1 octet).
+Un client annonce ce format en envoyant CLIENT_HELLO avant tout message ;
+sinon la connexion reste en JSON séparé par des sauts de ligne ("json_lines"),
+le format historique utilisé par les scripts de test.
+
+FrameDecoder lit dans un bytearray préalloué (recv_into) et rend le contenu
+des frames sous forme de memoryview, sans copie. Une memoryview rendue n'est
+valide que jusqu'au prochain get_buffer()/recv_into() : il faut la décoder
+avant de relire le socket.
+"""
+import json
+import struct
+from typing import Iterator, Optional, Tuple
+
+CLIENT_HELLO = b"RPGF\x01"  # Annonce du format framed (version 1)
+
+WIRE_JSON_LINES = "json_lines"
+WIRE_FRAMED = "framed"
+
+FRAME_HEADER = struct.Struct("!IB")  # longueur du contenu, type de frame
+FRAME_JSON = 0
+FRAME_SNAPSHOT = 1  # game_state binaire (snapshot_codec)
+
+MAX_FRAME_SIZE = 4 * 1024 * 1024  # 4 Mo : au-delà, la connexion est corrompue
+MIN_READ_SIZE = 4096
+
+
+class FrameError(ValueError):
+    """Flux réseau invalide (frame trop grande, type inconnu...)"""
+
+
+def encode_frame(payload: bytes, kind: int = FRAME_JSON) -> bytes:
+    if len(payload) > MAX_FRAME_SIZE:
+        raise FrameError(f"Frame trop grande: {len(payload)} octets")
+    return FRAME_HEADER.pack(len(payload), kind) + payload
+
+
+def encode_message(message: dict, wire_format: str = WIRE_JSON_LINES) -> bytes:
+    """Encode un message JSON dans le format de la connexion"""
+    payload = json.dumps(message).encode('utf-8')
+    if wire_format == WIRE_FRAMED:
+        return encode_frame(payload)
+    return payload + b'\n'
+
+
+def decode_json(payload: memoryview):
+    """Décode un message JSON directement depuis une memoryview"""
+    return json.loads(str(payload, 'utf-8'))
+
+
+class FrameDecoder:
+    """Tampon de réception préalloué + découpage des frames"""
+
+    def __init__(self, capacity: int = 65536, mode: Optional[str] = None):
+        self.buffer = bytearray(capacity)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # Début des données non consommées
+        self.end = 0  # Fin des données reçues
+        self.scan_pos = 0  # Mode json_lines : position déjà parcourue sans '\n'
+        self.mode = mode  # None tant que le client ne s'est pas annoncé
+        self.last_size = 0  # Octets du dernier message rendu par messages()
+
+    def get_buffer(self, min_free: int = MIN_READ_SIZE) -> memoryview:
+        """Zone libre où écrire les prochains octets reçus"""
+        if self.start == self.end:
+            self.start = self.end = self.scan_pos = 0
+        if len(self.buffer) - self.end < min_free:
+            pending = self.end - self.start
+            if self.start > 0:
+                # Ramener les données en attente au début du tampon
+                self.view[0:pending] = self.view[self.start:self.end]
+                self.scan_pos -= self.start
+                self.start, self.end = 0, pending
+            if len(self.buffer) - self.end < min_free:
+                self.grow(pending + min_free)
+        return self.view[self.end:]
+
+    def grow(self, needed: int):
+        capacity = len(self.buffer)
+        while capacity < needed:
+            capacity *= 2
+        buffer = bytearray(capacity)
+        buffer[0:self.end - self.start] = self.view[self.start:self.end]
+        self.scan_pos -= self.start
+        self.end -= self.start
+        self.start = 0
+        self.buffer = buffer
+        self.view = memoryview(buffer)
+
+    def buffer_updated(self, nbytes: int):
+        self.end += nbytes
+
+    def recv_into(self, sock) -> int:
+        nbytes = sock.recv_into(self.get_buffer())
+        self.buffer_updated(nbytes)
+        return nbytes
+
+    def feed(self, data: bytes):
+        """Ajoute des octets déjà reçus (tests, sources sans recv_into)"""
+        target = self.get_buffer(len(data))
+        target[:len(data)] = data
+        self.buffer_updated(len(data))
+
+    def frames(self) -> Iterator[Tuple[int, memoryview]]:
+        """Rend les frames complètes (type, contenu) disponibles dans le tampon"""
+        if self.mode is None:
+            self.detect_mode()
+            if self.mode is None:
+                return
+        if self.mode == WIRE_FRAMED:
+            yield from self.framed_frames()
+        else:
+            yield from self.json_line_frames()
+
+    def messages(self) -> Iterator[dict]:
+        """Rend les messages JSON complets ; les frames JSON invalides sont ignorées.
+        last_size donne la taille du message rendu (métriques)."""
+        for kind, payload in self.frames():
+            if kind != FRAME_JSON:
+                continue
+            try:
+                message = decode_json(payload)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            self.last_size = len(payload)
+            yield message
+
+    def detect_mode(self):
+        available = self.end - self.start
+        prefix = bytes(self.view[self.start:self.start + min(available, len(CLIENT_HELLO))])
+        if prefix == CLIENT_HELLO:
+            self.mode = WIRE_FRAMED
+            self.start += len(CLIENT_HELLO)
+        elif prefix and not CLIENT_HELLO.startswith(prefix):
+            self.mode = WIRE_JSON_LINES
+            self.scan_pos = self.start
+
+    def framed_frames(self):
+        header_size = FRAME_HEADER.size
+        while self.end - self.start >= header_size:
+            length, kind = FRAME_HEADER.unpack_from(self.buffer, self.start)
+            if length > MAX_FRAME_SIZE:
+                raise FrameError(f"Frame trop grande: {length} octets")
+            frame_end = self.start + header_size + length
+            if frame_end > self.end:
+                if frame_end - self.start > len(self.buffer):
+                    # Préparer la place pour la frame entière
+                    self.grow(frame_end - self.start + MIN_READ_SIZE)
+                return
+            payload = self.view[self.start + header_size:frame_end]
+            self.start = frame_end
+            yield kind, payload
+
+    def json_line_frames(self):
+        while True:
+            newline = self.buffer.find(b'\n', self.scan_pos, self.end)
+            if newline < 0:
+                break
+            if newline - self.start > MAX_FRAME_SIZE:
+                raise FrameError(f"Ligne trop grande: {newline - self.start} octets")
+            payload = self.view[self.start:newline]
+            line_start, self.start = self.start, newline + 1
+            self.scan_pos = self.start
+            if newline > line_start:
+                yield FRAME_JSON, payload
+        self.scan_pos = self.end
+        yield from self.unterminated_json()
+        if self.end - self.start > MAX_FRAME_SIZE:
+            # Un pair qui n'envoie jamais de saut de ligne ne fait pas grandir le tampon sans fin
+            raise FrameError(f"Ligne sans fin de plus de {MAX_FRAME_SIZE} octets")
+
+    def unterminated_json(self):
+        """Anciens scripts : objets JSON envoyés sans saut de ligne.
+
+        Chaque objet complet est consommé aussitôt : l'appel suivant reprend après
+        le dernier objet lu au lieu de réanalyser toute la fin du tampon."""
+        tail = bytes(self.view[self.start:self.end]).rstrip()
+        if not tail.endswith(b'}'):
+            return
+        try:
+            text = tail.decode('utf-8')
+        except UnicodeDecodeError:
+            return
+        decoder = json.JSONDecoder()
+        position = 0
+        while position < len(text):
+            skipped = position
+            while position < len(text) and text[position].isspace():
+                position += 1
+            if position >= len(text):
+                break
+            try:
+                _, next_position = decoder.raw_decode(text, position)
+            except json.JSONDecodeError:
+                return  # Message incomplet, attendre la suite
+            payload = text[position:next_position].encode('utf-8')
+            self.start += position - skipped + len(payload)  # Espaces (ASCII) puis l'objet
+            position = next_position
+            yield FRAME_JSON, memoryview(payload)
+        self.start = self.scan_pos = self.end
@@ -0,0 +1,138 @@
+"""
+Gestion d'intérêt (area of interest) pour les snapshots du monde.
+
+Le monde est découpé en cellules. Un client reçoit à chaque tick les entités
+des cellules proches de la sienne (rayon near_radius), et celles de l'anneau
+lointain (jusqu'à far_radius). Les entités de l'anneau lointain sont choisies
+à chaque tick d'après leur position actuelle (une entité morte, partie ou qui
+vient de s'éloigner est prise en compte tout de suite), mais leur contenu
+(position, HP) est celui du dernier rafraîchissement lointain, fait tous les
+far_interval ticks. Au-delà, rien.
+
+La vue ne dépend que de la cellule du client et du tick : les clients d'une
+même cellule partagent le même dictionnaire de vue (donc les mêmes deltas).
+Les entrées/sorties d'entités dans la vue d'un client lui sont signalées par
+un message interest_update.
+"""
+import math
+from typing import Dict, List, Optional, Tuple
+
+TABLES = ('players', 'monsters', 'dropped_items')
+
+
+def cell_offsets(cell_size: float, radius: float) -> List[Tuple[int, int]]:
+    """Décalages des cellules qui intersectent le cercle de rayon donné autour d'une cellule"""
+    reach = int(math.ceil(radius / cell_size))
+    offsets = []
+    for dx in range(-reach, reach + 1):
+        for dy in range(-reach, reach + 1):
+            # Distance minimale entre deux points des deux cellules
+            gap_x = max(0, abs(dx) - 1) * cell_size
+            gap_y = max(0, abs(dy) - 1) * cell_size
+            if gap_x * gap_x + gap_y * gap_y <= radius * radius:
+                offsets.append((dx, dy))
+    return offsets
+
+
+class InterestManager:
+    """Découpe le game_state du monde en vues par cellule de client"""
+
+    def __init__(self, cell_size: float, near_radius: float, far_radius: float, far_interval: int):
+        self.cell_size = cell_size
+        self.far_interval = max(1, far_interval)
+        self.near_offsets = cell_offsets(cell_size, near_radius)
+        near = set(self.near_offsets)
+        self.far_offsets = [offset for offset in cell_offsets(cell_size, far_radius) if offset not in near]
+        self.far_entities = None  # table -> {id: entité} au dernier rafraîchissement lointain
+        self.client_views: Dict[str, dict] = {}  # player_id -> dernière vue envoyée
+
+    def cell_of(self, entity: dict) -> Tuple[int, int]:
+        return int(entity['x'] // self.cell_size), int(entity['y'] // self.cell_size)
+
+    def bucket(self, game_state: dict) -> Dict[str, Dict[Tuple[int, int], list]]:
+        buckets = {}
+        for table in TABLES:
+            cells = {}
+            for entity_id, entity in game_state.get(table, {}).items():
+                cells.setdefault(self.cell_of(entity), []).append((entity_id, entity))
+            buckets[table] = cells
+        return buckets
+
+    def build_view(self, game_state: dict, cell, buckets) -> dict:
+        view = {'type': 'game_state', 'tick': game_state['tick']}
+        cx, cy = cell
+        for table in TABLES:
+            entities = {}
+            cells = buckets[table]
+            far_entities = self.far_entities[table]
+            for dx, dy in self.far_offsets:
+                for entity_id, entity in cells.get((cx + dx, cy + dy), ()):
+                    # Version du dernier rafraîchissement, sauf pour une entité apparue ou morte depuis
+                    stale = far_entities.get(entity_id)
+                    if stale is not None and stale.get('alive') == entity.get('alive'):
+                        entity = stale
+                    entities[entity_id] = entity
+            for dx, dy in self.near_offsets:
+                for entity_id, entity in cells.get((cx + dx, cy + dy), ()):
+                    entities[entity_id] = entity
+            view[table] = entities
+        for key, value in game_state.items():
+            if key not in view:
+                view[key] = value  # Portails de donjons et autres champs globaux
+        return view
+
+    def split(self, game_state: dict, recipients: List[Tuple[str, object]]):
+        """Rend ([(vue, [sockets])], [(socket, interest_update)]) pour les joueurs du monde"""
+        tick = game_state['tick']
+        buckets = self.bucket(game_state)
+        if self.far_entities is None or tick % self.far_interval == 0:
+            self.far_entities = {table: dict(game_state.get(table, {})) for table in TABLES}
+
+        views_by_cell = {}
+        batches = {}
+        events = []
+        transitions = {}
+        players = game_state.get('players', {})
+        for player_id, client_socket in recipients:
+            player = players.get(player_id)
+            if player is None:
+                continue
+            cell = self.cell_of(player)
+            view = views_by_cell.get(cell)
+            if view is None:
+                view = views_by_cell[cell] = self.build_view(game_state, cell, buckets)
+                batches[cell] = (view, [])
+            batches[cell][1].append(client_socket)
+
+            previous = self.client_views.get(player_id)
+            self.client_views[player_id] = view
+            if previous is None:
+                continue
+            key = (id(previous), id(view))
+            if key not in transitions:
+                transitions[key] = self.interest_update(tick, previous, view)
+            if transitions[key] is not None:
+                events.append((client_socket, transitions[key]))
+
+        # Oublier les joueurs partis (déconnectés ou en donjon)
+        active = {player_id for player_id, _ in recipients}
+        for player_id in [p for p in self.client_views if p not in active]:
+            del self.client_views[player_id]
+
+        return list(batches.values()), events
+
+    def interest_update(self, tick: int, previous: dict, view: dict) -> Optional[dict]:
+        entered = {}
+        left = {}
+        for table in TABLES:
+            old_ids = previous[table].keys()
+            new_ids = view[table].keys()
+            added = list(new_ids - old_ids)
+            removed = list(old_ids - new_ids)
+            if added:
+                entered[table] = added
+            if removed:
+                left[table] = removed
+        if not entered and not left:
+            return None
+        return {'type': 'interest_update', 'tick': tick, 'entered': entered, 'left': left}
@@ -0,0 +1,83 @@
+"""
+Tables de butin précompilées.
+
+Chaque table (butin des monstres, butin des boss...) est compilée une fois
+depuis le catalogue d'objets en une table d'alias (méthode de Vose) : un
+tirage pondéré coûte alors un nombre aléatoire et une comparaison, quelle que
+soit la taille du catalogue. Les tables sont recompilées par compile() quand
+le catalogue change.
+"""
+import random
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Poids des raretés par table ; le poids d'une rareté est partagé entre ses objets
+LOOT_RARITY_WEIGHTS = {
+    'monster': {'common': 60, 'uncommon': 25, 'rare': 12, 'epic': 2, 'legendary': 1},
+    'boss': {'legendary': 1},
+}
+
+
+class AliasTable:
+    """Tirage pondéré en O(1) (méthode d'alias de Vose)"""
+
+    def __init__(self, entries: Sequence[Tuple[Hashable, float]]):
+        entries = [(value, weight) for value, weight in entries if weight > 0]
+        if not entries:
+            raise ValueError("Table d'alias vide")
+        count = len(entries)
+        total = sum(weight for _, weight in entries)
+        self.values = [value for value, _ in entries]
+        self.probability = [0.0] * count
+        self.alias = list(range(count))
+
+        scaled = [weight * count / total for _, weight in entries]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            lower, higher = small.pop(), large.pop()
+            self.probability[lower] = scaled[lower]
+            self.alias[lower] = higher
+            scaled[higher] -= 1.0 - scaled[lower]
+            (small if scaled[higher] < 1.0 else large).append(higher)
+        for i in small + large:  # Restes d'arrondi : colonnes pleines
+            self.probability[i] = 1.0
+
+    def sample(self, rng=random):
+        u = rng.random() * len(self.values)
+        column = int(u)
+        if u - column < self.probability[column]:
+            return self.values[column]
+        return self.values[self.alias[column]]
+
+    def __len__(self):
+        return len(self.values)
+
+
+class LootTables:
+    """Tables de butin compilées depuis le catalogue d'objets"""
+
+    def __init__(self, items: Dict[str, object], rarity_weights: Optional[Dict[str, Dict[str, float]]] = None,
+                 rng=random):
+        self.rarity_weights = rarity_weights or LOOT_RARITY_WEIGHTS
+        self.rng = rng
+        self.tables: Dict[str, AliasTable] = {}
+        self.compile(items)
+
+    def compile(self, items: Dict[str, object]):
+        """(Re)compile toutes les tables ; à appeler quand le catalogue change"""
+        by_rarity: Dict[str, List[str]] = {}
+        for item_id, item in items.items():
+            by_rarity.setdefault(item.rarity, []).append(item_id)
+
+        self.tables = {}
+        for name, weights in self.rarity_weights.items():
+            entries = [(item_id, weight / len(by_rarity[rarity]))
+                       for rarity, weight in weights.items() if rarity in by_rarity
+                       for item_id in by_rarity[rarity]]
+            if entries:
+                self.tables[name] = AliasTable(entries)
+
+    def draw(self, table: str = 'monster') -> Optional[str]:
+        """Un objet de la table, None si la table est vide ou inconnue"""
+        alias_table = self.tables.get(table)
+        return alias_table.sample(self.rng) if alias_table else None
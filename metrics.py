@@ -0,0 +1,188 @@
+"""
+Métriques du serveur au format texte Prometheus, servies en HTTP local.
+
+Rien ici ne prend le verrou du serveur :
+- les jauges (clients, joueurs/monstres/objets par instance, files d'envoi
+  agrégées, minuteries) sont relevées par la boucle de jeu une fois par seconde, pendant
+  qu'elle détient déjà le verrou, puis publiées d'un bloc (simple
+  remplacement de référence) ;
+- les compteurs de messages ont leur propre petit verrou, tenu le temps d'une
+  addition ;
+- l'histogramme des ticks n'est alimenté que par la boucle de jeu ;
+- les percentiles par phase viennent de TickProfiler.stats(), qui a son propre verrou.
+Le thread HTTP ne fait que lire ces valeurs et les mettre en forme.
+"""
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+TICK_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.02, 0.033, 0.05, 0.1, 0.25)  # Secondes
+MAX_MESSAGE_TYPES = 64  # Au-delà, les types inconnus sont comptés sous "other"
+
+
+class Histogram:
+    """Histogramme à seaux fixes, alimenté par un seul thread"""
+
+    def __init__(self, buckets=TICK_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # Dernier seau : +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(borne le, nombre cumulé) comme l'attend Prometheus"""
+        total = 0
+        samples = []
+        for bound, count in zip(self.buckets + (float('inf'),), list(self.counts)):
+            total += count
+            samples.append(('+Inf' if bound == float('inf') else repr(bound), total))
+        return samples
+
+
+class MessageStats:
+    """Messages et octets par sens et par type, alimentés par tous les threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts: Dict[Tuple[str, str], List[int]] = {}  # (sens, type) -> [messages, octets]
+
+    def record(self, direction: str, msg_type, size: int):
+        if not isinstance(msg_type, str) or not msg_type:
+            msg_type = 'unknown'
+        key = (direction, msg_type)
+        with self.lock:
+            entry = self.counts.get(key)
+            if entry is None:
+                if len(self.counts) >= MAX_MESSAGE_TYPES:  # Types choisis par les clients : cardinalité bornée
+                    key = (direction, 'other')
+                    entry = self.counts.get(key)
+                if entry is None:
+                    entry = self.counts[key] = [0, 0]
+            entry[0] += 1
+            entry[1] += size
+
+    def snapshot(self) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        with self.lock:
+            return {key: (messages, size) for key, (messages, size) in self.counts.items()}
+
+
+class ServerMetrics:
+    """Valeurs exportées : jauges publiées par la boucle, compteurs de messages, histogramme des ticks"""
+
+    def __init__(self, profiler=None):
+        self.profiler = profiler  # TickProfiler : percentiles par phase des derniers ticks
+        self.messages = MessageStats()
+        self.tick_seconds = Histogram()
+        self.gauges: dict = {}  # Remplacé d'un bloc par publish()
+
+    def publish(self, gauges: dict):
+        self.gauges = gauges
+
+    def render(self) -> str:
+        """Exposition texte Prometheus"""
+        gauges = self.gauges
+        lines: List[str] = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{escape(val)}"' for key, val in labels)
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        metric('rpg_connected_clients', 'gauge', "Connexions clients ouvertes",
+               [((), gauges.get('clients', 0))])
+        for name, key, help_text in (('rpg_players', 'players', "Joueurs par instance"),
+                                     ('rpg_monsters', 'monsters', "Monstres par instance"),
+                                     ('rpg_dropped_items', 'dropped_items', "Objets au sol par instance")):
+            metric(name, 'gauge', help_text,
+                   [((('instance', instance),), count) for instance, count in sorted(gauges.get(key, {}).items())])
+        metric('rpg_send_queue_max_depth', 'gauge', "File d'envoi la plus longue parmi les connexions",
+               [((), gauges.get('send_queue_max', 0))])
+        metric('rpg_send_queued_messages', 'gauge', "Messages en attente d'envoi, toutes connexions",
+               [((), gauges.get('send_queue_total', 0))])
+        metric('rpg_pending_timers', 'gauge', "Minuteries en attente (respawns, effets)",
+               [((), gauges.get('pending_timers', 0))])
+
+        traffic = sorted(self.messages.snapshot().items())
+        metric('rpg_messages_total', 'counter', "Messages par sens et par type",
+               [((('direction', direction), ('type', msg_type)), messages)
+                for (direction, msg_type), (messages, _) in traffic])
+        metric('rpg_message_bytes_total', 'counter', "Octets par sens et par type de message",
+               [((('direction', direction), ('type', msg_type)), size)
+                for (direction, msg_type), (_, size) in traffic])
+
+        histogram = self.tick_seconds
+        lines.append("# HELP rpg_tick_duration_seconds Durée de travail des ticks de la boucle de jeu")
+        lines.append("# TYPE rpg_tick_duration_seconds histogram")
+        for bound, count in histogram.cumulative():
+            lines.append(f'rpg_tick_duration_seconds_bucket{{le="{bound}"}} {count}')
+        lines.append(f"rpg_tick_duration_seconds_sum {histogram.sum}")
+        lines.append(f"rpg_tick_duration_seconds_count {histogram.count}")
+
+        if self.profiler is not None:
+            phases = sorted(self.profiler.stats()['phases'].items())
+            lines.append("# HELP rpg_tick_phase_seconds Durée par phase (quantiles sur les derniers ticks)")
+            lines.append("# TYPE rpg_tick_phase_seconds summary")
+            for name, stats in phases:
+                phase = escape(name)
+                for quantile, key in (('0.5', 'p50_ms'), ('0.95', 'p95_ms'), ('0.99', 'p99_ms')):
+                    lines.append(f'rpg_tick_phase_seconds{{phase="{phase}",quantile="{quantile}"}} {stats[key] / 1000}')
+                lines.append(f'rpg_tick_phase_seconds_sum{{phase="{phase}"}} {stats["total_ms"] / 1000}')
+                lines.append(f'rpg_tick_phase_seconds_count{{phase="{phase}"}} {stats["count"]}')
+            metric('rpg_tick_phase_max_seconds', 'gauge', "Durée maximale par phase sur les derniers ticks",
+                   [((('phase', name),), stats['max_ms'] / 1000) for name, stats in phases])
+        return '\n'.join(lines) + '\n'
+
+
+def escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsExporter:
+    """Serveur HTTP local qui répond GET /metrics"""
+
+    def __init__(self, metrics: ServerMetrics, host: str = '127.0.0.1', port: int = 9105):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.httpd: Optional[ThreadingHTTPServer] = None
+
+    def start(self) -> int:
+        """Démarre le thread HTTP ; retourne le port effectif (utile avec port 0)"""
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Pas une ligne de log par relevé
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        print(f"Métriques Prometheus sur http://{self.host}:{self.port}/metrics")
+        return self.port
+
+    def stop(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
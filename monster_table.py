@@ -0,0 +1,282 @@
+"""
+Table des monstres en colonnes (struct-of-arrays).
+
+Les champs numériques des monstres (position, HP, attaque, défense, vivant,
+instance, dernier coup reçu) sont recopiés dans des colonnes, une ligne par
+monstre avec une correspondance id -> ligne stable. Les traitements de masse
+(régénération, recherche par zone) s'appliquent aux colonnes
+d'un coup au lieu de passer par les attributs de chaque objet.
+
+NumPy est optionnel : sans lui, les colonnes sont des listes Python et les
+mêmes opérations se font par boucle.
+
+Les objets Monster restent la référence pour le reste du serveur (et pour
+monster_to_dict) : une affectation d'un champ recopié est transmise à la
+table par Monster.__setattr__ ; la régénération réécrit les HP dans les objets.
+"""
+import time
+from typing import Dict, List, Optional
+
+from spatial import SpatialGrid, instance_of
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel
+    np = None
+
+# Champs de Monster recopiés dans la table
+MIRRORED_FIELDS = ('x', 'y', 'hp', 'max_hp', 'attack', 'defense', 'alive', 'dungeon_instance')
+
+COLUMN_TYPES = {
+    'x': 'f8', 'y': 'f8', 'hp': 'i8', 'max_hp': 'i8', 'attack': 'i8', 'defense': 'i8',
+    'alive': '?', 'instance': 'i4', 'last_hit': 'f8'
+}
+
+
+class MonsterTable:
+    """Colonnes des monstres, une ligne par monstre"""
+
+    def __init__(self, capacity: int = 256, use_numpy: Optional[bool] = None):
+        self.vectorized = np is not None if use_numpy is None else use_numpy and np is not None
+        self.capacity = capacity if self.vectorized else 0
+        self.count = 0
+        self.columns = {name: self.new_column(kind, self.capacity) for name, kind in COLUMN_TYPES.items()}
+        self.row_of: Dict[str, int] = {}
+        self.keys: List[str] = []  # ligne -> id
+        self.monsters: List[object] = []  # ligne -> objet Monster
+        self.instance_codes: Dict[str, int] = {'': 0}
+
+    def new_column(self, kind: str, size: int):
+        if self.vectorized:
+            return np.zeros(size, dtype=kind)
+        return []
+
+    def instance_code(self, instance) -> int:
+        instance = instance or ''
+        code = self.instance_codes.get(instance)
+        if code is None:
+            code = self.instance_codes[instance] = len(self.instance_codes)
+        return code
+
+    # --- Lignes -----------------------------------------------------------
+
+    def add(self, key: str, monster) -> int:
+        if key in self.row_of:
+            self.remove(key)
+        row = self.count
+        values = self.row_values(monster)
+        if self.vectorized:
+            if row == self.capacity:
+                self.grow()
+            for name, value in values.items():
+                self.columns[name][row] = value
+        else:
+            for name, value in values.items():
+                self.columns[name].append(value)
+        self.row_of[key] = row
+        self.keys.append(key)
+        self.monsters.append(monster)
+        self.count += 1
+        return row
+
+    def row_values(self, monster) -> dict:
+        return {
+            'x': monster.x, 'y': monster.y, 'hp': monster.hp, 'max_hp': monster.max_hp,
+            'attack': monster.attack, 'defense': monster.defense, 'alive': bool(monster.alive),
+            'instance': self.instance_code(instance_of(monster)), 'last_hit': 0.0
+        }
+
+    def grow(self):
+        self.capacity = max(16, self.capacity * 2)
+        for name, column in self.columns.items():
+            bigger = np.zeros(self.capacity, dtype=column.dtype)
+            bigger[:self.count] = column[:self.count]
+            self.columns[name] = bigger
+
+    def remove(self, key: str):
+        """Retire une ligne ; la dernière ligne prend sa place"""
+        row = self.row_of.pop(key, None)
+        if row is None:
+            return
+        last = self.count - 1
+        if row != last:
+            for column in self.columns.values():
+                column[row] = column[last]
+            moved_key = self.keys[last]
+            self.keys[row] = moved_key
+            self.monsters[row] = self.monsters[last]
+            self.row_of[moved_key] = row
+        self.keys.pop()
+        self.monsters.pop()
+        if not self.vectorized:
+            for column in self.columns.values():
+                column.pop()
+        self.count -= 1
+
+    def clear(self):
+        self.count = 0
+        self.row_of.clear()
+        self.keys.clear()
+        self.monsters.clear()
+        if not self.vectorized:
+            for column in self.columns.values():
+                column.clear()
+
+    def write(self, key: str, name: str, value):
+        """Recopie un champ de Monster modifié"""
+        row = self.row_of.get(key)
+        if row is None:
+            return
+        if name == 'dungeon_instance':
+            self.columns['instance'][row] = self.instance_code(value)
+            return
+        if name == 'hp' and value < self.columns['hp'][row]:
+            self.columns['last_hit'][row] = time.time()
+        self.columns[name][row] = value
+
+    def get(self, key: str, name: str):
+        return self.columns[name][self.row_of[key]]
+
+    def __len__(self):
+        return self.count
+
+    # --- Traitements de masse ---------------------------------------------
+
+    def rows_for(self, keys) -> List[int]:
+        row_of = self.row_of
+        return [row_of[key] for key in keys if key in row_of]
+
+    def regenerate(self, amount: int, delay: float, now: Optional[float] = None,
+                   rows: Optional[List[int]] = None) -> List[str]:
+        """Rend amount HP aux monstres vivants blessés et hors combat depuis delay secondes.
+
+        rows limite la passe à ces lignes (monstres des zones observées)."""
+        now = time.time() if now is None else now
+        c = self.columns
+        n = self.count
+        if self.vectorized:
+            selection = slice(0, n) if rows is None else np.asarray(rows, dtype=np.intp)
+            mask = (c['alive'][selection] & (c['hp'][selection] < c['max_hp'][selection])
+                    & (now - c['last_hit'][selection] >= delay))
+            rows = np.arange(n)[mask] if rows is None else selection[mask]
+            if not len(rows):
+                return []
+            c['hp'][rows] = np.minimum(c['max_hp'][rows], c['hp'][rows] + amount)
+            rows = rows.tolist()
+        else:
+            hp, max_hp, alive, last_hit = c['hp'], c['max_hp'], c['alive'], c['last_hit']
+            rows = [row for row in (range(n) if rows is None else rows)
+                    if alive[row] and hp[row] < max_hp[row] and now - last_hit[row] >= delay]
+            for row in rows:
+                hp[row] = min(max_hp[row], hp[row] + amount)
+        self.write_back_hp(rows)
+        return [self.keys[row] for row in rows]
+
+    def catch_up_regeneration(self, rows: List[int], amount: int, delay: float, interval: float,
+                              since: float, now: Optional[float] = None) -> List[str]:
+        """Régénération due depuis since, appliquée d'un coup (zone endormie qui se réveille).
+
+        Un monstre gagne amount HP par interval écoulé depuis since, ou depuis la fin
+        de son délai hors combat si elle est plus tardive."""
+        now = time.time() if now is None else now
+        c = self.columns
+        hp, max_hp, alive, last_hit = c['hp'], c['max_hp'], c['alive'], c['last_hit']
+        healed = []
+        for row in rows:
+            if not alive[row] or hp[row] >= max_hp[row]:
+                continue
+            periods = int((now - max(since, float(last_hit[row]) + delay)) // interval)
+            if periods > 0:
+                hp[row] = min(int(max_hp[row]), int(hp[row]) + periods * amount)
+                healed.append(row)
+        self.write_back_hp(healed)
+        return [self.keys[row] for row in healed]
+
+    def write_back_hp(self, rows):
+        """Réécrit les HP dans les objets sans repasser par la table"""
+        c = self.columns
+        for row in rows:
+            object.__setattr__(self.monsters[row], 'hp', int(c['hp'][row]))
+
+    def within(self, x: float, y: float, radius: float, instance: str = '',
+               rows: Optional[List[int]] = None) -> List[str]:
+        """ids des monstres de l'instance à moins de radius de (x, y).
+
+        rows limite le test à ces lignes (candidats de la grille) ; sans rows, toute la table."""
+        code = self.instance_codes.get(instance or '')
+        if code is None:
+            return []
+        c = self.columns
+        n = self.count
+        limit = radius * radius
+        if self.vectorized:
+            selection = np.arange(n) if rows is None else np.asarray(rows, dtype=np.intp)
+            dx = c['x'][selection] - x
+            dy = c['y'][selection] - y
+            rows = selection[(c['instance'][selection] == code) & (dx * dx + dy * dy <= limit)].tolist()
+        else:
+            xs, ys, instances = c['x'], c['y'], c['instance']
+            rows = [row for row in (range(n) if rows is None else rows)
+                    if instances[row] == code and (xs[row] - x) ** 2 + (ys[row] - y) ** 2 <= limit]
+        return [self.keys[row] for row in rows]
+
+
+class MonsterGrid(SpatialGrid):
+    """Index spatial des monstres doublé de leur table en colonnes"""
+
+    def __init__(self, cell_size: float = 128, use_numpy: Optional[bool] = None):
+        super().__init__(cell_size)
+        self.table = MonsterTable(use_numpy=use_numpy)
+
+    def attach(self, entity_id, monster):
+        self.table.add(entity_id, monster)
+        if hasattr(type(monster), 'store'):  # Monster signale ses changements
+            object.__setattr__(monster, 'store', self)
+            object.__setattr__(monster, 'store_key', entity_id)
+
+    def detach(self, entity_id):
+        monster = self.get(entity_id)
+        if monster is not None and getattr(monster, 'store', None) is self:
+            object.__setattr__(monster, 'store', None)
+        self.table.remove(entity_id)
+
+    def field_changed(self, entity_id, name, value):
+        """Appelé par Monster.__setattr__ pour les champs recopiés"""
+        self.table.write(entity_id, name, value)
+        if name in ('x', 'y', 'dungeon_instance'):
+            self.relocate(entity_id)
+
+    def __setitem__(self, entity_id, monster):
+        if entity_id in self:
+            self.detach(entity_id)
+        super().__setitem__(entity_id, monster)
+        self.attach(entity_id, monster)
+
+    def __delitem__(self, entity_id):
+        self.detach(entity_id)
+        super().__delitem__(entity_id)
+
+    def pop(self, entity_id, *default):
+        if entity_id in self:
+            self.detach(entity_id)
+        return super().pop(entity_id, *default)
+
+    def popitem(self):
+        entity_id = next(reversed(self))
+        return entity_id, self.pop(entity_id)
+
+    def clear(self):
+        for monster in self.values():
+            if getattr(monster, 'store', None) is self:
+                object.__setattr__(monster, 'store', None)
+        super().clear()
+        self.table.clear()
+
+    def query_radius(self, x, y, radius, instance='', predicate=None):
+        """Cellules de la grille autour du point, distances testées sur les colonnes de leurs seules lignes"""
+        cells = self.candidate_cells(instance, x - radius, y - radius, x + radius, y + radius)
+        rows = self.table.rows_for([key for cell in cells for key in cell])
+        if not rows:
+            return []
+        monsters = [self[key] for key in self.table.within(x, y, radius, instance, rows)]
+        return [m for m in monsters if predicate is None or predicate(m)]
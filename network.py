@@ -0,0 +1,261 @@
+"""
+Couche réseau du serveur : files d'envoi et connexions (threadées ou asyncio)
+"""
+import asyncio
+import socket
+import threading
+from collections import deque
+from typing import Any, List, Optional
+
+import config
+from framing import FrameDecoder, FrameError, WIRE_JSON_LINES
+
+
+class OutboundQueue:
+    """File d'envoi bornée d'une connexion.
+
+    Les messages fiables (événements) sont conservés dans l'ordre. Les
+    snapshots sont en mode "dernier seulement" : un nouveau snapshot remplace
+    celui qui attend encore, et le snapshot remplacé est compté comme perdu.
+    Si la file dépasse max_messages, le client est trop lent : overflowed
+    passe à True et la connexion doit être fermée.
+    """
+
+    def __init__(self, max_messages: int = None):
+        self.max_messages = max_messages or config.SEND_QUEUE_MAX_MESSAGES
+        self.entries = deque()  # [data] ; data=None pour un snapshot remplacé
+        self.pending_snapshot = None
+        self.size = 0  # Messages réellement en attente
+        self.tombstones = 0
+        self.not_empty = threading.Condition()
+        self.dropped_frames = 0
+        self.overflowed = False
+        self.closed = False
+
+    def put(self, data: bytes, latest_only: bool = False) -> bool:
+        with self.not_empty:
+            if self.closed or self.overflowed:
+                return False
+            entry = [data]
+            if latest_only:
+                if self.pending_snapshot is not None:
+                    self.pending_snapshot[0] = None
+                    self.dropped_frames += 1
+                    self.tombstones += 1
+                    if self.tombstones > self.max_messages:
+                        # Compacter les snapshots remplacés si l'écrivain est bloqué
+                        self.entries = deque(e for e in self.entries if e[0] is not None)
+                        self.tombstones = 0
+                else:
+                    self.size += 1
+                self.pending_snapshot = entry
+            elif self.size >= self.max_messages:
+                self.overflowed = True
+                self.not_empty.notify()
+                return False
+            else:
+                self.size += 1
+            self.entries.append(entry)
+            self.not_empty.notify()
+            return True
+
+    def get_batch(self, timeout: Optional[float] = 0) -> List[bytes]:
+        """Vide la file ; attend jusqu'à timeout secondes si elle est vide"""
+        with self.not_empty:
+            if not self.entries and timeout != 0 and not (self.closed or self.overflowed):
+                self.not_empty.wait(timeout)
+            batch = [entry[0] for entry in self.entries if entry[0] is not None]
+            self.entries.clear()
+            self.pending_snapshot = None
+            self.size = 0
+            self.tombstones = 0
+            return batch
+
+    def close(self):
+        with self.not_empty:
+            self.closed = True
+            self.not_empty.notify_all()
+
+    def __len__(self):
+        return self.size
+
+
+class SocketConnection:
+    """Connexion du mode threadé : socket bloquant + thread écrivain dédié.
+
+    send/send_snapshot ne font qu'empiler dans la file d'envoi ; seul le
+    thread écrivain appelle socket.sendall, jamais sous le verrou du monde.
+    """
+
+    def __init__(self, sock: socket.socket, server: Any = None):
+        self.sock = sock
+        self.server = server
+        self.wire_format = WIRE_JSON_LINES  # Fixé par le premier message du client
+        self.snapshot_format = "json"  # "binary" si demandé au join (format framed seulement)
+        self.snapshot_history = None  # delta.SnapshotHistory si le client acquitte les ticks
+        self.queue = OutboundQueue()
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.closed = False
+        self.writer = threading.Thread(target=self.writer_loop, daemon=True)
+        self.writer.start()
+
+    def send(self, data: bytes):
+        if not self.queue.put(data):
+            self.handle_overflow()
+        return len(data)
+
+    def send_snapshot(self, data: bytes):
+        self.queue.put(data, latest_only=True)
+        return len(data)
+
+    @property
+    def dropped_frames(self):
+        return self.queue.dropped_frames
+
+    def handle_overflow(self):
+        if self.queue.overflowed and not self.closed:
+            print("Client trop lent (file d'envoi pleine), déconnexion")
+            self.close()
+
+    def writer_loop(self):
+        while not self.closed:
+            batch = self.queue.get_batch(timeout=1.0)
+            if self.queue.overflowed:
+                self.handle_overflow()
+                break
+            if not batch:
+                continue
+            try:
+                self.sock.sendall(b"".join(batch))
+                self.messages_sent += len(batch)
+                self.bytes_sent += sum(len(data) for data in batch)
+            except (OSError, socket.timeout):
+                # Le thread lecteur détecte la fermeture et nettoie
+                self.close()
+                break
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.close()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class AsyncClientConnection(asyncio.BufferedProtocol):
+    """Connexion client hébergée sur la boucle asyncio du serveur.
+
+    Expose la même interface qu'un socket (send/close) pour que
+    process_message, send_to_client et disconnect_client fonctionnent
+    sans distinction de mode réseau.
+    """
+
+    def __init__(self, server: Any, loop: asyncio.AbstractEventLoop):
+        self.server = server
+        self.loop = loop
+        self.loop_thread_id = threading.get_ident()
+        self.transport = None
+        self.decoder = FrameDecoder()
+        self.wire_format = WIRE_JSON_LINES
+        self.snapshot_format = "json"
+        self.snapshot_history = None
+        self.closed = False
+        self.queue = OutboundQueue()
+        self.flush_scheduled = False
+        self.paused = False  # Tampon du transport plein (client lent)
+        self.messages_sent = 0
+        self.bytes_sent = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        print(f"Nouvelle connexion depuis {transport.get_extra_info('peername')}")
+
+    def get_buffer(self, sizehint: int):
+        # Lecture directe dans le tampon préalloué du décodeur (équivalent recv_into)
+        return self.decoder.get_buffer()
+
+    def buffer_updated(self, nbytes: int):
+        self.decoder.buffer_updated(nbytes)
+        try:
+            for message in self.decoder.messages():
+                self.wire_format = self.decoder.mode
+                try:
+                    self.server.process_message(self, message, self.decoder.last_size)
+                except Exception as e:
+                    print(f"Erreur traitement message: {e}")
+        except FrameError as e:
+            print(f"Flux invalide, fermeture de la connexion: {e}")
+            self.close()
+
+    def connection_lost(self, exc):
+        self.closed = True
+        self.server.disconnect_client(self)
+
+    def pause_writing(self):
+        self.paused = True
+
+    def resume_writing(self):
+        self.paused = False
+        self.flush()
+
+    def send(self, data: bytes):
+        """Empile un message fiable, depuis n'importe quel thread"""
+        if self.closed:
+            # connection_lost se charge du nettoyage
+            return 0
+        if not self.queue.put(data):
+            print("Client trop lent (file d'envoi pleine), déconnexion")
+            self.close()
+            return 0
+        self.schedule_flush()
+        return len(data)
+
+    def send_snapshot(self, data: bytes):
+        """Empile un snapshot qui remplace le précédent s'il n'est pas parti"""
+        if self.closed:
+            return 0
+        self.queue.put(data, latest_only=True)
+        self.schedule_flush()
+        return len(data)
+
+    @property
+    def dropped_frames(self):
+        return self.queue.dropped_frames
+
+    def schedule_flush(self):
+        if self.flush_scheduled:
+            return
+        self.flush_scheduled = True
+        if threading.get_ident() == self.loop_thread_id:
+            self.loop.call_soon(self.flush)
+        else:
+            self.loop.call_soon_threadsafe(self.flush)
+
+    def flush(self):
+        """Étape d'écriture : vide la file sur le transport (boucle asyncio)"""
+        self.flush_scheduled = False
+        if self.closed or self.paused or self.transport is None:
+            return
+        batch = self.queue.get_batch()
+        if batch:
+            self.transport.write(b"".join(batch))
+            self.messages_sent += len(batch)
+            self.bytes_sent += sum(len(data) for data in batch)
+
+    def close(self):
+        if self.closed or self.transport is None:
+            return
+        self.closed = True
+        self.queue.close()
+        if threading.get_ident() == self.loop_thread_id:
+            self.transport.close()
+        else:
+            self.loop.call_soon_threadsafe(self.transport.close)
@@ -0,0 +1,144 @@
+"""
+Profileur des ticks de la boucle de jeu.
+
+Chaque tick est découpé en phases nommées (commandes, minuteries, IA,
+construction des snapshots, encodage, envoi...). Les durées d'une phase sont
+cumulées sur le tick puis rangées dans une fenêtre glissante par phase, d'où
+les percentiles p50/p95/p99 et le maximum. Le temps d'attente du verrou du
+serveur et les octets envoyés par tick sont suivis de la même manière.
+
+Seul le thread qui exécute le tick alimente le profileur : les envois faits
+depuis les threads réseau (réponses aux messages) ne faussent pas les phases.
+stats() peut être appelé depuis n'importe quel thread.
+"""
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Percentile par rang le plus proche d'une liste triée"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+class TickProfiler:
+    """Fenêtres glissantes des durées par phase, de l'attente du verrou et des octets envoyés"""
+
+    def __init__(self, window: int = 300, clock=time.perf_counter):
+        self.window = window
+        self.clock = clock
+        self.samples: Dict[str, deque] = {}  # phase -> dernières durées (secondes)
+        self.max_seen: Dict[str, float] = {}  # phase -> plus longue durée depuis le démarrage
+        self.totals: Dict[str, List[float]] = {}  # phase -> [ticks, durée cumulée] depuis le démarrage
+        self.tick_bytes = deque(maxlen=window)
+        self.bytes_total = 0
+        self.ticks = 0
+        self.current: Optional[Dict[str, float]] = None
+        self.current_bytes = 0
+        self.thread = None
+        self.started = 0.0
+        self.lock = threading.Lock()  # Lecture des stats depuis un autre thread
+
+    def begin_tick(self):
+        self.current = {}
+        self.current_bytes = 0
+        self.thread = threading.get_ident()
+        self.started = self.clock()
+
+    def add(self, name: str, seconds: float):
+        """Ajoute une durée à la phase name du tick en cours (ignoré hors du thread du tick)"""
+        if self.thread == threading.get_ident():
+            self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def counted(self) -> float:
+        """Temps déjà réparti entre les phases du tick en cours"""
+        if self.thread != threading.get_ident():
+            return 0.0
+        return sum(self.current.values())
+
+    def add_bytes(self, count: int):
+        if self.thread == threading.get_ident():
+            self.current_bytes += count
+
+    @contextmanager
+    def phase(self, name: str):
+        """Temps propre de la phase : les phases imbriquées (encode, send...) n'y sont pas recomptées"""
+        started = self.clock()
+        nested_before = self.counted()
+        try:
+            yield
+        finally:
+            self.exclusive(name, started, nested_before)
+
+    def exclusive(self, name: str, started: float, nested_before: float):
+        """Ajoute à name le temps écoulé depuis started, moins celui compté ailleurs entre-temps"""
+        nested = self.counted() - nested_before
+        self.add(name, max(0.0, self.clock() - started - nested))
+
+    def end_tick(self) -> float:
+        """Range les durées du tick en cours ; retourne sa durée totale (secondes)"""
+        if self.current is None:
+            return 0.0
+        current = self.current
+        current['tick'] = self.clock() - self.started
+        self.current, self.thread = None, None
+        with self.lock:
+            self.ticks += 1
+            for name, seconds in current.items():
+                samples = self.samples.get(name)
+                if samples is None:
+                    samples = self.samples[name] = deque(maxlen=self.window)
+                samples.append(seconds)
+                if seconds > self.max_seen.get(name, 0.0):
+                    self.max_seen[name] = seconds
+                total = self.totals.setdefault(name, [0, 0.0])
+                total[0] += 1
+                total[1] += seconds
+            self.tick_bytes.append(self.current_bytes)
+            self.bytes_total += self.current_bytes
+        return current['tick']
+
+    def stats(self) -> dict:
+        """Percentiles par phase (ms) sur la fenêtre, octets envoyés par tick"""
+        with self.lock:
+            windows = {name: sorted(samples) for name, samples in self.samples.items()}
+            max_seen = dict(self.max_seen)
+            totals = {name: tuple(total) for name, total in self.totals.items()}
+            tick_bytes = sorted(self.tick_bytes)
+            ticks, bytes_total = self.ticks, self.bytes_total
+        phases = {}
+        for name, ordered in windows.items():
+            phases[name] = {
+                'samples': len(ordered),
+                'avg_ms': sum(ordered) / len(ordered) * 1000 if ordered else 0.0,
+                'p50_ms': percentile(ordered, 0.50) * 1000,
+                'p95_ms': percentile(ordered, 0.95) * 1000,
+                'p99_ms': percentile(ordered, 0.99) * 1000,
+                'max_ms': ordered[-1] * 1000 if ordered else 0.0,
+                'max_ever_ms': max_seen.get(name, 0.0) * 1000,
+                'count': totals[name][0],  # Cumulés depuis le démarrage (summary Prometheus)
+                'total_ms': totals[name][1] * 1000
+            }
+        return {
+            'ticks': ticks,
+            'window': self.window,
+            'phases': phases,
+            'bytes_per_tick': {
+                'p50': percentile(tick_bytes, 0.50),
+                'p95': percentile(tick_bytes, 0.95),
+                'p99': percentile(tick_bytes, 0.99),
+                'max': tick_bytes[-1] if tick_bytes else 0,
+                'total': bytes_total
+            }
+        }
+
+    def dump(self, path: str):
+        """Écrit les stats dans un fichier JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.stats(), f, indent=2)
@@ -1,11 +1,36 @@
 import socket
 import threading
+import asyncio
+import argparse
 import json
 import time
 import random
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Dict, List, Tuple, Optional, Any
 import traceback
+import zlib
+from collections import deque
+from contextlib import contextmanager
+
+import config
+from framing import FrameDecoder, FrameError, FRAME_SNAPSHOT, WIRE_FRAMED, WIRE_JSON_LINES, encode_frame, encode_message
+from snapshot_codec import encode_snapshot
+from delta import SnapshotHistory, make_delta
+from interest import InterestManager
+from timestep import FixedTimestep
+from timers import TimerQueue
+from spatial import InstanceRegistry, SpatialGrid
+from expiry import ExpiryBuckets
+from loot import LootTables
+from spawns import SpawnTable
+from stats import SKILL_UPGRADES, PlayerStats
+from effects import EFFECTS, EffectSet, StatusEffects
+from ai import IDLE, MonsterAI
+from zones import ZoneActivity
+from profiler import TickProfiler
+from metrics import MetricsExporter, ServerMetrics
+from monster_table import MIRRORED_FIELDS, MonsterGrid
+from network import AsyncClientConnection, OutboundQueue, SocketConnection
 
 @dataclass
 class Item:
@@ -26,7 +51,7 @@ class ItemStack:
     item: Item
     quantity: int = 1
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     id: str
     name: str
@@ -52,16 +77,19 @@ class Player:
     gold: int = 0  # Monnaie du jeu
     socket: Any = None  # Référence socket pour communication
     dungeon_instance: str = ""  # ID de l'instance de donjon actuelle
+    stats: PlayerStats = field(default_factory=PlayerStats, repr=False, compare=False)  # Couches de stats
+    effects: Optional[EffectSet] = field(default=None, repr=False, compare=False)  # Effets d'état actifs (créé au premier)
 
-@dataclass
+@dataclass(slots=True)
 class DroppedItem:
     drop_id: str
     item_id: str
     x: float
     y: float
     drop_time: float  # Pour la disparition automatique
+    dungeon_instance: str = ""  # Instance où l'objet est tombé ("" = monde principal)
 
-@dataclass
+@dataclass(slots=True)
 class Monster:
     id: str
     x: float
@@ -75,6 +103,27 @@ class Monster:
     target_player: str = None
     is_boss: bool = False  # Nouveau: marquer les boss
     boss_abilities: List[str] = field(default_factory=list)  # Capacités spéciales des boss
+    dungeon_instance: str = ""  # ID de l'instance de donjon ("" = monde principal)
+    spawn_slot: int = -1  # Règle d'apparition (spawns.py), -1 : pas de respawn
+    effects: Optional[EffectSet] = field(default=None, repr=False, compare=False)  # Effets d'état actifs (créé au premier)
+    ai_state: str = IDLE  # État de l'IA (ai.py)
+    home_x: Optional[float] = None  # Point d'apparition, où le monstre revient (leash)
+    home_y: Optional[float] = None
+    ai_updated: float = -1.0  # Dernière mise à jour de l'IA (secondes de jeu)
+    last_attack: float = float('-inf')
+    store: Any = field(default=None, repr=False, compare=False)  # MonsterGrid qui le contient (monster_table.py)
+    store_key: Optional[str] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.home_x is None:
+            self.home_x, self.home_y = self.x, self.y
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        # store n'existe pas encore pendant __init__
+        store = getattr(self, 'store', None)
+        if store is not None and name in MIRRORED_FIELDS:
+            store.field_changed(self.store_key, name, value)
 
 @dataclass
 class Dungeon:
@@ -97,24 +146,58 @@ class DungeonInstance:
     instance_id: str
     dungeon_template_id: str
     players: List[str] = field(default_factory=list)
-    monsters: Dict[str, Monster] = field(default_factory=dict)
+    monsters: Dict[str, Monster] = field(default_factory=dict)  # Registre des monstres de l'instance
     boss_spawned: bool = False
     completed: bool = False
     created_time: float = field(default_factory=time.time)
+    
+    def __post_init__(self):
+        # Les monstres ajoutés au registre sont rattachés à l'instance
+        self.monsters = InstanceRegistry(self.instance_id, self.monsters)
 
 class GameServer:
-    def __init__(self, host='localhost', port=12345):
+    def __init__(self, host='localhost', port=12345, network_mode=None, command_queue=None):
         self.host = host
         self.port = port
+        self.network_mode = network_mode or config.SERVER_NETWORK_MODE  # "threaded" ou "asyncio"
+        if command_queue is None:
+            command_queue = config.SERVER_COMMAND_QUEUE
+        # File de commandes : les threads réseau y déposent les messages, la boucle de jeu les applique
+        self.command_queue = deque() if command_queue else None
+        self.command_stats = {'applied': 0, 'coalesced': 0, 'disconnects': 0, 'max_batch': 0}
+        self.async_loop = None  # Boucle asyncio (mode asyncio seulement)
+        self.async_server = None
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.clients: Dict[socket.socket, Player] = {}
-        self.players: Dict[str, Player] = {}
-        self.monsters: Dict[str, Monster] = {}
+        # Entités indexées par cellule et par instance (voir spatial.py)
+        self.players: Dict[str, Player] = SpatialGrid(config.SPATIAL_CELL_SIZE)
+        self.monsters: Dict[str, Monster] = MonsterGrid(config.SPATIAL_CELL_SIZE, config.MONSTER_TABLE_NUMPY)  # + colonnes
         self.items: Dict[str, Item] = {}  # Tous les objets du jeu
-        self.dropped_items: Dict[str, DroppedItem] = {}  # Objets au sol
+        self.dropped_items: Dict[str, DroppedItem] = SpatialGrid(config.SPATIAL_CELL_SIZE)  # Objets au sol
+        self.drop_expiry = ExpiryBuckets(config.DROPPED_ITEM_EXPIRY_BUCKET)  # Disparition des objets au sol
+        self.expired_drops_total = 0
         self.item_counter = 0  # Pour générer des IDs uniques
         self.running = True
         self.lock = threading.Lock()  # Pour la synchronisation
+        self.dropped_frames_total = 0  # Snapshots remplacés avant envoi (clients déconnectés)
+        self.tick = 0  # Numéro du tick de simulation (numérote les snapshots)
+        self.timestep = FixedTimestep(config.GAME_UPDATE_RATE, config.GAME_LOOP_MAX_CATCH_UP)
+        self.profiler = TickProfiler(config.TICK_PROFILE_WINDOW)  # Durée des phases de chaque tick
+        self.profile_dump_path = config.TICK_PROFILE_DUMP  # Stats du profileur écrites à l'arrêt
+        self.metrics = ServerMetrics(self.profiler)  # Exportées en texte Prometheus (voir metrics.py)
+        self.metrics_port = config.METRICS_PORT if config.METRICS_ENABLED else None
+        self.metrics_exporter = None
+        self.timers = TimerQueue(config.GAME_UPDATE_RATE)  # Respawns et effets temporaires
+        self.effects = StatusEffects(self.timers, self.effects_changed)  # Effets d'état (Charge, Rage...)
+        self.ai = MonsterAI(self.players, self.monsters, self.monster_attack)  # Aggro, poursuite, leash
+        self.zones = ZoneActivity(config.ZONE_OBSERVE_RADIUS)  # Zones sans observateur endormies
+        self.private_views: Dict[str, dict] = {}  # Dernière vue privée envoyée à chaque joueur
+        self.encode_stats = self.new_encode_stats()  # Encodages du dernier tick envoyé
+        self.encode_totals = self.new_encode_stats()  # Cumul depuis le démarrage
+        self.interest = None  # Filtrage par zone d'intérêt des snapshots du monde
+        if config.INTEREST_ENABLED:
+            self.interest = InterestManager(config.INTEREST_CELL_SIZE, config.INTEREST_NEAR_RADIUS,
+                                            config.INTEREST_FAR_RADIUS, config.INTEREST_FAR_INTERVAL)
         
         # Nouveau: Système de donjons
         self.dungeons: Dict[str, Dungeon] = {}  # Templates de donjons
@@ -130,75 +213,32 @@ class GameServer:
         }
         
         # Spawn initial monsters
+        self.spawns = SpawnTable()  # Règles d'apparition compilées une fois
         self.spawn_monsters()
         
         # Initialize items database
         self.init_items()
+        self.loot = LootTables(self.items)  # Tables de butin compilées une fois depuis le catalogue
         
         # Initialize dungeons
         self.init_dungeons()
         
+        # Données statiques envoyées une fois au join (les snapshots y font référence)
+        self.manifest = self.build_manifest()
+        
     def spawn_monsters(self):
         """Spawn random monsters on the map"""
-        # Spawn différents types de monstres selon les zones
-        self.spawn_zone_monsters()
-        
-        # Ajouter quelques monstres aléatoires supplémentaires
-        for i in range(20):
-            monster_id = f"monster_random_{i}"
-            self.monsters[monster_id] = Monster(
-                id=monster_id,
-                x=random.randint(100, 3100),
-                y=random.randint(100, 2300),
-                hp=random.randint(30, 60),
-                max_hp=random.randint(30, 60),
-                attack=random.randint(8, 15),
-                defense=random.randint(2, 8),
-                xp_reward=random.randint(15, 30)
-            )
+        # Population initiale des tables d'apparition : monstres de zone puis monstres aléatoires
+        for monster_id, slot in self.spawns.initial_slots():
+            self.spawn_from_slot(monster_id, slot)
     
-    def spawn_zone_monsters(self):
-        """Spawn des monstres spécifiques dans chaque zone"""
-        zone_width = 3200 // 3  # 1066
-        zone_height = 2400 // 3  # 800
-        
-        zones = [
-            # (zone_name, x_start, y_start, monster_prefix, count, level_range)
-            ("plains", 0, 0, "Slime", 8, (20, 40)),
-            ("forest", zone_width, 0, "Loup", 10, (35, 55)),
-            ("mountains", zone_width*2, 0, "Orc", 12, (50, 70)),
-            ("desert", 0, zone_height, "Momie", 10, (45, 65)),
-            ("coast", zone_width, zone_height, "Pirate", 8, (55, 75)),
-            ("volcano", zone_width*2, zone_height, "Drake", 6, (70, 90)),
-            ("ice", 0, zone_height*2, "Yeti", 8, (40, 60)),
-            ("swamp", zone_width, zone_height*2, "Troll", 7, (60, 80)),
-            ("crystal", zone_width*2, zone_height*2, "Golem", 5, (80, 100))
-        ]
-        
-        for zone_name, x_start, y_start, monster_type, count, (min_hp, max_hp) in zones:
-            for i in range(count):
-                monster_id = f"{monster_type}_{zone_name}_{i}"
-                
-                # Position dans la zone
-                x = random.randint(x_start + 50, min(x_start + zone_width - 50, 3150))
-                y = random.randint(y_start + 50, min(y_start + zone_height - 50, 2350))
-                
-                # Stats basées sur la zone
-                hp = random.randint(min_hp, max_hp)
-                attack = random.randint(8 + (min_hp // 10), 15 + (max_hp // 10))
-                defense = random.randint(2 + (min_hp // 20), 8 + (max_hp // 15))
-                xp = random.randint(15 + (min_hp // 5), 30 + (max_hp // 3))
-                
-                self.monsters[monster_id] = Monster(
-                    id=monster_id,
-                    x=x,
-                    y=y,
-                    hp=hp,
-                    max_hp=hp,
-                    attack=attack,
-                    defense=defense,
-                    xp_reward=xp
-                )
+    def spawn_from_slot(self, monster_id: str, slot: int):
+        """Crée (ou recrée) un monstre à partir de sa règle d'apparition"""
+        self.monsters[monster_id] = Monster(id=monster_id, **self.spawns.roll(slot))
+    
+    def zone_layout(self):
+        """Découpage du monde en zones : [(nom, x, y, monstre, nombre, (hp min, hp max))]"""
+        return self.spawns.zone_layout()
     
     def init_items(self):
         """Initialize the items database"""
@@ -269,11 +309,40 @@ class GameServer:
             boss_id="ancient_dragon"
         )
     
+    def build_manifest(self):
+        """Manifeste versionné : donjons, catalogue d'objets, zones et classes"""
+        items = [asdict(item) for item in self.items.values()]
+        self.item_index = {item.id: index for index, item in enumerate(self.items.values())}
+        zone_width = 3200 // 3
+        zone_height = 2400 // 3
+        content = {
+            'dungeons': {did: self.dungeon_to_dict(d) for did, d in self.dungeons.items()},
+            'items': items,  # Les objets au sol référencent leur index dans cette liste
+            'zones': [{'name': name, 'x': x, 'y': y, 'width': zone_width, 'height': zone_height,
+                       'monster': monster_type}
+                      for name, x, y, monster_type, _, _ in self.zone_layout()],
+            'class_stats': self.class_stats
+        }
+        # La version dépend du contenu : un client à jour n'a pas besoin de le recevoir
+        version = zlib.crc32(json.dumps(content, sort_keys=True).encode('utf-8'))
+        return {'type': 'manifest', 'version': version, **content}
+    
     def start_server(self):
+        """Démarre le serveur dans le mode réseau configuré"""
+        if self.metrics_port is not None:
+            self.metrics_exporter = MetricsExporter(self.metrics, config.METRICS_HOST, self.metrics_port)
+            self.metrics_exporter.start()
+        if self.network_mode == "asyncio":
+            asyncio.run(self.serve_asyncio())
+        else:
+            self.serve_threaded()
+    
+    def serve_threaded(self):
+        """Mode threadé : un thread OS par connexion"""
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.socket.bind((self.host, self.port))
-        self.socket.listen(5)
-        print(f"Serveur démarré sur {self.host}:{self.port}")
+        self.socket.listen(config.SERVER_BACKLOG)
+        print(f"Serveur démarré sur {self.host}:{self.port} (mode threadé)")
         
         # Start game loop in separate thread
         threading.Thread(target=self.game_loop, daemon=True).start()
@@ -287,45 +356,42 @@ class GameServer:
                 print(f"Erreur serveur: {e}")
                 break
     
+    async def serve_asyncio(self):
+        """Mode asyncio : toutes les connexions sur une seule boucle d'événements"""
+        self.async_loop = asyncio.get_running_loop()
+        self.async_server = await self.async_loop.create_server(
+            lambda: AsyncClientConnection(self, self.async_loop),
+            self.host, self.port,
+            backlog=config.SERVER_BACKLOG,
+            reuse_address=True
+        )
+        print(f"Serveur démarré sur {self.host}:{self.port} (mode asyncio)")
+        
+        # La simulation reste sur son propre thread
+        threading.Thread(target=self.game_loop, daemon=True).start()
+        
+        async with self.async_server:
+            try:
+                await self.async_server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+    
     def handle_client(self, client_socket):
         client_socket.settimeout(30.0)  # Timeout de 30 secondes
-        buffer = ""
+        # Les envois passent par la file de la connexion et son thread écrivain
+        connection = SocketConnection(client_socket, self)
+        decoder = FrameDecoder()
         try:
             while self.running:
                 try:
-                    data = client_socket.recv(4096).decode('utf-8')
-                    if not data:
+                    if decoder.recv_into(client_socket) == 0:
                         break
                     
-                    buffer += data
-                    
-                    # Process complete JSON messages
-                    while '\n' in buffer or '}' in buffer:
+                    # Process complete messages (frames ou lignes JSON selon le client)
+                    for message in decoder.messages():
+                        connection.wire_format = decoder.mode
                         try:
-                            # Try to find a complete JSON message
-                            if '\n' in buffer:
-                                message_str, buffer = buffer.split('\n', 1)
-                            else:
-                                # Look for complete JSON by counting braces
-                                brace_count = 0
-                                for i, char in enumerate(buffer):
-                                    if char == '{':
-                                        brace_count += 1
-                                    elif char == '}':
-                                        brace_count -= 1
-                                        if brace_count == 0:
-                                            message_str = buffer[:i+1]
-                                            buffer = buffer[i+1:]
-                                            break
-                                else:
-                                    break  # No complete message yet
-                            
-                            if message_str.strip():
-                                message = json.loads(message_str.strip())
-                                self.process_message(client_socket, message)
-                        except json.JSONDecodeError:
-                            # Invalid JSON, skip this message
-                            continue
+                            self.process_message(connection, message, decoder.last_size)
                         except Exception as e:
                             print(f"Erreur traitement message: {e}")
                             continue
@@ -334,6 +400,9 @@ class GameServer:
                     continue
                 except ConnectionResetError:
                     break
+                except FrameError as e:
+                    print(f"Flux invalide: {e}")
+                    break
                 except Exception as e:
                     print(f"Erreur réception: {e}")
                     break
@@ -342,131 +411,205 @@ class GameServer:
             print(f"Erreur client: {e}")
             traceback.print_exc()
         finally:
-            self.disconnect_client(client_socket)
+            self.disconnect_client(connection)
+    
+    def process_message(self, client_socket, message, size=0):
+        """Traite un message reçu par un thread réseau (size : octets reçus, pour les métriques)"""
+        self.metrics.messages.record('in', message.get('type'), size)
+        try:
+            if message.get('type') == 'ack':
+                # Pas de verrou : l'historique ne concerne que cette connexion
+                history = getattr(client_socket, 'snapshot_history', None)
+                if history is not None:
+                    history.acknowledge(int(message.get('tick', -1)))
+                return
+            
+            if self.command_queue is not None:
+                # Mode file de commandes : la boucle de jeu appliquera le message
+                self.command_queue.append((client_socket, message))
+                return
+            
+            with self.lock:
+                self.apply_message(client_socket, message)
+        except Exception as e:
+            print(f"Erreur traitement message {message}: {e}")
+            traceback.print_exc()
     
-    def process_message(self, client_socket, message):
+    def apply_message(self, client_socket, message):
+        """Applique un message d'un client (appelant : détient le verrou)"""
         try:
             msg_type = message.get('type')
             
             if msg_type == 'join':
-                with self.lock:
-                    player_name = message.get('name', 'Player')
-                    player_class = message.get('class', 'Warrior')
-                    player_id = f"player_{len(self.players)}"
-                    
-                    # Apply class stats
-                    if player_class in self.class_stats:
-                        stats = self.class_stats[player_class]
-                        player = Player(
-                            id=player_id, 
-                            name=player_name,
-                            player_class=player_class,
-                            hp=stats["hp"],
-                            max_hp=stats["hp"],
-                            attack=stats["attack"],
-                            defense=stats["defense"],
-                            speed=stats["speed"],
-                            mana=stats["mana"],
-                            max_mana=stats["mana"],
-                            critical_chance=stats["crit"]
-                        )
-                    else:
-                        player = Player(id=player_id, name=player_name)
-                    
-                    self.players[player_id] = player
-                    self.clients[client_socket] = player
-                    player.socket = client_socket  # Ajouter la référence socket
-                    
-                    # Initialiser les stats et l'inventaire
-                    self.calculate_player_stats(player)
-                    
-                    print(f"Joueur {player_name} ({player_class}) connecté avec l'ID {player_id}")
-                    
-                    # Send welcome message
-                    response = {
-                        'type': 'joined',
-                        'player_id': player_id,
-                        'player': self.player_to_dict(player)
-                    }
-                    self.send_to_client(client_socket, response)
+                player_name = message.get('name', 'Player')
+                player_class = message.get('class', 'Warrior')
+                player_id = f"player_{len(self.players)}"
+                
+                # Apply class stats
+                if player_class in self.class_stats:
+                    stats = self.class_stats[player_class]
+                    player = Player(
+                        id=player_id, 
+                        name=player_name,
+                        player_class=player_class,
+                        hp=stats["hp"],
+                        max_hp=stats["hp"],
+                        attack=stats["attack"],
+                        defense=stats["defense"],
+                        speed=stats["speed"],
+                        mana=stats["mana"],
+                        max_mana=stats["mana"],
+                        critical_chance=stats["crit"]
+                    )
+                else:
+                    player = Player(id=player_id, name=player_name)
+                
+                self.players[player_id] = player
+                self.clients[client_socket] = player
+                player.socket = client_socket  # Ajouter la référence socket
+                
+                # Snapshots binaires si le client les demande (format framed requis)
+                if (message.get('snapshot_format') == 'binary' and hasattr(client_socket, 'snapshot_format')
+                        and getattr(client_socket, 'wire_format', WIRE_JSON_LINES) == WIRE_FRAMED):
+                    client_socket.snapshot_format = 'binary'
+                
+                # Deltas par rapport au dernier tick acquitté si le client les demande
+                if message.get('delta') and hasattr(client_socket, 'snapshot_history'):
+                    client_socket.snapshot_history = SnapshotHistory(config.DELTA_MAX_BASELINE_AGE)
+                
+                # Initialiser les stats et l'inventaire
+                self.calculate_player_stats(player)
+                
+                print(f"Joueur {player_name} ({player_class}) connecté avec l'ID {player_id}")
+                
+                # Send welcome message
+                response = {
+                    'type': 'joined',
+                    'player_id': player_id,
+                    'player': self.player_to_dict(player),
+                    'manifest_version': self.manifest['version']
+                }
+                self.send_to_client(client_socket, response)
+                
+                # Manifeste avant tout snapshot, sauf si le client a déjà cette version
+                if message.get('manifest_version') != self.manifest['version']:
+                    self.send_to_client(client_socket, self.manifest)
                 
             elif msg_type == 'move':
-                with self.lock:
-                    player = self.clients.get(client_socket)
-                    if player and player.alive:
-                        new_x = max(15, min(3200 - 15, float(message.get('x', player.x))))
-                        new_y = max(15, min(2400 - 15, float(message.get('y', player.y))))
-                        player.x = new_x
-                        player.y = new_y
-                    
+                player = self.clients.get(client_socket)
+                if player and player.alive:
+                    new_x = max(15, min(3200 - 15, float(message.get('x', player.x))))
+                    new_y = max(15, min(2400 - 15, float(message.get('y', player.y))))
+                    player.x = new_x
+                    player.y = new_y
+                    self.players.relocate(player.id)
+                
             elif msg_type == 'attack_monster':
-                with self.lock:
-                    player = self.clients.get(client_socket)
-                    monster_id = message.get('monster_id')
-                    if player and player.alive and monster_id in self.monsters:
-                        monster = self.monsters[monster_id]
-                        if monster.alive:
-                            self.handle_combat(player, monster)
-                    
+                player = self.clients.get(client_socket)
+                monster_id = message.get('monster_id')
+                if player and player.alive and monster_id in self.monsters:
+                    monster = self.monsters[monster_id]
+                    if monster.alive:
+                        self.handle_combat(player, monster)
+                
             elif msg_type == 'upgrade_stat':
-                with self.lock:
-                    player = self.clients.get(client_socket)
-                    stat = message.get('stat')
-                    if player and player.skill_points > 0:
-                        self.upgrade_player_stat(player, stat)
-                        
+                player = self.clients.get(client_socket)
+                stat = message.get('stat')
+                if player and player.skill_points > 0:
+                    self.upgrade_player_stat(player, stat)
+                    
             elif msg_type == 'use_ability':
-                with self.lock:
-                    player = self.clients.get(client_socket)
-                    ability = message.get('ability')
-                    target_id = message.get('target_id')
-                    if player and player.alive:
-                        self.use_player_ability(player, ability, target_id)
-                        
+                player = self.clients.get(client_socket)
+                ability = message.get('ability')
+                target_id = message.get('target_id')
+                if player and player.alive:
+                    self.use_player_ability(player, ability, target_id)
+                    
             elif msg_type == 'pickup_item':
-                with self.lock:
-                    player = self.clients.get(client_socket)
-                    item_drop_id = message.get('item_drop_id')
-                    if player and item_drop_id in self.dropped_items:
-                        self.pickup_item(player, item_drop_id)
-                        
+                player = self.clients.get(client_socket)
+                item_drop_id = message.get('item_drop_id')
+                if player and item_drop_id is None:
+                    # Sans ID : l'objet le plus proche à portée de ramassage
+                    nearby = self.dropped_items.nearest(player.x, player.y, 1, player.dungeon_instance,
+                                                        max_radius=50)
+                    item_drop_id = nearby[0].drop_id if nearby else None
+                if player and item_drop_id in self.dropped_items:
+                    self.pickup_item(player, item_drop_id)
+                    
             elif msg_type == 'equip_item':
-                with self.lock:
-                    player = self.clients.get(client_socket)
-                    item_id = message.get('item_id')
-                    if player and item_id in player.inventory:
-                        self.equip_item(player, item_id)
-                        
+                player = self.clients.get(client_socket)
+                item_id = message.get('item_id')
+                if player and item_id in player.inventory:
+                    self.equip_item(player, item_id)
+                    
             elif msg_type == 'unequip_item':
-                with self.lock:
-                    player = self.clients.get(client_socket)
-                    slot = message.get('slot')
-                    if player and slot in player.equipped:
-                        self.unequip_item(player, slot)
-                        
+                player = self.clients.get(client_socket)
+                slot = message.get('slot')
+                if player and slot in player.equipped:
+                    self.unequip_item(player, slot)
+                    
             elif msg_type == 'use_item':
-                with self.lock:
-                    player = self.clients.get(client_socket)
-                    item_id = message.get('item_id')
-                    if player and item_id in player.inventory:
-                        self.use_item(player, item_id)
-                        
+                player = self.clients.get(client_socket)
+                item_id = message.get('item_id')
+                if player and item_id in player.inventory:
+                    self.use_item(player, item_id)
+                    
             elif msg_type == 'enter_dungeon':
-                with self.lock:
-                    player = self.clients.get(client_socket)
-                    dungeon_id = message.get('dungeon_id')
-                    if player and player.alive and dungeon_id in self.dungeons:
-                        self.enter_dungeon(player, dungeon_id)
-                        
+                player = self.clients.get(client_socket)
+                dungeon_id = message.get('dungeon_id')
+                if player and player.alive and dungeon_id in self.dungeons:
+                    self.enter_dungeon(player, dungeon_id)
+                    
             elif msg_type == 'leave_dungeon':
-                with self.lock:
-                    player = self.clients.get(client_socket)
-                    if player:
-                        self.leave_dungeon(player)
+                player = self.clients.get(client_socket)
+                if player:
+                    self.leave_dungeon(player)
         except Exception as e:
             print(f"Erreur traitement message {message}: {e}")
             traceback.print_exc()
     
+    def drain_commands(self):
+        """Applique les commandes en file, dans l'ordre d'arrivée (appelant : détient le verrou)"""
+        queue = self.command_queue
+        # Seulement ce qui est là au début du tick : la suite attend le tick suivant
+        commands = [queue.popleft() for _ in range(len(queue))]
+        if not commands:
+            return 0
+        
+        # Déplacements regroupés : seul le dernier compte tant que le client n'envoie rien d'autre
+        pending_moves = {}
+        for client_socket, message in commands:
+            if message is not None and message.get('type') == 'move':
+                if client_socket in pending_moves:
+                    self.command_stats['coalesced'] += 1
+                pending_moves[client_socket] = message
+                continue
+            
+            move = pending_moves.pop(client_socket, None)
+            if move is not None:
+                self.apply_message(client_socket, move)
+                self.command_stats['applied'] += 1
+            if message is None:
+                self.remove_client(client_socket)
+                self.command_stats['disconnects'] += 1
+            else:
+                self.apply_message(client_socket, message)
+                self.command_stats['applied'] += 1
+        
+        for client_socket, move in pending_moves.items():
+            self.apply_message(client_socket, move)
+            self.command_stats['applied'] += 1
+        
+        self.command_stats['max_batch'] = max(self.command_stats['max_batch'], len(commands))
+        return len(commands)
+    
+    def get_command_queue_stats(self):
+        """Commandes en attente, appliquées et regroupées (mode file de commandes)"""
+        stats = dict(self.command_stats)
+        stats['enabled'] = self.command_queue is not None
+        stats['depth'] = len(self.command_queue) if self.command_queue is not None else 0
+        return stats
+    
     def handle_combat(self, player: Player, monster: Monster):
         if not monster.alive or not player.alive:
             return
@@ -493,12 +636,12 @@ class GameServer:
             
             # Drop d'objet possible (meilleur pour les boss)
             if monster.is_boss:
-                monster_instance = getattr(monster, 'dungeon_instance', None)
+                monster_instance = monster.dungeon_instance or None
                 self.drop_boss_loot(monster.x, monster.y, monster_instance)
                 # Marquer le donjon comme terminé
                 self.complete_dungeon(monster.id)
             else:
-                monster_instance = getattr(monster, 'dungeon_instance', None)
+                monster_instance = monster.dungeon_instance or None
                 self.drop_item(monster.x, monster.y, monster_instance)
             
             # Check level up
@@ -508,63 +651,71 @@ class GameServer:
             
             # Respawn monster after 10 seconds (sauf pour les boss de donjon)
             if not monster.is_boss:
-                threading.Timer(10.0, self.respawn_monster, args=(monster.id,)).start()
+                self.timers.schedule(10.0, self.monster_respawn_due, monster.id)
         else:
             # Monster attacks back
-            damage_to_player = max(1, monster.attack - player.defense)
-            
-            # Boss abilities
-            if monster.is_boss and random.random() < 0.3:  # 30% chance d'utiliser une capacité
-                self.use_boss_ability(monster, player)
-                return  # La capacité remplace l'attaque normale
-            
-            player.hp -= damage_to_player
-            combat_log += f" | 🛡️ -{damage_to_player} HP"
-            
-            if player.hp <= 0:
-                player.alive = False
-                player.hp = 0
-                combat_log += " | K.O.!"
-                # Schedule respawn after 5 seconds
-                threading.Timer(5.0, self.respawn_player, args=(player,)).start()
+            strike_log = self.monster_strike(monster, player)
+            if strike_log is None:
+                return  # La capacité de boss remplace l'attaque normale
+            combat_log += f" | {strike_log}"
         
         # Broadcast combat result to same instance
-        player_instance = getattr(player, 'dungeon_instance', None)
+        player_instance = player.dungeon_instance
         self.broadcast_to_instance({
             'type': 'combat_result',
             'log': combat_log,
-            'player': self.player_to_dict(player),
+            'player': self.player_public_dict(player),
             'monster': self.monster_to_dict(monster)
         }, player_instance)
     
+    def monster_strike(self, monster: Monster, player: Player):
+        """Attaque d'un monstre sur un joueur ; None si une capacité de boss la remplace"""
+        # Boss abilities
+        if monster.is_boss and random.random() < 0.3:  # 30% chance d'utiliser une capacité
+            self.use_boss_ability(monster, player)
+            return None
+        
+        damage_to_player = max(1, monster.attack - player.defense)
+        player.hp -= damage_to_player
+        strike_log = f"🛡️ -{damage_to_player} HP"
+        
+        if player.hp <= 0:
+            player.alive = False
+            player.hp = 0
+            strike_log += " | K.O.!"
+            # Schedule respawn after 5 seconds
+            self.timers.schedule(5.0, self.respawn_player, player, owner=player.id)
+        return strike_log
+    
+    def monster_attack(self, monster: Monster, player: Player):
+        """Attaque lancée par l'IA d'un monstre engagé"""
+        strike_log = self.monster_strike(monster, player)
+        if strike_log is None:
+            return
+        self.broadcast_to_instance({
+            'type': 'combat_result',
+            'log': f"👹 {monster.id.split('_')[0]} | {strike_log}",
+            'player': self.player_public_dict(player),
+            'monster': self.monster_to_dict(monster)
+        }, player.dungeon_instance)
+    
     def level_up_player(self, player: Player):
         player.level += 1
         player.xp -= player.xp_to_next
         player.xp_to_next = int(player.xp_to_next * 1.5)
         player.skill_points += 3
-        player.max_hp += 10
+        self.calculate_player_stats(player)  # Croissance de niveau
         player.hp = player.max_hp  # Full heal on level up
     
     def upgrade_player_stat(self, player: Player, stat: str):
-        if player.skill_points <= 0:
+        if player.skill_points <= 0 or stat not in SKILL_UPGRADES:
             return
             
         player.skill_points -= 1
         
-        if stat == 'attack':
-            player.attack += 2
-        elif stat == 'defense':
-            player.defense += 2
-        elif stat == 'speed':
-            player.speed += 1
-        elif stat == 'hp':
-            player.max_hp += 15
-            player.hp += 15
-        elif stat == 'mana':
-            player.max_mana += 10
-            player.mana += 10
-        elif stat == 'critical':
-            player.critical_chance += 0.05  # +5% chance critique
+        # Couche permanente : survit aux recalculs d'équipement et de niveau
+        player.stats.upgrade(*SKILL_UPGRADES[stat])
+        self.calculate_player_stats(player)
     
     def use_player_ability(self, player: Player, ability: str, target_id: str = None):
         """Utilise une capacité spéciale selon la classe du joueur"""
@@ -580,11 +731,9 @@ class GameServer:
         if player.player_class == "Warrior" and ability == "charge":
             if player.mana >= 20:
                 player.mana -= 20
-                player.attack += 5  # Bonus temporaire d'attaque
+                self.effects.apply(player, EFFECTS['charge'], owner=player.id)  # +5 ATK pendant 10 s
                 ability_log = f"⚡ Charge (+5 ATK)"
                 ability_used = True
-                # Retirer le bonus après 10 secondes
-                threading.Timer(10.0, lambda: setattr(player, 'attack', player.attack - 5)).start()
                 
         elif player.player_class == "Mage" and ability == "fireball":
             if player.mana >= 30 and target_id in self.monsters:
@@ -602,17 +751,20 @@ class GameServer:
                         player.xp += monster.xp_reward
                         ability_log += f" | +{monster.xp_reward} XP"
                         # Drop d'objet possible
-                        monster_instance = getattr(monster, 'dungeon_instance', None)
+                        monster_instance = monster.dungeon_instance or None
                         self.drop_item(monster.x, monster.y, monster_instance)
-                        threading.Timer(10.0, self.respawn_monster, args=(target_id,)).start()
+                        self.timers.schedule(10.0, self.monster_respawn_due, target_id)
                         
         elif player.player_class == "Archer" and ability == "multishot":
             if player.mana >= 25:
                 player.mana -= 25
                 targets_hit = 0
                 total_damage = 0
-                for monster in self.monsters.values():
-                    if monster.alive and targets_hit < 3:  # Max 3 cibles
+                # Les 3 monstres vivants les plus proches, dans l'instance du joueur et à portée
+                targets = self.monsters.nearest(player.x, player.y, 3, player.dungeon_instance,
+                                                max_radius=300, predicate=lambda m: m.alive)
+                for monster in targets:
+                    if monster.alive:
                         damage = max(1, int(player.attack * 0.7))
                         monster.hp -= damage
                         total_damage += damage
@@ -622,9 +774,9 @@ class GameServer:
                             monster.alive = False
                             player.xp += monster.xp_reward
                             # Drop d'objet possible
-                            monster_instance = getattr(monster, 'dungeon_instance', None)
+                            monster_instance = monster.dungeon_instance or None
                             self.drop_item(monster.x, monster.y, monster_instance)
-                            threading.Timer(10.0, self.respawn_monster, args=(monster.id,)).start()
+                            self.timers.schedule(10.0, self.monster_respawn_due, monster.id)
                 
                 if targets_hit > 0:
                     ability_log = f"🏹 Tir Multiple x{targets_hit} ({total_damage} dmg)"
@@ -633,107 +785,96 @@ class GameServer:
         elif player.player_class == "Rogue" and ability == "stealth":
             if player.mana >= 15:
                 player.mana -= 15
-                player.critical_chance += 0.5  # Bonus critique temporaire
+                self.effects.apply(player, EFFECTS['stealth'], owner=player.id)  # +50% crit pendant 8 s
                 ability_log = f"👤 Furtivité (+50% crit)"
                 ability_used = True
-                # Retirer le bonus après 8 secondes
-                threading.Timer(8.0, lambda: setattr(player, 'critical_chance', player.critical_chance - 0.5)).start()
         
         if ability_used:
             player.last_ability_use = current_time
-            player_instance = getattr(player, 'dungeon_instance', None)
+            player_instance = player.dungeon_instance
             self.broadcast_to_instance({
                 'type': 'ability_used',
                 'log': ability_log,
-                'player': self.player_to_dict(player)
+                'player': self.player_public_dict(player)
             }, player_instance)
     
     def regenerate_mana(self):
         """Régénère la mana de tous les joueurs"""
-        with self.lock:
+        with self.loop_lock():
             for player in self.players.values():
                 if player.alive and player.mana < player.max_mana:
                     player.mana = min(player.max_mana, player.mana + 2)
     
+    def regenerate_monsters(self):
+        """Régénère les monstres blessés hors combat (en une passe sur les colonnes)"""
+        if not config.MONSTER_REGEN_ENABLED:
+            return []
+        with self.loop_lock():
+            table = self.monsters.table
+            rows = None
+            if config.DORMANT_ZONES_ENABLED:
+                # Zones observées seulement : les autres rattrapent à leur réveil
+                rows = table.rows_for(key for zone in self.zones.active for key in self.zone_monster_keys(zone))
+            return table.regenerate(config.MONSTER_REGEN_AMOUNT, config.MONSTER_REGEN_DELAY, rows=rows)
+    
+    def zone_monster_keys(self, zone):
+        """Clés des monstres d'une zone du monde ou d'une instance de donjon"""
+        rect = self.zones.rects.get(zone)
+        if rect is None:
+            return [key for key, _ in self.monsters.instance_items(zone)]
+        return [monster.store_key for monster in self.monsters.query_rect(*rect)]
+    
+    def wake_zone(self, zone, since, now=None):
+        """Rattrape d'un coup ce qu'une zone endormie depuis since aurait dû simuler"""
+        now = time.time() if now is None else now
+        respawned = self.zones.take_deferred(zone)
+        for monster_id in respawned:
+            self.respawn_monster(monster_id)
+        if not config.MONSTER_REGEN_ENABLED:
+            return respawned, []
+        rows = self.monsters.table.rows_for(self.zone_monster_keys(zone))
+        healed = self.monsters.table.catch_up_regeneration(rows, config.MONSTER_REGEN_AMOUNT, config.MONSTER_REGEN_DELAY,
+                                                           config.REGEN_INTERVAL, since, now)
+        return respawned, healed
+    
     def respawn_player(self, player: Player):
         """Respawn a dead player"""
         player.alive = True
         player.hp = player.max_hp // 2  # Respawn with half health
         player.x = random.randint(100, 700)
         player.y = random.randint(100, 500)
+        self.players.relocate(player.id)
+    
+    def monster_respawn_due(self, monster_id: str):
+        """Fin du délai de respawn : tout de suite si la zone est observée, sinon à son réveil"""
+        monster = self.monsters.get(monster_id)
+        if monster is None:
+            return
+        if config.DORMANT_ZONES_ENABLED:
+            zone = self.respawn_zone(monster)
+            if not self.zones.is_active(zone):
+                self.zones.defer(zone, monster_id)
+                return
+        self.respawn_monster(monster_id)
+    
+    def respawn_zone(self, monster: Monster):
+        """Zone où le monstre réapparaîtra : celle de sa règle d'apparition, pas celle de sa mort
+        (l'IA a pu le faire poursuivre un joueur hors de sa zone)"""
+        if monster.dungeon_instance:
+            return monster.dungeon_instance
+        if monster.spawn_slot >= 0:
+            zone = self.spawns.rules[monster.spawn_slot].zone
+            if zone:
+                return zone
+        return self.zones.zone_of(monster.home_x, monster.home_y)  # Monstres sans zone : leur point d'apparition
     
     def respawn_monster(self, monster_id: str):
         """Respawn un monstre en respectant son type et sa zone"""
-        # Vérifier si c'est un monstre de zone spécifique
-        if "_" in monster_id and not monster_id.startswith("monster_random"):
-            parts = monster_id.split("_")
-            monster_type = parts[0]
-            zone_name = parts[1] if len(parts) > 1 else "unknown"
-            
-            # Déterminer la zone de respawn
-            zone_width = 3200 // 3  # 1066
-            zone_height = 2400 // 3  # 800
-            
-            zone_coords = {
-                "plains": (0, 0),
-                "forest": (zone_width, 0),
-                "mountains": (zone_width*2, 0),
-                "desert": (0, zone_height),
-                "coast": (zone_width, zone_height),
-                "volcano": (zone_width*2, zone_height),
-                "ice": (0, zone_height*2),
-                "swamp": (zone_width, zone_height*2),
-                "crystal": (zone_width*2, zone_height*2)
-            }
-            
-            # Stats par type de monstre
-            monster_stats = {
-                "Slime": (20, 40, 8, 12, 2, 5, 15, 25),
-                "Loup": (35, 55, 10, 15, 3, 6, 20, 30),
-                "Orc": (50, 70, 12, 18, 5, 9, 25, 35),
-                "Momie": (45, 65, 11, 16, 4, 8, 22, 32),
-                "Pirate": (55, 75, 13, 19, 6, 10, 28, 38),
-                "Drake": (70, 90, 15, 22, 8, 12, 35, 50),
-                "Yeti": (40, 60, 10, 14, 4, 7, 20, 30),
-                "Troll": (60, 80, 14, 20, 7, 11, 30, 45),
-                "Golem": (80, 100, 16, 24, 10, 15, 40, 60)
-            }
-            
-            if zone_name in zone_coords and monster_type in monster_stats:
-                x_start, y_start = zone_coords[zone_name]
-                min_hp, max_hp, min_att, max_att, min_def, max_def, min_xp, max_xp = monster_stats[monster_type]
-                
-                x = random.randint(x_start + 50, min(x_start + zone_width - 50, 3150))
-                y = random.randint(y_start + 50, min(y_start + zone_height - 50, 2350))
-                
-                hp = random.randint(min_hp, max_hp)
-                attack = random.randint(min_att, max_att)
-                defense = random.randint(min_def, max_def)
-                xp_reward = random.randint(min_xp, max_xp)
-                
-                self.monsters[monster_id] = Monster(
-                    id=monster_id,
-                    x=x,
-                    y=y,
-                    hp=hp,
-                    max_hp=hp,
-                    attack=attack,
-                    defense=defense,
-                    xp_reward=xp_reward
-                )
-                return
-        
-        # Respawn générique pour les monstres aléatoires
-        self.monsters[monster_id] = Monster(
-            id=monster_id,
-            x=random.randint(100, 3100),
-            y=random.randint(100, 2300),
-            hp=random.randint(30, 60),
-            max_hp=random.randint(30, 60),
-            attack=random.randint(8, 15),
-            defense=random.randint(2, 8),
-            xp_reward=random.randint(15, 30)
-        )
+        # Les monstres de donjon ne réapparaissent pas, ni ceux déjà retirés avec leur instance
+        monster = self.monsters.get(monster_id)
+        if monster is None or monster.dungeon_instance or monster.spawn_slot < 0:
+            return
+        self.spawn_from_slot(monster_id, monster.spawn_slot)
     
     def drop_item(self, monster_x, monster_y, monster_instance=None):
         """Détermine si un objet doit être lâché et le crée"""
@@ -748,9 +889,10 @@ class GameServer:
                 item_id=item_id,
                 x=monster_x,
                 y=monster_y,
-                drop_time=time.time()
+                drop_time=time.time(),
+                dungeon_instance=monster_instance or ""
             )
-            self.dropped_items[drop_id] = drop
+            self.add_dropped_item(drop)
             
             # Notifier tous les clients du nouvel objet au sol
             drop_message = {
@@ -763,35 +905,26 @@ class GameServer:
             # Diffuser selon l'instance du monstre
             self.broadcast_to_instance(drop_message, monster_instance)
     
+    def add_dropped_item(self, drop: DroppedItem):
+        """Pose un objet au sol pour DROPPED_ITEM_LIFETIME secondes"""
+        self.dropped_items[drop.drop_id] = drop
+        self.drop_expiry.add(drop.drop_id, drop.drop_time + config.DROPPED_ITEM_LIFETIME)
+    
+    def remove_dropped_item(self, drop_id: str):
+        self.drop_expiry.discard(drop_id)
+        return self.dropped_items.pop(drop_id, None)
+    
+    def expire_dropped_items(self, now: float = None):
+        """Retire les objets au sol expirés (tranches de temps terminées seulement)"""
+        expired = self.drop_expiry.pop_expired(time.time() if now is None else now)
+        for drop_id in expired:
+            self.dropped_items.pop(drop_id, None)
+        self.expired_drops_total += len(expired)
+        return expired
+    
     def select_random_item(self):
         """Sélectionne un objet aléatoire selon la rareté"""
-        # Probabilités par rareté
-        rarity_weights = {
-            'common': 60,
-            'uncommon': 25,
-            'rare': 12,
-            'epic': 2,
-            'legendary': 1
-        }
-        
-        # Filtrer les objets par rareté
-        items_by_rarity = {}
-        for item_id, item in self.items.items():
-            rarity = item.rarity
-            if rarity not in items_by_rarity:
-                items_by_rarity[rarity] = []
-            items_by_rarity[rarity].append(item_id)
-        
-        # Choisir une rareté
-        rarity_choices = []
-        weights = []
-        for rarity, weight in rarity_weights.items():
-            if rarity in items_by_rarity:
-                rarity_choices.append(rarity)
-                weights.append(weight)
-        
-        chosen_rarity = random.choices(rarity_choices, weights=weights)[0]
-        return random.choice(items_by_rarity[chosen_rarity])
+        return self.loot.draw('monster')
     
     def pickup_item(self, player, drop_id):
         """Ramasse un objet au sol"""
@@ -804,6 +937,10 @@ class GameServer:
         if not item:
             return
             
+        # Un objet ne se ramasse que depuis son instance
+        if dropped_item.dungeon_instance != player.dungeon_instance:
+            return
+            
         # Vérifier la distance
         distance = ((player.x - dropped_item.x) ** 2 + (player.y - dropped_item.y) ** 2) ** 0.5
         if distance > 50:  # Portée de ramassage
@@ -816,7 +953,7 @@ class GameServer:
             if existing_stack.quantity < item.max_stack:
                 # Il y a de la place dans le stack existant
                 existing_stack.quantity += 1
-                del self.dropped_items[drop_id]
+                self.remove_dropped_item(drop_id)
                 
                 # Notifier le joueur
                 self.send_to_client(player.socket, {
@@ -828,7 +965,7 @@ class GameServer:
                 
                 # Notifier tous les clients que l'objet a été ramassé
                 # L'objet était au sol donc on diffuse selon l'instance du joueur qui le ramasse
-                player_instance = getattr(player, 'dungeon_instance', None)
+                player_instance = player.dungeon_instance
                 self.broadcast_to_instance({
                     'type': 'item_removed',
                     'drop_id': drop_id
@@ -841,7 +978,7 @@ class GameServer:
             
         # Ajouter à l'inventaire comme nouveau stack
         player.inventory[dropped_item.item_id] = ItemStack(item=item, quantity=1)
-        del self.dropped_items[drop_id]
+        self.remove_dropped_item(drop_id)
         
         # Notifier le joueur
         self.send_to_client(player.socket, {
@@ -853,7 +990,7 @@ class GameServer:
         
         # Notifier tous les clients que l'objet a été ramassé
         # L'objet était au sol donc on diffuse selon l'instance du joueur qui le ramasse
-        player_instance = getattr(player, 'dungeon_instance', None)
+        player_instance = player.dungeon_instance
         self.broadcast_to_instance({
             'type': 'item_removed',
             'drop_id': drop_id
@@ -892,7 +1029,7 @@ class GameServer:
             del player.inventory[item_id]
         
         # Recalculer les stats
-        self.calculate_player_stats(player)
+        self.equipment_changed(player)
         
         # Notifier le joueur
         self.send_to_client(player.socket, {
@@ -922,7 +1059,7 @@ class GameServer:
             player.inventory[item.id] = ItemStack(item=item, quantity=1)
         
         # Recalculer les stats
-        self.calculate_player_stats(player)
+        self.equipment_changed(player)
         
         # Notifier le joueur
         self.send_to_client(player.socket, {
@@ -982,58 +1119,23 @@ class GameServer:
             })
     
     def calculate_player_stats(self, player):
-        """Recalcule les stats du joueur en fonction de l'équipement"""
-        # Stats de base par classe
-        base_stats = {
-            'warrior': {'attack': 12, 'defense': 10, 'speed': 6, 'critical_chance': 0.05},
-            'mage': {'attack': 8, 'defense': 6, 'speed': 8, 'critical_chance': 0.15},
-            'archer': {'attack': 10, 'defense': 7, 'speed': 12, 'critical_chance': 0.20},
-            'rogue': {'attack': 9, 'defense': 5, 'speed': 14, 'critical_chance': 0.25}
-        }
-        
-        # Commencer avec les stats de base + niveau
-        base = base_stats.get(player.player_class.lower(), base_stats['warrior'])
-        
-        # Recalculer depuis la base (pas cumulatif)
-        player.attack = base['attack'] + (player.level - 1) * 2
-        player.defense = base['defense'] + (player.level - 1) * 2
-        player.speed = base['speed'] + (player.level - 1) * 1
-        player.critical_chance = base['critical_chance'] + (player.level - 1) * 0.01
-        
-        # Ajouter les bonus d'équipement
-        for item in player.equipped.values():
-            if hasattr(item, 'stats'):
-                for stat, value in item.stats.items():
-                    if hasattr(player, stat):
-                        current_value = getattr(player, stat)
-                        setattr(player, stat, current_value + value)
-        
-        # Recalculer HP et mana max basés sur attack et defense au lieu de strength/intelligence
-        old_max_hp = player.max_hp
-        old_max_mana = player.max_mana
-        
-        # Base HP/Mana par classe + bonus de niveau + bonus de stats
-        class_base_hp = {'warrior': 120, 'mage': 80, 'archer': 90, 'rogue': 85}
-        class_base_mana = {'warrior': 30, 'mage': 100, 'archer': 50, 'rogue': 40}
-        
-        base_hp = class_base_hp.get(player.player_class.lower(), 100)
-        base_mana = class_base_mana.get(player.player_class.lower(), 50)
-        
-        player.max_hp = base_hp + (player.level - 1) * 20 + player.attack * 2
-        player.max_mana = base_mana + (player.level - 1) * 10 + (player.level * 2)
-        
-        # Ajuster HP et mana actuels proportionnellement
-        if old_max_hp > 0:
-            hp_ratio = player.hp / old_max_hp
-            player.hp = int(player.max_hp * hp_ratio)
-        else:
-            player.hp = player.max_hp
-            
-        if old_max_mana > 0:
-            mana_ratio = player.mana / old_max_mana
-            player.mana = int(player.max_mana * mana_ratio)
+        """Met à jour les stats dérivées du joueur (recalcul seulement si une couche a changé)"""
+        player.stats.apply(player)
+    
+    def equipment_changed(self, player):
+        """Reconstruit la couche d'équipement puis les stats dérivées"""
+        player.stats.set_equipment(player.equipped.values())
+        self.calculate_player_stats(player)
+    
+    def effects_changed(self, entity):
+        """Recalcule les stats d'une entité dont les effets d'état ont changé"""
+        if entity.effects is None:
+            return
+        if isinstance(entity, Player):
+            entity.stats.set_timed(entity.effects.modifiers())
+            self.calculate_player_stats(entity)
         else:
-            player.mana = player.max_mana
+            entity.effects.apply_to(entity)
     
     def enter_dungeon(self, player: Player, dungeon_id: str):
         """Fait entrer un joueur dans un donjon"""
@@ -1081,6 +1183,7 @@ class GameServer:
         
         # Marquer le joueur comme étant dans un donjon
         player.dungeon_instance = available_instance.instance_id
+        self.players.relocate(player.id)
         
         # Notifier le joueur
         self.send_to_client(player.socket, {
@@ -1097,7 +1200,7 @@ class GameServer:
     
     def leave_dungeon(self, player: Player):
         """Fait sortir un joueur du donjon"""
-        if not hasattr(player, 'dungeon_instance') or not player.dungeon_instance:
+        if not player.dungeon_instance:
             return
             
         instance = self.dungeon_instances.get(player.dungeon_instance)
@@ -1112,25 +1215,11 @@ class GameServer:
         player.x = 1600  # Centre du monde
         player.y = 1200
         player.dungeon_instance = ""
+        self.players.relocate(player.id)
         
         # Si plus de joueurs, nettoyer l'instance
         if len(instance.players) == 0:
-            # Supprimer tous les monstres de cette instance des monstres globaux
-            monsters_to_remove = []
-            for monster_id, monster in self.monsters.items():
-                # Supprimer par attribut dungeon_instance
-                if hasattr(monster, 'dungeon_instance') and monster.dungeon_instance == instance.instance_id:
-                    monsters_to_remove.append(monster_id)
-                # Sécurité supplémentaire : supprimer par nom d'instance dans l'ID
-                elif monster_id.startswith(instance.instance_id):
-                    monsters_to_remove.append(monster_id)
-            
-            for monster_id in monsters_to_remove:
-                del self.monsters[monster_id]
-                print(f"Monstre de donjon supprimé: {monster_id}")  # Debug
-            
-            del self.dungeon_instances[instance.instance_id]
-            print(f"Instance de donjon supprimée: {instance.instance_id}")  # Debug
+            self.remove_dungeon_instance(instance.instance_id)
             
         self.send_to_client(player.socket, {
             'type': 'dungeon_left'
@@ -1161,9 +1250,7 @@ class GameServer:
                 xp_reward=base_xp
             )
             
-            # Marquer le monstre comme appartenant à cette instance de donjon
-            monster.dungeon_instance = instance.instance_id
-            
+            # Le registre de l'instance rattache le monstre à ce donjon
             instance.monsters[monster_id] = monster
             # Ajouter aussi aux monstres globaux pour le combat
             self.monsters[monster_id] = monster
@@ -1240,11 +1327,9 @@ class GameServer:
         ability_log = ""
         
         if ability == "rage":
-            # Augmente l'attaque du boss
-            boss.attack = int(boss.attack * 1.5)
+            # Augmente l'attaque du boss pendant 10 secondes
+            self.effects.apply(boss, EFFECTS['rage'], owner=boss.id)
             ability_log = f"🔥 {boss.id.split('_')[0]} entre en rage! (+50% ATK)"
-            # Retirer le bonus après 10 secondes
-            threading.Timer(10.0, lambda: setattr(boss, 'attack', int(boss.attack / 1.5))).start()
             
         elif ability == "summon_minions":
             # Spawn 2 petits monstres
@@ -1260,8 +1345,12 @@ class GameServer:
                     defense=2,
                     xp_reward=10
                 )
-                # Marquer le serviteur comme appartenant à la même instance que le boss
-                minion.dungeon_instance = getattr(boss, 'dungeon_instance', None)
+                # Le serviteur appartient à la même instance que le boss
+                instance = self.dungeon_instances.get(boss.dungeon_instance)
+                if instance is not None:
+                    instance.monsters[minion_id] = minion
+                else:
+                    minion.dungeon_instance = boss.dungeon_instance
                 self.monsters[minion_id] = minion
             ability_log = f"👹 {boss.id.split('_')[0]} invoque des serviteurs!"
             
@@ -1272,21 +1361,19 @@ class GameServer:
             ability_log = f"⚫ Frappe d'Ombre! -{damage} HP (ignore défense)"
             
         elif ability == "invisibility":
-            # Réduit les dégâts reçus temporairement
-            boss.defense = int(boss.defense * 2)
+            # Réduit les dégâts reçus pendant 8 secondes
+            self.effects.apply(boss, EFFECTS['invisibility'], owner=boss.id)
             ability_log = f"👻 {boss.id.split('_')[0]} devient invisible! (+100% DEF)"
-            threading.Timer(8.0, lambda: setattr(boss, 'defense', int(boss.defense / 2))).start()
             
         elif ability == "fire_breath":
             # Attaque en zone (tous les joueurs dans le donjon)
             damage = int(boss.attack * 0.8)
             ability_log = f"🔥 Souffle de Dragon! -{damage} HP à tous!"
-            # Trouver tous les joueurs dans le même donjon
-            for player_id, player in self.players.items():
-                if hasattr(player, 'dungeon_instance') and player.dungeon_instance:
-                    instance = self.dungeon_instances.get(player.dungeon_instance)
-                    if instance and boss.id in instance.monsters:
-                        player.hp -= damage
+            # Tous les joueurs de l'instance du boss
+            boss_instance = boss.dungeon_instance or None
+            if boss_instance:
+                for _, player in self.players.instance_items(boss_instance):
+                    player.hp -= damage
                         
         elif ability == "wing_attack":
             # Repousse et étourdit
@@ -1294,6 +1381,7 @@ class GameServer:
             # Téléporter le joueur un peu plus loin
             target_player.x += random.randint(-100, 100)
             target_player.y += random.randint(-100, 100)
+            self.players.relocate(target_player.id)
             
         elif ability == "heal":
             # Le boss se soigne
@@ -1302,12 +1390,12 @@ class GameServer:
             ability_log = f"✨ {boss.id.split('_')[0]} se soigne! +{heal_amount} HP"
         
         # Broadcast l'utilisation de la capacité aux joueurs de la même instance
-        boss_instance = getattr(boss, 'dungeon_instance', None)
+        boss_instance = boss.dungeon_instance or None
         self.broadcast_to_instance({
             'type': 'boss_ability',
             'log': ability_log,
             'boss': self.monster_to_dict(boss),
-            'player': self.player_to_dict(target_player)
+            'player': self.player_public_dict(target_player)
         })
     
     def drop_boss_loot(self, boss_x, boss_y, boss_instance=None):
@@ -1315,9 +1403,8 @@ class GameServer:
         # 80% de chance de drop pour les boss
         if random.random() < 0.8:
             # Sélectionner un objet légendaire
-            legendary_items = [item_id for item_id, item in self.items.items() if item.rarity == "legendary"]
-            if legendary_items:
-                item_id = random.choice(legendary_items)
+            item_id = self.loot.draw('boss')
+            if item_id:
                 drop_id = f"drop_{self.item_counter}"
                 self.item_counter += 1
                 
@@ -1326,9 +1413,10 @@ class GameServer:
                     item_id=item_id,
                     x=boss_x,
                     y=boss_y,
-                    drop_time=time.time()
+                    drop_time=time.time(),
+                    dungeon_instance=boss_instance or ""
                 )
-                self.dropped_items[drop_id] = drop
+                self.add_dropped_item(drop)
                 
                 # Notifier tous les clients de la même instance
                 self.broadcast_to_instance({
@@ -1367,7 +1455,7 @@ class GameServer:
                             self.level_up_player(player)
                 
                 # Programmer la suppression de l'instance après 2 minutes
-                threading.Timer(120.0, self.cleanup_dungeon_instance, args=(instance.instance_id,)).start()
+                self.timers.schedule(120.0, self.cleanup_dungeon_instance, instance.instance_id)
                 break
     
     def cleanup_dungeon_instance(self, instance_id: str):
@@ -1382,70 +1470,218 @@ class GameServer:
             if player:
                 self.leave_dungeon(player)
                 
-        # Supprimer tous les monstres de l'instance
-        for monster_id in list(instance.monsters.keys()):
-            if monster_id in self.monsters:
-                del self.monsters[monster_id]
-                
-        # Supprimer l'instance
-        if instance_id in self.dungeon_instances:
-            del self.dungeon_instances[instance_id]
+        # Supprimer l'instance et ses monstres (si le départ des joueurs ne l'a pas déjà fait)
+        self.remove_dungeon_instance(instance_id)
+    
+    def remove_dungeon_instance(self, instance_id: str):
+        """Supprime une instance : ses monstres partent avec son registre, sans parcourir le monde"""
+        instance = self.dungeon_instances.pop(instance_id, None)
+        if instance is not None:
+            for monster_id, monster in instance.monsters.items():
+                self.effects.clear(monster)
+                self.monsters.pop(monster_id, None)
+            instance.monsters.clear()
+        self.zones.forget(instance_id)
+        # Entités encore indexées dans l'instance (ajoutées sans passer par le registre)
+        removed = self.monsters.drop_instance(instance_id)
+        # Objets au sol du donjon
+        for drop_id in self.dropped_items.drop_instance(instance_id):
+            self.drop_expiry.discard(drop_id)
+        if instance is not None:
+            print(f"Instance de donjon supprimée: {instance_id}")
+        return removed
     
     def cleanup_orphaned_dungeon_monsters(self):
-        """Nettoie tous les monstres de donjon orphelins"""
-        monsters_to_remove = []
-        
-        for monster_id, monster in self.monsters.items():
-            # Supprimer tous les monstres qui ont un ID de donjon
-            if monster_id.startswith("dungeon_instance_"):
-                # Vérifier si l'instance existe encore
-                parts = monster_id.split("_")
-                if len(parts) >= 3:
-                    potential_instance_id = "_".join(parts[:3])  # "dungeon_instance_X"
-                    if potential_instance_id not in self.dungeon_instances:
-                        monsters_to_remove.append(monster_id)
-                        print(f"Monstre orphelin trouvé: {monster_id}")
-        
-        # Supprimer les monstres orphelins
-        for monster_id in monsters_to_remove:
-            del self.monsters[monster_id]
-            print(f"Monstre orphelin supprimé: {monster_id}")
-        
-        if monsters_to_remove:
-            print(f"Nettoyage terminé: {len(monsters_to_remove)} monstres orphelins supprimés")
+        """Supprime les monstres indexés dans une instance qui n'existe plus.
+        
+        Filet de sécurité lancé par la boucle toutes les ORPHAN_SWEEP_INTERVAL secondes :
+        remove_dungeon_instance vide déjà le registre de l'instance, mais un monstre ajouté
+        à self.monsters sans passer par le registre y survivrait. Ne parcourt que les instances."""
+        removed = []
+        for instance_id in self.monsters.instance_ids():
+            if instance_id and instance_id not in self.dungeon_instances:
+                removed.extend(self.monsters.drop_instance(instance_id))
+        
+        if removed:
+            print(f"Nettoyage terminé: {len(removed)} monstres orphelins supprimés")
+        return removed
     
     def game_loop(self):
         """Main game loop - sends game state to all clients"""
-        last_mana_regen = time.time()
-        last_cleanup = time.time()
-        
         while self.running:
             try:
-                current_time = time.time()
-                
-                # Regenerate mana every 2 seconds
-                if current_time - last_mana_regen >= 2.0:
-                    self.regenerate_mana()
-                    last_mana_regen = current_time
-                
-                # Nettoyage préventif des monstres orphelins toutes les 30 secondes
-                if current_time - last_cleanup >= 30.0:
-                    self.cleanup_orphaned_dungeon_monsters()
-                    last_cleanup = current_time
-                
-                with self.lock:
-                    # Envoyer des game_state spécifiques selon l'instance de chaque joueur
-                    self.send_instance_specific_game_states()
-                    
-                time.sleep(1/30)  # 30 FPS
+                # Pas de temps fixe : plusieurs ticks d'affilée si la boucle a pris du retard
+                for _ in range(self.timestep.wait()):
+                    started = time.perf_counter()
+                    self.run_tick()
+                    self.timestep.record(time.perf_counter() - started)
             except Exception as e:
                 print(f"Erreur game loop: {e}")
                 time.sleep(0.1)
     
+    def run_tick(self):
+        """Travail d'un tick de la boucle de jeu, phase par phase dans le profileur"""
+        rate = config.GAME_UPDATE_RATE
+        phase = self.profiler.phase
+        self.profiler.begin_tick()
+        try:
+            # Commandes des clients, zones réveillées, minuteries échues (respawns, fins d'effets),
+            # objets au sol expirés, IA des monstres
+            with self.loop_lock():
+                if self.command_queue is not None:
+                    with phase('commands'):
+                        self.drain_commands()
+                if config.DORMANT_ZONES_ENABLED:
+                    with phase('zones'):
+                        for zone, since in self.zones.update(self.players.values()):
+                            self.wake_zone(zone, since)
+                with phase('timers'):
+                    self.timers.advance()
+                with phase('dropped_items'):
+                    self.expire_dropped_items()
+                if config.MONSTER_AI_ENABLED:
+                    with phase('ai'):
+                        self.ai.tick(self.timers.tick / rate)
+                if self.tick % (config.ORPHAN_SWEEP_INTERVAL * rate) == 0:
+                    self.cleanup_orphaned_dungeon_monsters()
+                if self.tick % rate == 0:
+                    self.publish_metrics()
+            
+            # Regenerate mana every 2 seconds
+            if self.tick % (config.REGEN_INTERVAL * rate) == 0:
+                with phase('regen'):
+                    self.regenerate_mana()
+                    self.regenerate_monsters()
+            
+            # Envoyer des game_state spécifiques selon l'instance de chaque joueur
+            self.send_instance_specific_game_states()
+        finally:
+            self.metrics.tick_seconds.observe(self.profiler.end_tick())
+    
+    @contextmanager
+    def loop_lock(self):
+        """Verrou du serveur pris par la boucle de jeu ; l'attente est comptée par le profileur"""
+        started = time.perf_counter()
+        with self.lock:
+            self.profiler.add('lock_wait', time.perf_counter() - started)
+            yield
+    
+    def get_profile_stats(self):
+        """Percentiles par phase des derniers ticks, attente du verrou, octets envoyés par tick"""
+        return self.profiler.stats()
+    
+    def publish_metrics(self):
+        """Relève les jauges exportées (appelé par la boucle de jeu, verrou déjà pris)"""
+        instances = {}
+        for key, grid in (('players', self.players), ('monsters', self.monsters), ('dropped_items', self.dropped_items)):
+            instances[key] = {instance or 'world': len(members) for instance, members in grid.instances.items()}
+        # Files d'envoi agrégées : un label par joueur ferait une série par connexion
+        depths = [len(client_socket.queue) for client_socket in self.clients
+                  if isinstance(getattr(client_socket, 'queue', None), OutboundQueue)]
+        self.metrics.publish({
+            'clients': len(self.clients),
+            **instances,
+            'send_queue_max': max(depths, default=0),
+            'send_queue_total': sum(depths),
+            'pending_timers': len(self.timers)
+        })
+    
+    def dump_profile(self, path=None):
+        """Écrit les stats du profileur dans un fichier JSON (à l'arrêt si profile_dump_path est défini)"""
+        path = path or self.profile_dump_path
+        if path:
+            self.profiler.dump(path)
+            print(f"Profil des ticks écrit dans {path}")
+        return path
+    
+    def get_tick_stats(self):
+        """Temps de travail des ticks par rapport au budget, retards et ticks sautés"""
+        stats = self.timestep.stats()
+        stats['tick'] = self.tick
+        return stats
+    
+    def get_timer_stats(self):
+        """Minuteries en attente, exécutées et annulées"""
+        return self.timers.stats()
+    
     def send_instance_specific_game_states(self):
         """Envoie des game states spécifiques selon l'instance de chaque joueur"""
+        # Construction sous le verrou, mise en file d'envoi hors du verrou
+        with self.loop_lock(), self.profiler.phase('snapshot_build'):
+            self.tick += 1
+            batches = self.build_instance_game_states()
+            private_updates = self.collect_private_updates()
+        dispatch_started = self.profiler.clock()
+        nested_before = self.profiler.counted()
+        
+        # Chaque message est encodé une seule fois par format, les mêmes octets partent à tous
+        encoded = {}
+        stats = self.new_encode_stats()
+        stats['tick'] = self.tick
+        
+        # Vue privée avant le snapshot, pour que le client l'ait dès le premier état
+        for client_socket, update in private_updates:
+            self.send_to_client(client_socket, update)
+        
+        snapshots = []  # [(game_state, [sockets])]
+        for instance_id, game_state, recipients in batches:
+            if instance_id == 'world' and self.interest is not None:
+                # Une vue par cellule de joueur + événements d'entrée/sortie
+                views, events = self.interest.split(game_state, recipients)
+                for client_socket, event in events:
+                    self.send_to_client(client_socket, event, encoded, stats)
+                snapshots.extend(views)
+            else:
+                snapshots.append((game_state, [client_socket for _, client_socket in recipients]))
+        
+        deltas = {}  # (snapshot, base) -> delta partagé par les clients de même base
+        for game_state, client_sockets in snapshots:
+            for client_socket in client_sockets:
+                history = getattr(client_socket, 'snapshot_history', None)
+                if history is None:
+                    self.send_snapshot_to_client(client_socket, game_state, encoded, stats)
+                    continue
+                
+                baseline = history.baseline(self.tick)
+                if baseline is None:
+                    # Pas de base récente acquittée : keyframe complète
+                    self.send_snapshot_to_client(client_socket, game_state, encoded, stats)
+                    history.keyframes_sent += 1
+                else:
+                    baseline_tick, baseline_state = baseline
+                    key = (id(game_state), baseline_tick, id(baseline_state))
+                    if key not in deltas:
+                        deltas[key] = make_delta(baseline_tick, baseline_state, game_state)
+                    self.send_snapshot_to_client(client_socket, deltas[key], encoded, stats)
+                    history.deltas_sent += 1
+                history.record(self.tick, game_state)
+        
+        self.profiler.exclusive('dispatch', dispatch_started, nested_before)  # Hors encode et send
+        self.encode_stats = stats
+        for key in ('encodes', 'reused', 'bytes_encoded', 'bytes_saved'):
+            self.encode_totals[key] += stats[key]
+        self.encode_totals['tick'] = self.tick
+    
+    @staticmethod
+    def new_encode_stats():
+        return {'tick': 0, 'encodes': 0, 'reused': 0, 'bytes_encoded': 0, 'bytes_saved': 0}
+    
+    def collect_private_updates(self):
+        """Vues privées qui ont changé depuis le dernier envoi, retourne [(socket, message)]"""
+        updates = []
+        for player in self.players.values():
+            if not player.socket:
+                continue
+            private = self.player_private_dict(player)
+            if self.private_views.get(player.id) != private:
+                self.private_views[player.id] = private
+                updates.append((player.socket, {'type': 'player_private', 'player_id': player.id, 'private': private}))
+        return updates
+    
+    def build_instance_game_states(self):
+        """Construit les game states par instance, retourne [(instance_id, game_state, [(player_id, socket)])]"""
         if not self.clients:
-            return
+            return []
         
         # Grouper les joueurs par instance
         players_by_instance = {
@@ -1458,7 +1694,7 @@ class GameServer:
         
         # Répartir les joueurs par instance
         for player in self.players.values():
-            if hasattr(player, 'dungeon_instance') and player.dungeon_instance:
+            if player.dungeon_instance:
                 # Joueur dans un donjon
                 if player.dungeon_instance in players_by_instance:
                     players_by_instance[player.dungeon_instance].append(player)
@@ -1466,67 +1702,55 @@ class GameServer:
                 # Joueur dans le monde principal
                 players_by_instance['world'].append(player)
         
-        # Envoyer le game state du monde principal
+        batches = []
+        
+        # Game state du monde principal
         if players_by_instance['world']:
             world_game_state = self.create_world_game_state()
-            for player in players_by_instance['world']:
-                if player.socket:
-                    self.send_to_client(player.socket, world_game_state)
+            batches.append(('world', world_game_state,
+                            [(p.id, p.socket) for p in players_by_instance['world'] if p.socket]))
         
-        # Envoyer les game states des donjons
+        # Game states des donjons
         for instance_id, players_in_instance in players_by_instance.items():
             if instance_id != 'world' and players_in_instance:
                 dungeon_game_state = self.create_dungeon_game_state(instance_id)
-                for player in players_in_instance:
-                    if player.socket:
-                        self.send_to_client(player.socket, dungeon_game_state)
+                batches.append((instance_id, dungeon_game_state,
+                                [(p.id, p.socket) for p in players_in_instance if p.socket]))
+        
+        return batches
     
     def create_world_game_state(self):
         """Crée le game state pour le monde principal"""
         # Joueurs dans le monde principal seulement
         world_players = {}
-        for player in self.players.values():
-            if not hasattr(player, 'dungeon_instance') or not player.dungeon_instance:
-                world_players[player.id] = self.player_to_dict(player)
+        for player_id, player in self.players.instance_items(''):
+            world_players[player_id] = self.player_public_dict(player)
         
         # Monstres du monde principal seulement (exclure les monstres de donjons)
         world_monsters = {}
-        for monster_id, monster in self.monsters.items():
-            # Exclure les monstres qui appartiennent à une instance de donjon
-            # Utiliser la même logique que le nettoyage : vérifier l'attribut dungeon_instance
-            is_dungeon_monster = False
-            
-            # Vérification par attribut dungeon_instance
-            if hasattr(monster, 'dungeon_instance') and monster.dungeon_instance:
-                is_dungeon_monster = True
-            
-            # Sécurité supplémentaire : vérification par nom d'ID
-            if monster_id.startswith("dungeon_instance_"):
-                is_dungeon_monster = True
-            
-            if not is_dungeon_monster:
-                world_monsters[monster_id] = self.monster_to_dict(monster)
+        for monster_id, monster in self.monsters.instance_items(''):
+            world_monsters[monster_id] = self.monster_to_dict(monster)
         
         return {
             'type': 'game_state',
+            'tick': self.tick,
             'players': world_players,
             'monsters': world_monsters,
-            'dropped_items': {did: self.dropped_item_to_dict(d) for did, d in self.dropped_items.items()},
-            'dungeons': {did: self.dungeon_to_dict(d) for did, d in self.dungeons.items()}
+            'dropped_items': {did: self.dropped_item_to_dict(d) for did, d in self.dropped_items.instance_items('')}
         }
     
     def create_dungeon_game_state(self, instance_id: str):
         """Crée le game state pour une instance de donjon spécifique"""
         instance = self.dungeon_instances.get(instance_id)
         if not instance:
-            return {'type': 'game_state', 'players': {}, 'monsters': {}, 'dropped_items': {}}
+            return {'type': 'game_state', 'tick': self.tick, 'players': {}, 'monsters': {}, 'dropped_items': {}}
         
         # Joueurs dans cette instance de donjon seulement
         dungeon_players = {}
         for player_id in instance.players:
             if player_id in self.players:
                 player = self.players[player_id]
-                dungeon_players[player_id] = self.player_to_dict(player)
+                dungeon_players[player_id] = self.player_public_dict(player)
         
         # Monstres de cette instance de donjon seulement
         dungeon_monsters = {}
@@ -1534,19 +1758,23 @@ class GameServer:
             if monster_id in self.monsters:  # Vérifier que le monstre existe encore
                 dungeon_monsters[monster_id] = self.monster_to_dict(monster)
         
-        # Objets droppés dans le donjon (filtrer par position si nécessaire)
-        # Pour l'instant, on peut inclure tous les objets droppés
-        # TODO: Filtrer par zone de donjon si nécessaire
-        
         return {
             'type': 'game_state',
+            'tick': self.tick,
             'players': dungeon_players,
             'monsters': dungeon_monsters,
-            'dropped_items': {did: self.dropped_item_to_dict(d) for did, d in self.dropped_items.items()},
-            'dungeons': {}  # Pas besoin d'afficher les portails dans les donjons
+            'dropped_items': {did: self.dropped_item_to_dict(d) for did, d in self.dropped_items.instance_items(instance_id)},
+            'dungeons': {}  # Portails : dans le manifeste, et pas affichés dans les donjons
         }
     
     def player_to_dict(self, player: Player):
+        """Vue complète du joueur (pour lui seul)"""
+        player_dict = self.player_public_dict(player)
+        player_dict.update(self.player_private_dict(player))
+        return player_dict
+    
+    def player_public_dict(self, player: Player):
+        """Ce que les autres joueurs voient (snapshots et broadcasts)"""
         return {
             'id': player.id,
             'name': player.name,
@@ -1555,19 +1783,24 @@ class GameServer:
             'hp': player.hp,
             'max_hp': player.max_hp,
             'level': player.level,
+            'alive': player.alive,
+            'player_class': player.player_class,
+            'mana': player.mana,
+            'max_mana': player.max_mana,
+            'dungeon_instance': player.dungeon_instance
+        }
+    
+    def player_private_dict(self, player: Player):
+        """Progression, stats et inventaire : envoyés au propriétaire seulement"""
+        return {
             'xp': player.xp,
             'xp_to_next': player.xp_to_next,
             'attack': player.attack,
             'defense': player.defense,
             'speed': player.speed,
             'skill_points': player.skill_points,
-            'alive': player.alive,
-            'player_class': player.player_class,
-            'mana': player.mana,
-            'max_mana': player.max_mana,
             'critical_chance': player.critical_chance,
             'gold': player.gold,
-            'dungeon_instance': getattr(player, 'dungeon_instance', ''),
             'inventory': {item_id: {
                 'name': item_stack.item.name, 
                 'type': item_stack.item.item_type, 
@@ -1593,12 +1826,9 @@ class GameServer:
         }
     
     def dropped_item_to_dict(self, dropped_item: DroppedItem):
-        item = self.items.get(dropped_item.item_id)
         return {
             'drop_id': dropped_item.drop_id,
-            'item_id': dropped_item.item_id,
-            'item_name': item.name if item else 'Unknown Item',
-            'item_rarity': item.rarity if item else 'common',
+            'item': self.item_index.get(dropped_item.item_id),  # Index dans manifest['items']
             'x': dropped_item.x,
             'y': dropped_item.y,
             'drop_time': dropped_item.drop_time
@@ -1619,12 +1849,17 @@ class GameServer:
         if not self.clients:
             return
             
-        message_str = json.dumps(message) + '\n'
+        encoded = {}  # Un encodage par format de connexion
         disconnected_clients = []
         
         for client_socket in list(self.clients.keys()):
             try:
-                client_socket.send(message_str.encode('utf-8'))
+                wire_format = getattr(client_socket, 'wire_format', WIRE_JSON_LINES)
+                if wire_format not in encoded:
+                    encoded[wire_format] = encode_message(message, wire_format)
+                client_socket.send(encoded[wire_format])
+                self.profiler.add_bytes(len(encoded[wire_format]))
+                self.metrics.messages.record('out', message.get('type'), len(encoded[wire_format]))
             except (ConnectionResetError, BrokenPipeError, OSError):
                 disconnected_clients.append(client_socket)
             except Exception as e:
@@ -1640,22 +1875,27 @@ class GameServer:
         if not self.clients:
             return
             
-        # Si instance_id est None, envoyer au monde principal
-        if instance_id is None:
+        # Si instance_id est vide (None ou ""), envoyer au monde principal
+        if not instance_id:
             target_players = [p for p in self.players.values() 
-                            if not hasattr(p, 'dungeon_instance') or not p.dungeon_instance]
+                            if not p.dungeon_instance]
         else:
             # Envoyer aux joueurs de l'instance spécifique
             target_players = [p for p in self.players.values() 
-                            if hasattr(p, 'dungeon_instance') and p.dungeon_instance == instance_id]
+                            if p.dungeon_instance == instance_id]
         
-        message_str = json.dumps(message) + '\n'
+        encoded = {}  # Un encodage par format de connexion
         disconnected_clients = []
         
         for player in target_players:
             if player.socket:
                 try:
-                    player.socket.send(message_str.encode('utf-8'))
+                    wire_format = getattr(player.socket, 'wire_format', WIRE_JSON_LINES)
+                    if wire_format not in encoded:
+                        encoded[wire_format] = encode_message(message, wire_format)
+                    player.socket.send(encoded[wire_format])
+                    self.profiler.add_bytes(len(encoded[wire_format]))
+                    self.metrics.messages.record('out', message.get('type'), len(encoded[wire_format]))
                 except (ConnectionResetError, BrokenPipeError, OSError):
                     disconnected_clients.append(player.socket)
                 except Exception as e:
@@ -1666,30 +1906,95 @@ class GameServer:
         for client in disconnected_clients:
             self.disconnect_client(client)
     
-    def send_to_client(self, client_socket, message):
+    def encode_for_client(self, client_socket, message, encoded=None, stats=None):
+        """Octets du message au format du client ; encoded garde les encodages déjà faits"""
+        if message.get('type') == 'game_state' and getattr(client_socket, 'snapshot_format', 'json') == 'binary':
+            encoding = 'binary'
+        else:
+            encoding = getattr(client_socket, 'wire_format', WIRE_JSON_LINES)
+        key = (id(message), encoding)
+        if encoded is not None and key in encoded:
+            message_bytes = encoded[key]
+            if stats is not None:
+                stats['reused'] += 1
+                stats['bytes_saved'] += len(message_bytes)
+            return message_bytes
+        
+        started = time.perf_counter()
+        if encoding == 'binary':
+            message_bytes = encode_frame(encode_snapshot(message), FRAME_SNAPSHOT)
+        else:
+            message_bytes = encode_message(message, encoding)
+        self.profiler.add('encode', time.perf_counter() - started)
+        if encoded is not None:
+            encoded[key] = message_bytes  # Le message doit rester en vie tant que encoded sert
+        if stats is not None:
+            stats['encodes'] += 1
+            stats['bytes_encoded'] += len(message_bytes)
+        return message_bytes
+    
+    def send_to_client(self, client_socket, message, encoded=None, stats=None):
         """Send message to specific client"""
         try:
-            message_str = json.dumps(message) + '\n'
-            client_socket.send(message_str.encode('utf-8'))
+            message_bytes = self.encode_for_client(client_socket, message, encoded, stats)
+            started = time.perf_counter()
+            client_socket.send(message_bytes)
+            self.profiler.add('send', time.perf_counter() - started)
+            self.profiler.add_bytes(len(message_bytes))
+            self.metrics.messages.record('out', message.get('type'), len(message_bytes))
         except (ConnectionResetError, BrokenPipeError, OSError):
             self.disconnect_client(client_socket)
         except Exception as e:
             print(f"Erreur envoi client: {e}")
             self.disconnect_client(client_socket)
     
+    def send_snapshot_to_client(self, client_socket, game_state, encoded=None, stats=None):
+        """Met un snapshot en file : s'il n'est pas encore parti, le suivant le remplace"""
+        try:
+            message_bytes = self.encode_for_client(client_socket, game_state, encoded, stats)
+            started = time.perf_counter()
+            send_snapshot = getattr(client_socket, 'send_snapshot', None)
+            if send_snapshot:
+                send_snapshot(message_bytes)
+            else:
+                client_socket.send(message_bytes)
+            self.profiler.add('send', time.perf_counter() - started)
+            self.profiler.add_bytes(len(message_bytes))
+            self.metrics.messages.record('out', game_state.get('type'), len(message_bytes))
+        except (ConnectionResetError, BrokenPipeError, OSError):
+            self.disconnect_client(client_socket)
+        except Exception as e:
+            print(f"Erreur envoi snapshot: {e}")
+            self.disconnect_client(client_socket)
+    
+    def get_encode_stats(self):
+        """Encodages de snapshots faits et évités (dernier tick et cumul)"""
+        return {'last_tick': dict(self.encode_stats), 'total': dict(self.encode_totals)}
+    
+    def get_send_queue_stats(self):
+        """Profondeur des files d'envoi et frames perdues par client lent"""
+        stats = {'connections': 0, 'queued_messages': 0, 'max_queue_depth': 0,
+                 'dropped_frames': self.dropped_frames_total, 'messages_sent': 0, 'bytes_sent': 0}
+        for client_socket in list(self.clients.keys()):
+            queue = getattr(client_socket, 'queue', None)
+            if queue is None:
+                continue
+            stats['connections'] += 1
+            stats['queued_messages'] += len(queue)
+            stats['max_queue_depth'] = max(stats['max_queue_depth'], len(queue))
+            stats['dropped_frames'] += queue.dropped_frames
+            stats['messages_sent'] += client_socket.messages_sent
+            stats['bytes_sent'] += client_socket.bytes_sent
+        return stats
+    
     def disconnect_client(self, client_socket):
         try:
-            with self.lock:
-                if client_socket in self.clients:
-                    player = self.clients[client_socket]
-                    print(f"Déconnexion de {player.name}")
-                    
-                    # Remove from players dict
-                    if player.id in self.players:
-                        del self.players[player.id]
-                    
-                    # Remove from clients dict
-                    del self.clients[client_socket]
+            if self.command_queue is not None:
+                # Le joueur sera retiré par la boucle de jeu, après ses dernières commandes
+                self.command_queue.append((client_socket, None))
+            else:
+                with self.lock:
+                    self.remove_client(client_socket)
         except Exception as e:
             print(f"Erreur déconnexion: {e}")
             
@@ -1698,12 +2003,49 @@ class GameServer:
         except:
             pass
     
+    def remove_client(self, client_socket):
+        """Retire le joueur d'une connexion (appelant : détient le verrou)"""
+        if client_socket in self.clients:
+            player = self.clients[client_socket]
+            print(f"Déconnexion de {player.name}")
+            
+            # Remove from players dict
+            if player.id in self.players:
+                del self.players[player.id]
+            self.private_views.pop(player.id, None)
+            self.timers.cancel_owner(player.id)
+            
+            # Remove from clients dict
+            del self.clients[client_socket]
+            self.dropped_frames_total += getattr(client_socket, 'dropped_frames', 0)
+    
     def stop_server(self):
         self.running = False
+        self.dump_profile()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+            self.metrics_exporter = None
+        if self.async_loop and self.async_server:
+            self.async_loop.call_soon_threadsafe(self.async_server.close)
         self.socket.close()
 
 if __name__ == "__main__":
-    server = GameServer()
+    parser = argparse.ArgumentParser(description="Serveur RPG multijoueur")
+    parser.add_argument('--host', default=config.SERVER_HOST)
+    parser.add_argument('--port', type=int, default=config.SERVER_PORT)
+    parser.add_argument('--mode', choices=['threaded', 'asyncio'], default=config.SERVER_NETWORK_MODE,
+                        help="threaded: un thread par client, asyncio: une boucle d'événements unique")
+    parser.add_argument('--command-queue', action='store_true', default=config.SERVER_COMMAND_QUEUE,
+                        help="les threads réseau mettent les messages en file, la boucle de jeu les applique")
+    parser.add_argument('--profile-dump', default=config.TICK_PROFILE_DUMP,
+                        help="fichier JSON où écrire le profil des ticks à l'arrêt")
+    parser.add_argument('--metrics-port', type=int, default=config.METRICS_PORT if config.METRICS_ENABLED else None,
+                        help="port HTTP local des métriques Prometheus (GET /metrics)")
+    args = parser.parse_args()
+    
+    server = GameServer(args.host, args.port, network_mode=args.mode, command_queue=args.command_queue)
+    server.profile_dump_path = args.profile_dump
+    server.metrics_port = args.metrics_port
     try:
         server.start_server()
     except KeyboardInterrupt:
@@ -0,0 +1,190 @@
+"""
+Codec binaire des game_state (alternative compacte au JSON).
+
+Un snapshot binaire est une suite d'enregistrements struct sans noms de clés :
+en-tête (identifiant de schéma, tick + nombre d'entités par table), puis les
+joueurs, monstres et objets au sol (référencés par leur index dans le manifeste). Les positions sont quantifiées
+au 1/16e de pixel sur 16 bits, les HP sont des petits entiers signés et les
+valeurs énumérées (classe, rareté) tiennent sur un octet. Les joueurs n'y
+figurent que par leur vue publique ; inventaire et progression partent à part.
+
+decode_snapshot() rend exactement la structure du game_state JSON, pour que
+le client traite les deux formats de la même façon.
+"""
+import struct
+from typing import List
+
+SCHEMA_ID = 4  # 2 : tick dans l'en-tête ; 3 : vue publique des joueurs ; 4 : manifeste
+
+POSITION_SCALE = 16  # 1/16e de pixel : 3200 px * 16 tient sur 16 bits
+CUSTOM_ENUM = 255  # Valeur hors table : la chaîne suit
+UNKNOWN_ITEM = 0xFFFF  # Objet absent du manifeste
+
+PLAYER_CLASSES = ["Warrior", "Mage", "Archer", "Rogue"]
+
+HEADER = struct.Struct("!BIHHH")  # schéma, tick, joueurs, monstres, objets
+PLAYER = struct.Struct("!HHhhHBhh")  # Vue publique (player_public_dict)
+MONSTER = struct.Struct("!HHhhHHHB")
+DROPPED_ITEM = struct.Struct("!HHHd")  # index dans manifest['items'], x, y, date
+U8 = struct.Struct("!B")
+
+
+def clamp(value, low, high):
+    return low if value < low else high if value > high else int(value)
+
+
+def quantize(position: float) -> int:
+    return clamp(round(position * POSITION_SCALE), 0, 0xFFFF)
+
+
+def dequantize(value: int) -> float:
+    return value / POSITION_SCALE
+
+
+def i16(value) -> int:
+    return clamp(value, -0x8000, 0x7FFF)
+
+
+def u16(value) -> int:
+    return clamp(value, 0, 0xFFFF)
+
+
+def u32(value) -> int:
+    return clamp(value, 0, 0xFFFFFFFF)
+
+
+def pack_str(parts: List[bytes], text: str):
+    """Chaîne UTF-8 préfixée par sa longueur, tronquée à 255 octets sur une limite de caractère"""
+    data = (text or "").encode('utf-8')
+    if len(data) > 255:
+        data = data[:255].decode('utf-8', 'ignore').encode('utf-8')
+    parts.append(U8.pack(len(data)))
+    parts.append(data)
+
+
+def pack_enum(parts: List[bytes], value: str, table: List[str]):
+    if value in table:
+        parts.append(U8.pack(table.index(value)))
+    else:
+        parts.append(U8.pack(CUSTOM_ENUM))
+        pack_str(parts, value)
+
+
+def encode_player(parts: List[bytes], player: dict):
+    pack_str(parts, player['id'])
+    pack_str(parts, player['name'])
+    pack_enum(parts, player['player_class'], PLAYER_CLASSES)
+    pack_str(parts, player.get('dungeon_instance') or "")
+    parts.append(PLAYER.pack(
+        quantize(player['x']), quantize(player['y']),
+        i16(player['hp']), i16(player['max_hp']), u16(player['level']),
+        1 if player['alive'] else 0,
+        i16(player['mana']), i16(player['max_mana'])
+    ))
+
+
+def encode_snapshot(game_state: dict) -> bytes:
+    """Encode un game_state (structure JSON du serveur) en binaire"""
+    players = game_state.get('players', {})
+    monsters = game_state.get('monsters', {})
+    dropped_items = game_state.get('dropped_items', {})
+
+    parts = [HEADER.pack(SCHEMA_ID, u32(game_state.get('tick', 0)),
+                         len(players), len(monsters), len(dropped_items))]
+    for player in players.values():
+        encode_player(parts, player)
+    for monster in monsters.values():
+        pack_str(parts, monster['id'])
+        parts.append(MONSTER.pack(
+            quantize(monster['x']), quantize(monster['y']),
+            i16(monster['hp']), i16(monster['max_hp']),
+            u16(monster['attack']), u16(monster['defense']), u16(monster['xp_reward']),
+            1 if monster['alive'] else 0
+        ))
+    for drop in dropped_items.values():
+        pack_str(parts, drop['drop_id'])
+        item = drop['item']
+        parts.append(DROPPED_ITEM.pack(UNKNOWN_ITEM if item is None else u16(item),
+                                       quantize(drop['x']), quantize(drop['y']), drop['drop_time']))
+    return b"".join(parts)
+
+
+class SnapshotReader:
+    """Lecture séquentielle d'un snapshot binaire (memoryview, sans copie)"""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.offset = 0
+
+    def unpack(self, record: struct.Struct):
+        values = record.unpack_from(self.payload, self.offset)
+        self.offset += record.size
+        return values
+
+    def string(self) -> str:
+        length = self.payload[self.offset]
+        start = self.offset + 1
+        self.offset = start + length
+        return str(self.payload[start:self.offset], 'utf-8')
+
+    def enum(self, table: List[str]) -> str:
+        code = self.payload[self.offset]
+        self.offset += 1
+        if code == CUSTOM_ENUM:
+            return self.string()
+        return table[code]
+
+
+def decode_player(reader: SnapshotReader) -> dict:
+    player_id = reader.string()
+    name = reader.string()
+    player_class = reader.enum(PLAYER_CLASSES)
+    dungeon_instance = reader.string()
+    x, y, hp, max_hp, level, alive, mana, max_mana = reader.unpack(PLAYER)
+    return {
+        'id': player_id, 'name': name,
+        'x': dequantize(x), 'y': dequantize(y),
+        'hp': hp, 'max_hp': max_hp, 'level': level,
+        'alive': bool(alive), 'player_class': player_class, 'mana': mana, 'max_mana': max_mana,
+        'dungeon_instance': dungeon_instance
+    }
+
+
+def decode_snapshot(payload) -> dict:
+    """Décode un snapshot binaire en game_state (même structure que le JSON)"""
+    reader = SnapshotReader(payload)
+    schema_id, tick, player_count, monster_count, drop_count = reader.unpack(HEADER)
+    if schema_id != SCHEMA_ID:
+        raise ValueError(f"Schéma de snapshot inconnu: {schema_id}")
+
+    players = {}
+    for _ in range(player_count):
+        player = decode_player(reader)
+        players[player['id']] = player
+
+    monsters = {}
+    for _ in range(monster_count):
+        monster_id = reader.string()
+        x, y, hp, max_hp, attack, defense, xp_reward, alive = reader.unpack(MONSTER)
+        monsters[monster_id] = {
+            'id': monster_id, 'x': dequantize(x), 'y': dequantize(y),
+            'hp': hp, 'max_hp': max_hp, 'attack': attack, 'defense': defense,
+            'xp_reward': xp_reward, 'alive': bool(alive)
+        }
+
+    dropped_items = {}
+    for _ in range(drop_count):
+        drop_id = reader.string()
+        item, x, y, drop_time = reader.unpack(DROPPED_ITEM)
+        dropped_items[drop_id] = {
+            'drop_id': drop_id, 'item': None if item == UNKNOWN_ITEM else item,
+            'x': dequantize(x), 'y': dequantize(y), 'drop_time': drop_time
+        }
+
+    return {
+        'type': 'game_state',
+        'tick': tick,
+        'players': players,
+        'monsters': monsters,
+        'dropped_items': dropped_items
+    }
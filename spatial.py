@@ -0,0 +1,218 @@
+"""
+Index spatial des entités du serveur (grille uniforme par instance).
+
+SpatialGrid est un dict id -> entité (il remplace les dict monsters, players
+et dropped_items du serveur) qui range aussi chaque entité dans une cellule
+(instance, cx, cy). L'instance est l'attribut dungeon_instance ("" pour le
+monde principal). Ajouts et suppressions passent par le dict ; le code qui
+change la position ou l'instance d'une entité appelle relocate(id).
+
+Les requêtes vérifient toujours la position et l'instance réelles des
+entités : la grille ne sert qu'à limiter les candidats.
+"""
+import heapq
+import math
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+CellKey = Tuple[str, int, int]
+
+
+def instance_of(entity) -> str:
+    return entity.dungeon_instance or ''
+
+
+class SpatialGrid(dict):
+    """dict id -> entité doublé d'une grille uniforme par instance"""
+
+    def __init__(self, cell_size: float = 128):
+        super().__init__()
+        self.cell_size = cell_size
+        self.cells: Dict[CellKey, Dict[str, object]] = {}
+        self.cell_of: Dict[str, CellKey] = {}
+        self.instances: Dict[str, Dict[str, object]] = {}  # instance -> {id: entité}
+
+    # --- Tenue à jour -----------------------------------------------------
+
+    def key_for(self, entity) -> CellKey:
+        return (instance_of(entity), int(entity.x // self.cell_size), int(entity.y // self.cell_size))
+
+    def link(self, entity_id, entity):
+        key = self.key_for(entity)
+        self.cell_of[entity_id] = key
+        self.cells.setdefault(key, {})[entity_id] = entity
+        self.instances.setdefault(key[0], {})[entity_id] = entity
+
+    def unlink(self, entity_id):
+        key = self.cell_of.pop(entity_id, None)
+        if key is None:
+            return
+        cell = self.cells.get(key)
+        if cell is not None:
+            cell.pop(entity_id, None)
+            if not cell:
+                del self.cells[key]
+        members = self.instances.get(key[0])
+        if members is not None:
+            members.pop(entity_id, None)
+            if not members:
+                del self.instances[key[0]]
+
+    def relocate(self, entity_id):
+        """À appeler après un changement de position ou d'instance"""
+        entity = self.get(entity_id)
+        if entity is None:
+            return
+        key = self.key_for(entity)
+        if self.cell_of.get(entity_id) != key:
+            self.unlink(entity_id)
+            self.link(entity_id, entity)
+
+    def __setitem__(self, entity_id, entity):
+        if entity_id in self:
+            self.unlink(entity_id)
+        super().__setitem__(entity_id, entity)
+        self.link(entity_id, entity)
+
+    def __delitem__(self, entity_id):
+        super().__delitem__(entity_id)
+        self.unlink(entity_id)
+
+    def pop(self, entity_id, *default):
+        if entity_id in self:
+            self.unlink(entity_id)
+        return super().pop(entity_id, *default)
+
+    def popitem(self):
+        entity_id, entity = super().popitem()
+        self.unlink(entity_id)
+        return entity_id, entity
+
+    def setdefault(self, entity_id, entity=None):
+        if entity_id not in self:
+            self[entity_id] = entity
+        return self[entity_id]
+
+    def update(self, *args, **kwargs):
+        for entity_id, entity in dict(*args, **kwargs).items():
+            self[entity_id] = entity
+
+    def clear(self):
+        super().clear()
+        self.cells.clear()
+        self.cell_of.clear()
+        self.instances.clear()
+
+    # --- Requêtes ---------------------------------------------------------
+
+    def instance_ids(self) -> List[str]:
+        """Instances qui ont au moins une entité indexée"""
+        return list(self.instances)
+
+    def drop_instance(self, instance: str) -> List[str]:
+        """Retire toutes les entités indexées dans une instance (coût : taille de l'instance)"""
+        entity_ids = list(self.instances.get(instance or '', ()))
+        for entity_id in entity_ids:
+            del self[entity_id]
+        return entity_ids
+
+    def instance_items(self, instance: str = '') -> List[Tuple[str, object]]:
+        """Paires (id, entité) d'une instance, vérifiées sur l'attribut dungeon_instance"""
+        instance = instance or ''
+        return [(entity_id, entity) for entity_id, entity in self.instances.get(instance, {}).items()
+                if instance_of(entity) == instance]
+
+    def candidates(self, instance: str, x0: float, y0: float, x1: float, y1: float) -> Iterator:
+        for cell in self.candidate_cells(instance, x0, y0, x1, y1):
+            yield from list(cell.values())
+
+    def candidate_cells(self, instance: str, x0: float, y0: float, x1: float, y1: float) -> Iterator[dict]:
+        """Cellules (id -> entité) de l'instance qui recouvrent le rectangle"""
+        size = self.cell_size
+        instance = instance or ''
+        cx0, cx1 = int(x0 // size), int(x1 // size)
+        cy0, cy1 = int(y0 // size), int(y1 // size)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            # Zone plus grande que la grille occupée : parcourir les cellules existantes
+            for (cell_instance, cx, cy), cell in list(self.cells.items()):
+                if cell_instance == instance and cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    yield cell
+            return
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self.cells.get((instance, cx, cy))
+                if cell:
+                    yield cell
+
+    def query_rect(self, x0: float, y0: float, x1: float, y1: float, instance: str = '',
+                   predicate: Optional[Callable] = None) -> List:
+        """Entités de l'instance dans le rectangle [x0, x1] x [y0, y1]"""
+        instance = instance or ''
+        return [entity for entity in self.candidates(instance, x0, y0, x1, y1)
+                if x0 <= entity.x <= x1 and y0 <= entity.y <= y1
+                and instance_of(entity) == instance and (predicate is None or predicate(entity))]
+
+    def query_radius(self, x: float, y: float, radius: float, instance: str = '',
+                     predicate: Optional[Callable] = None) -> List:
+        """Entités de l'instance à moins de radius de (x, y)"""
+        instance = instance or ''
+        limit = radius * radius
+        return [entity for entity in self.candidates(instance, x - radius, y - radius, x + radius, y + radius)
+                if (entity.x - x) ** 2 + (entity.y - y) ** 2 <= limit
+                and instance_of(entity) == instance and (predicate is None or predicate(entity))]
+
+    def nearest(self, x: float, y: float, k: int = 1, instance: str = '', max_radius: float = math.inf,
+                predicate: Optional[Callable] = None) -> List:
+        """Les k entités les plus proches (anneaux de cellules de plus en plus grands)"""
+        instance = instance or ''
+        size = self.cell_size
+        cx, cy = int(x // size), int(y // size)
+        if math.isinf(max_radius):
+            # Sans rayon maximal, s'arrêter à la cellule occupée la plus éloignée
+            max_ring = max((max(abs(kx - cx), abs(ky - cy)) for (key_instance, kx, ky) in self.cells
+                            if key_instance == instance), default=-1)
+        else:
+            max_ring = int(max_radius // size) + 1
+        found = []  # tas (distance², ordre, entité)
+        seen = 0
+        ring = 0
+        limit = max_radius * max_radius
+        while ring <= max_ring:
+            for dx in range(-ring, ring + 1):
+                for dy in range(-ring, ring + 1):
+                    if max(abs(dx), abs(dy)) != ring:
+                        continue  # Seulement le bord de l'anneau
+                    for entity in list(self.cells.get((instance, cx + dx, cy + dy), {}).values()):
+                        if instance_of(entity) != instance or (predicate is not None and not predicate(entity)):
+                            continue
+                        distance = (entity.x - x) ** 2 + (entity.y - y) ** 2
+                        if distance <= limit:
+                            seen += 1
+                            heapq.heappush(found, (distance, seen, entity))
+            # Toute cellule hors des anneaux parcourus est à plus de ring * size
+            if len(found) >= k and heapq.nsmallest(k, found)[-1][0] <= (ring * size) ** 2:
+                break
+            ring += 1
+        return [entity for _, _, entity in heapq.nsmallest(k, found)]
+
+
+class InstanceRegistry(dict):
+    """Entités appartenant à une instance : l'ajout les rattache à cette instance"""
+
+    def __init__(self, instance_id: str, *args, **kwargs):
+        super().__init__()
+        self.instance_id = instance_id
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, entity_id, entity):
+        if instance_of(entity) != self.instance_id:
+            entity.dungeon_instance = self.instance_id
+        super().__setitem__(entity_id, entity)
+
+    def update(self, *args, **kwargs):
+        for entity_id, entity in dict(*args, **kwargs).items():
+            self[entity_id] = entity
+
+    def setdefault(self, entity_id, entity=None):
+        if entity_id not in self:
+            self[entity_id] = entity
+        return self[entity_id]
@@ -0,0 +1,103 @@
+"""
+Tables d'apparition des monstres du monde.
+
+Les zones sont compilées une fois en règles d'apparition (bornes de position
+et de stats déjà calculées). Chaque monstre garde l'indice de sa règle
+(Monster.spawn_slot) : un respawn est une lecture de table plus quelques
+tirages aléatoires, sans analyser l'identifiant du monstre.
+"""
+import random
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+
+WORLD_WIDTH = 3200
+WORLD_HEIGHT = 2400
+
+# (zone, colonne, ligne, type de monstre, nombre, (hp min, hp max)) sur une grille de 3 x 3 zones
+ZONES = [
+    ("plains", 0, 0, "Slime", 8, (20, 40)),
+    ("forest", 1, 0, "Loup", 10, (35, 55)),
+    ("mountains", 2, 0, "Orc", 12, (50, 70)),
+    ("desert", 0, 1, "Momie", 10, (45, 65)),
+    ("coast", 1, 1, "Pirate", 8, (55, 75)),
+    ("volcano", 2, 1, "Drake", 6, (70, 90)),
+    ("ice", 0, 2, "Yeti", 8, (40, 60)),
+    ("swamp", 1, 2, "Troll", 7, (60, 80)),
+    ("crystal", 2, 2, "Golem", 5, (80, 100)),
+]
+RANDOM_MONSTERS = 20  # Monstres sans zone, répartis sur toute la carte
+
+
+@dataclass(slots=True, frozen=True)
+class SpawnRule:
+    """Bornes (incluses) d'apparition d'un type de monstre"""
+    zone: str
+    monster_type: str
+    count: int
+    x_range: Tuple[int, int]
+    y_range: Tuple[int, int]
+    hp_range: Tuple[int, int]
+    attack_range: Tuple[int, int]
+    defense_range: Tuple[int, int]
+    xp_range: Tuple[int, int]
+
+    def id_for(self, index: int) -> str:
+        if not self.zone:
+            return f"monster_random_{index}"
+        return f"{self.monster_type}_{self.zone}_{index}"
+
+
+def zone_rule(zone, column, row, monster_type, count, hp_range) -> SpawnRule:
+    zone_width = WORLD_WIDTH // 3  # 1066
+    zone_height = WORLD_HEIGHT // 3  # 800
+    x_start, y_start = column * zone_width, row * zone_height
+    min_hp, max_hp = hp_range
+    return SpawnRule(
+        zone=zone, monster_type=monster_type, count=count,
+        x_range=(x_start + 50, min(x_start + zone_width - 50, WORLD_WIDTH - 50)),
+        y_range=(y_start + 50, min(y_start + zone_height - 50, WORLD_HEIGHT - 50)),
+        hp_range=(min_hp, max_hp),
+        attack_range=(8 + min_hp // 10, 15 + max_hp // 10),
+        defense_range=(2 + min_hp // 20, 8 + max_hp // 15),
+        xp_range=(15 + min_hp // 5, 30 + max_hp // 3)
+    )
+
+
+class SpawnTable:
+    """Règles d'apparition compilées ; un monstre y fait référence par indice"""
+
+    def __init__(self, zones=ZONES, random_count: int = RANDOM_MONSTERS, rng=random):
+        self.rng = rng
+        self.rules: List[SpawnRule] = [zone_rule(*zone) for zone in zones]
+        self.rules.append(SpawnRule(
+            zone="", monster_type="monster", count=random_count,
+            x_range=(100, WORLD_WIDTH - 100), y_range=(100, WORLD_HEIGHT - 100),
+            hp_range=(30, 60), attack_range=(8, 15), defense_range=(2, 8), xp_range=(15, 30)
+        ))
+
+    def initial_slots(self) -> Iterator[Tuple[str, int]]:
+        """(id du monstre, indice de règle) de la population initiale"""
+        for slot, rule in enumerate(self.rules):
+            for index in range(rule.count):
+                yield rule.id_for(index), slot
+
+    def roll(self, slot: int) -> dict:
+        """Position et stats tirées pour la règle slot (arguments de Monster)"""
+        rule = self.rules[slot]
+        randint = self.rng.randint
+        hp = randint(*rule.hp_range)
+        return {
+            'x': randint(*rule.x_range),
+            'y': randint(*rule.y_range),
+            'hp': hp,
+            'max_hp': hp,
+            'attack': randint(*rule.attack_range),
+            'defense': randint(*rule.defense_range),
+            'xp_reward': randint(*rule.xp_range),
+            'spawn_slot': slot
+        }
+
+    def zone_layout(self) -> List[tuple]:
+        """Zones pour le manifeste : [(nom, x, y, monstre, nombre, (hp min, hp max))]"""
+        return [(rule.zone, rule.x_range[0] - 50, rule.y_range[0] - 50, rule.monster_type, rule.count, rule.hp_range)
+                for rule in self.rules if rule.zone]
@@ -0,0 +1,129 @@
+"""
+Stats dérivées des joueurs, calculées par couches.
+
+Quatre couches restent séparées : la base (classe et niveau), les
+améliorations achetées avec les points de compétence, l'équipement et les
+modificateurs des effets d'état (effects.py). Les stats dérivées sont mises
+en cache et ne sont recalculées que lorsqu'une couche a été marquée sale ;
+la fin d'un effet ne touche donc jamais aux autres couches.
+
+Une couche vide est la constante partagée NO_STATS : la plupart des joueurs
+n'ont ni amélioration, ni équipement à stats, ni effet actif, et ne paient
+pas trois dict chacun. Une couche n'est allouée qu'à sa première écriture.
+"""
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Tuple
+
+STAT_NAMES = ('attack', 'defense', 'speed', 'critical_chance', 'max_hp', 'max_mana')
+NO_STATS: Mapping = MappingProxyType({})  # Couche vide partagée (lecture seule)
+
+# Stats de niveau 1 par classe (max_hp et max_mana hors bonus d'attaque et de niveau)
+CLASS_BASE_STATS = {
+    'warrior': {'attack': 12, 'defense': 10, 'speed': 6, 'critical_chance': 0.05, 'max_hp': 120, 'max_mana': 30},
+    'mage': {'attack': 8, 'defense': 6, 'speed': 8, 'critical_chance': 0.15, 'max_hp': 80, 'max_mana': 100},
+    'archer': {'attack': 10, 'defense': 7, 'speed': 12, 'critical_chance': 0.20, 'max_hp': 90, 'max_mana': 50},
+    'rogue': {'attack': 9, 'defense': 5, 'speed': 14, 'critical_chance': 0.25, 'max_hp': 85, 'max_mana': 40},
+}
+DEFAULT_BASE_STATS = dict(CLASS_BASE_STATS['warrior'], max_hp=100, max_mana=50)
+
+# Gain par niveau au-delà du premier
+LEVEL_GROWTH = {'attack': 2, 'defense': 2, 'speed': 1, 'critical_chance': 0.01, 'max_hp': 20, 'max_mana': 12}
+HP_PER_ATTACK = 2  # Chaque point d'attaque permanent donne 2 HP max
+
+# Améliorations achetées avec un point de compétence : stat du client -> (stat, gain)
+SKILL_UPGRADES = {
+    'attack': ('attack', 2),
+    'defense': ('defense', 2),
+    'speed': ('speed', 1),
+    'hp': ('max_hp', 15),
+    'mana': ('max_mana', 10),
+    'critical': ('critical_chance', 0.05),
+}
+
+
+@lru_cache(maxsize=None)
+def base_stats(player_class: str, level: int) -> Dict[str, float]:
+    """Couche de base pour une classe et un niveau (partagée, ne pas modifier)"""
+    base = CLASS_BASE_STATS.get(player_class.lower(), DEFAULT_BASE_STATS)
+    stats = {stat: base[stat] + (level - 1) * LEVEL_GROWTH[stat] for stat in STAT_NAMES}
+    stats['max_mana'] += 2  # Bonus historique de 2 mana au niveau 1
+    return stats
+
+
+def add_into(total: Dict[str, float], stats: Mapping[str, float]):
+    for stat, value in stats.items():
+        if stat in total:
+            total[stat] += value
+
+
+class PlayerStats:
+    """Couches de stats d'un joueur et stats dérivées en cache"""
+    __slots__ = ('player_class', 'level', 'upgrades', 'equipment', 'timed', 'dirty', 'derived')
+
+    def __init__(self):
+        self.player_class = None
+        self.level = None
+        self.upgrades: Mapping[str, float] = NO_STATS
+        self.equipment: Mapping[str, float] = NO_STATS
+        self.timed: Mapping[str, Tuple[float, float]] = NO_STATS  # stat -> (ajout, multiplicateur)
+        self.dirty = True
+        self.derived: Mapping[str, float] = NO_STATS
+
+    def set_base(self, player_class: str, level: int):
+        if player_class != self.player_class or level != self.level:
+            self.player_class, self.level = player_class, level
+            self.dirty = True
+
+    def upgrade(self, stat: str, amount: float):
+        if self.upgrades is NO_STATS:
+            self.upgrades = {}
+        self.upgrades[stat] = self.upgrades.get(stat, 0) + amount
+        self.dirty = True
+
+    def set_equipment(self, items: Iterable):
+        """Reconstruit la couche d'équipement depuis les objets équipés"""
+        equipment = {}
+        for item in items:
+            for stat, value in getattr(item, 'stats', {}).items():
+                if stat in STAT_NAMES:
+                    equipment[stat] = equipment.get(stat, 0) + value
+        if equipment != self.equipment:
+            self.equipment = equipment or NO_STATS
+            self.dirty = True
+
+    def set_timed(self, modifiers: Mapping[str, Tuple[float, float]]):
+        """Remplace la couche des effets temporaires (EffectSet.modifiers())"""
+        if modifiers != self.timed:
+            self.timed = modifiers or NO_STATS
+            self.dirty = True
+
+    def derive(self) -> Dict[str, float]:
+        """Stats dérivées, recalculées seulement si une couche est sale"""
+        if not self.dirty:
+            return self.derived
+        derived = dict(base_stats(self.player_class or '', self.level or 1))
+        add_into(derived, self.upgrades)
+        add_into(derived, self.equipment)
+        # Les HP max suivent l'attaque permanente, pas les bonus temporaires
+        derived['max_hp'] += derived['attack'] * HP_PER_ATTACK
+        for stat, (add, mult) in self.timed.items():
+            value = derived[stat]
+            derived[stat] = type(value)(value * mult + add)
+        self.derived = derived
+        self.dirty = False
+        return derived
+
+    def apply(self, player) -> bool:
+        """Écrit les stats dérivées sur le joueur ; HP et mana gardent leur proportion"""
+        self.set_base(player.player_class, player.level)
+        if not self.dirty:
+            return False
+        old_max_hp, old_max_mana = player.max_hp, player.max_mana
+        for stat, value in self.derive().items():
+            setattr(player, stat, value)
+        if player.max_hp != old_max_hp:
+            player.hp = int(player.max_hp * player.hp / old_max_hp) if old_max_hp > 0 else player.max_hp
+        if player.max_mana != old_max_mana:
+            player.mana = int(player.max_mana * player.mana / old_max_mana) if old_max_mana > 0 else player.max_mana
+        return True
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test du mode réseau asyncio du serveur (toutes les connexions sur une boucle)
+"""
+
+import json
+import socket
+import sys
+import threading
+import time
+
+sys.path.append('.')
+
+
+def find_free_port():
+    """Réserve un port libre sur localhost"""
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    probe.bind(("localhost", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+
+def read_messages(client, wanted_type, timeout=3.0):
+    """Lit des messages JSON (un par ligne) jusqu'à trouver le type voulu"""
+    client.settimeout(timeout)
+    buffer = b""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        data = client.recv(65536)
+        if not data:
+            break
+        buffer += data
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            if line.strip():
+                message = json.loads(line)
+                if message.get('type') == wanted_type:
+                    return message
+    return None
+
+
+def test_asyncio_mode():
+    """Plusieurs clients sur la boucle asyncio reçoivent joined et game_state"""
+    print("🧪 Test: Serveur en mode asyncio")
+
+    import server
+
+    port = find_free_port()
+    game_server = server.GameServer("localhost", port, network_mode="asyncio")
+    threading.Thread(target=game_server.start_server, daemon=True).start()
+
+    clients = []
+    try:
+        for attempt in range(50):
+            try:
+                probe = socket.create_connection(("localhost", port), timeout=1.0)
+                clients.append(probe)
+                break
+            except ConnectionRefusedError:
+                time.sleep(0.05)
+        assert clients, "Le serveur asyncio n'a pas démarré"
+
+        for i in range(2):
+            clients.append(socket.create_connection(("localhost", port), timeout=1.0))
+
+        for i, client in enumerate(clients):
+            # Message sans saut de ligne, comme les anciens scripts de test
+            client.send(json.dumps({'type': 'join', 'name': f'Bot{i}', 'class': 'Mage'}).encode())
+            joined = read_messages(client, 'joined')
+            assert joined is not None, f"Bot{i} n'a pas reçu 'joined'"
+            print(f"    ✅ Bot{i} connecté: {joined['player_id']}")
+
+        game_state = read_messages(clients[0], 'game_state')
+        assert game_state is not None, "Aucun game_state reçu"
+        assert len(game_state['players']) == 3, f"3 joueurs attendus, trouvé {len(game_state['players'])}"
+        print(f"    ✅ game_state reçu avec {len(game_state['monsters'])} monstres")
+
+        # Déconnexion propre: le joueur disparaît du serveur
+        clients.pop().close()
+        time.sleep(0.2)
+        assert len(game_server.players) == 2, "Le joueur déconnecté devrait être supprimé"
+        print("    ✅ Déconnexion gérée par la boucle asyncio")
+    finally:
+        for client in clients:
+            client.close()
+        game_server.stop_server()
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_asyncio_mode()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test du mode file de commandes (un seul thread modifie l'état du jeu)
+"""
+
+import json
+import sys
+import threading
+
+sys.path.append('.')
+
+
+class RecordingConnection:
+    """Connexion factice qui garde les messages envoyés"""
+
+    def __init__(self):
+        self.wire_format = "json_lines"
+        self.snapshot_format = "json"
+        self.snapshot_history = None
+        self.sent = []
+        self.closed = False
+
+    def send(self, data):
+        self.sent.append(json.loads(data))
+        return len(data)
+
+    send_snapshot = send
+
+    def close(self):
+        self.closed = True
+
+
+def test_network_threads_only_enqueue():
+    """process_message ne prend pas le verrou et ne touche pas à l'état"""
+    print("🧪 Test: Mise en file sans verrou")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0, command_queue=True)
+    connection = RecordingConnection()
+
+    # Le verrou est tenu ailleurs : un thread réseau ne doit pas attendre
+    with game_server.lock:
+        worker = threading.Thread(target=game_server.process_message,
+                                  args=(connection, {'type': 'join', 'name': 'Alice'}))
+        worker.start()
+        worker.join(timeout=1.0)
+        assert not worker.is_alive(), "Le thread réseau a attendu le verrou"
+    assert not game_server.players, "Rien n'est appliqué avant le tick"
+
+    game_server.run_tick()
+    assert len(game_server.players) == 1, "Le join est appliqué au début du tick"
+    assert connection.sent[0]['type'] == 'joined'
+    print("    ✅ Commandes appliquées par la boucle de jeu")
+    return True
+
+
+def test_moves_coalesced_in_order():
+    """Déplacements regroupés, ordre respecté autour des autres commandes"""
+    print("🧪 Test: Regroupement des déplacements")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0, command_queue=True)
+    alice = RecordingConnection()
+    bob = RecordingConnection()
+    game_server.process_message(alice, {'type': 'join', 'name': 'Alice'})
+    game_server.process_message(bob, {'type': 'join', 'name': 'Bob'})
+    game_server.run_tick()
+
+    for step in range(10):
+        game_server.process_message(alice, {'type': 'move', 'x': 100 + step, 'y': 200})
+    game_server.process_message(bob, {'type': 'move', 'x': 700, 'y': 700})
+    game_server.process_message(bob, {'type': 'enter_dungeon', 'dungeon_id': 'goblin_cave'})
+    game_server.process_message(bob, {'type': 'move', 'x': 800, 'y': 800})
+    game_server.run_tick()
+
+    alice_player = game_server.clients[alice]
+    bob_player = game_server.clients[bob]
+    assert (alice_player.x, alice_player.y) == (109, 200), "Dernier déplacement d'Alice appliqué"
+    assert (bob_player.x, bob_player.y) == (800, 800), "Dernier déplacement de Bob appliqué"
+    stats = game_server.get_command_queue_stats()
+    assert stats['coalesced'] == 9, f"9 déplacements d'Alice regroupés: {stats}"
+    assert stats['depth'] == 0 and stats['max_batch'] == 13
+    print(f"    ✅ {stats['coalesced']} déplacements regroupés")
+    return True
+
+
+def test_disconnect_after_pending_commands():
+    """La déconnexion passe par la file, après les commandes déjà reçues"""
+    print("🧪 Test: Déconnexion en file")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0, command_queue=True)
+    connection = RecordingConnection()
+    game_server.process_message(connection, {'type': 'join', 'name': 'Carol'})
+    game_server.run_tick()
+
+    game_server.process_message(connection, {'type': 'move', 'x': 300, 'y': 300})
+    game_server.disconnect_client(connection)
+    assert connection.closed, "La connexion est fermée tout de suite"
+    assert game_server.players, "Le joueur est retiré au tick suivant seulement"
+
+    game_server.run_tick()
+    assert not game_server.players and not game_server.clients
+    assert game_server.get_command_queue_stats()['disconnects'] == 1
+    print("    ✅ Joueur retiré par la boucle de jeu")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_network_threads_only_enqueue, test_moves_coalesced_in_order,
+             test_disconnect_after_pending_commands]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
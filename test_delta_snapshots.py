@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test des snapshots delta (par rapport au dernier tick acquitté)
+"""
+
+import json
+import sys
+
+sys.path.append('.')
+
+
+class RecordingConnection:
+    """Connexion factice qui garde les messages envoyés"""
+
+    def __init__(self):
+        self.wire_format = "json_lines"
+        self.snapshot_format = "json"
+        self.snapshot_history = None
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(json.loads(data))
+        return len(data)
+
+    send_snapshot = send
+
+    def close(self):
+        pass
+
+
+def test_delta_round_trip():
+    """apply_delta(base, make_delta(base, état)) reconstruit l'état"""
+    print("🧪 Test: Aller-retour delta")
+
+    import server
+    from delta import apply_delta, make_delta
+
+    game_server = server.GameServer("localhost", 0)
+    game_server.players["player_0"] = server.Player(id="player_0", name="Alice")
+    base = game_server.create_world_game_state()
+
+    game_server.tick += 1
+    monster_ids = list(game_server.monsters.keys())
+    game_server.monsters[monster_ids[0]].hp -= 5
+    del game_server.monsters[monster_ids[1]]
+    game_server.players["player_0"].x += 10
+    game_server.players["player_1"] = server.Player(id="player_1", name="Bob")
+    state = game_server.create_world_game_state()
+
+    delta = make_delta(base['tick'], base, state)
+    assert set(delta['monsters']['changed']) == {monster_ids[0]}, "Seul le monstre blessé doit changer"
+    assert delta['monsters']['changed'][monster_ids[0]] == {'hp': state['monsters'][monster_ids[0]]['hp']}
+    assert delta['monsters']['removed'] == [monster_ids[1]]
+    assert delta['players']['changed']['player_0'] == {'x': state['players']['player_0']['x']}
+    assert 'dropped_items' not in delta, "Les objets au sol n'ont pas changé"
+
+    rebuilt = apply_delta(base, delta)
+    for table in ('players', 'monsters', 'dropped_items'):
+        assert rebuilt[table] == state[table], f"Table {table} mal reconstruite"
+
+    full_size = len(json.dumps(state))
+    delta_size = len(json.dumps(delta))
+    print(f"    📏 Complet: {full_size} octets, delta: {delta_size} octets")
+    print("    ✅ Delta reconstruit à l'identique")
+    return True
+
+
+def test_server_keyframes_and_deltas():
+    """Keyframe sans acquittement, delta ensuite, keyframe si la base est trop vieille"""
+    print("🧪 Test: Keyframes et deltas côté serveur")
+
+    import config
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    connection = RecordingConnection()
+    game_server.process_message(connection, {'type': 'join', 'name': 'Delta', 'delta': True})
+    assert connection.snapshot_history is not None, "Le client a demandé les deltas"
+    connection.sent.clear()
+
+    game_server.send_instance_specific_game_states()
+    first = connection.sent[-1]
+    assert first['type'] == 'game_state', "Premier envoi: keyframe"
+
+    game_server.process_message(connection, {'type': 'ack', 'tick': first['tick']})
+    game_server.send_instance_specific_game_states()
+    second = connection.sent[-1]
+    assert second['type'] == 'game_state_delta', f"Attendu un delta, reçu {second['type']}"
+    assert second['baseline'] == first['tick']
+    assert 'monsters' not in second, "Les monstres n'ont pas bougé"
+    print(f"    ✅ Delta de {len(json.dumps(second))} octets contre {len(json.dumps(first))}")
+
+    # Le client n'acquitte plus : au-delà de l'âge maximum, keyframe
+    for _ in range(config.DELTA_MAX_BASELINE_AGE + 1):
+        game_server.send_instance_specific_game_states()
+    assert connection.sent[-1]['type'] == 'game_state', "Base trop vieille: keyframe attendue"
+    print("    ✅ Keyframe quand la base est trop ancienne")
+
+    # Les clients sans deltas reçoivent toujours des snapshots complets
+    legacy = RecordingConnection()
+    game_server.process_message(legacy, {'type': 'join', 'name': 'Ancien'})
+    game_server.send_instance_specific_game_states()
+    assert legacy.sent[-1]['type'] == 'game_state'
+    print("    ✅ Clients sans deltas inchangés")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_delta_round_trip, test_server_keyframes_and_deltas]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test des zones endormies (sans observateur) et de leur rattrapage au réveil
+"""
+
+import sys
+import time
+from unittest.mock import Mock
+
+sys.path.append('.')
+
+
+def test_observed_zones():
+    """Un joueur observe sa case et celles à moins du rayon ; un donjon est sa propre zone"""
+    print("🧪 Test: Zones observées")
+
+    import server
+    from zones import ZoneActivity
+
+    zones = ZoneActivity(radius=100, now=0.0)
+    alice = server.Player(id="player_0", name="Alice", x=300, y=300)
+    assert zones.update([alice], now=10.0) == [("plains", 0.0)]
+    assert zones.active == {"plains"}
+
+    alice.x = 1000  # À moins de 100 px de la forêt
+    woken = zones.update([alice], now=20.0)
+    assert woken == [("forest", 0.0)] and zones.active == {"plains", "forest"}
+
+    alice.dungeon_instance = "dungeon_instance_1"
+    assert zones.update([alice], now=30.0) == [("dungeon_instance_1", 30.0)]
+    assert zones.dormant_since["plains"] == 30.0 and zones.zone_of(10, 10) == "plains"
+    print("    ✅ Cases observées, endormissement daté")
+    return True
+
+
+def test_dormant_zone_catches_up():
+    """Respawns mis de côté et régénération suspendue, rattrapés au réveil"""
+    print("🧪 Test: Rattrapage au réveil")
+
+    import config
+    import server
+
+    enabled = config.MONSTER_REGEN_ENABLED
+    config.MONSTER_REGEN_ENABLED = True  # Mécanique désactivée par défaut
+    try:
+        game_server = server.GameServer("localhost", 0)
+        golem_id, golem = next((mid, m) for mid, m in game_server.monsters.items() if mid.startswith("Golem_crystal"))
+        wounded_id, wounded = next((mid, m) for mid, m in game_server.monsters.items()
+                                   if mid.startswith("Golem_crystal") and mid != golem_id)
+
+        # Personne dans le cristal : le respawn attend, la régénération ne touche pas la zone
+        golem.alive = False
+        game_server.monster_respawn_due(golem_id)
+        assert game_server.monsters[golem_id] is golem and not golem.alive
+        assert game_server.zones.deferred == {"crystal": [golem_id]}
+
+        wounded.hp = 5
+        table = game_server.monsters.table
+        table.columns['last_hit'][table.row_of[wounded_id]] = 0.0
+        assert game_server.regenerate_monsters() == [] and wounded.hp == 5
+
+        # Un joueur arrive : la zone se réveille et rattrape ce qui était dû
+        since = game_server.zones.dormant_since["crystal"]
+        game_server.players["player_0"] = server.Player(id="player_0", name="Alice", x=golem.home_x, y=golem.home_y,
+                                                        hp=100_000, socket=Mock())
+        woken = dict(game_server.zones.update(game_server.players.values()))
+        assert woken["crystal"] == since
+        respawned, healed = game_server.wake_zone("crystal", since, now=since + 20.0)
+        assert respawned == [golem_id] and game_server.monsters[golem_id].alive
+        periods = int(20.0 // config.REGEN_INTERVAL)
+        assert healed == [wounded_id] and wounded.hp == min(wounded.max_hp, 5 + periods * config.MONSTER_REGEN_AMOUNT)
+        assert table.get(wounded_id, 'hp') == wounded.hp
+
+        # Zone observée : la régénération périodique reprend
+        wounded.hp = 5
+        table.columns['last_hit'][table.row_of[wounded_id]] = time.time() - config.MONSTER_REGEN_DELAY - 1
+        assert wounded_id in game_server.regenerate_monsters()
+    finally:
+        config.MONSTER_REGEN_ENABLED = enabled
+    print(f"    ✅ 1 respawn rattrapé, +{periods * config.MONSTER_REGEN_AMOUNT} HP de régénération rattrapés")
+    return True
+
+
+def test_respawn_zone_is_spawn_zone():
+    """Un monstre mort hors de sa zone (poursuite) réapparaît selon la zone de sa règle"""
+    print("🧪 Test: Zone de respawn")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    golem_id, golem = next((mid, m) for mid, m in game_server.monsters.items() if mid.startswith("Golem_crystal"))
+    game_server.players["player_0"] = server.Player(id="player_0", name="Alice", x=golem.home_x, y=golem.home_y,
+                                                    hp=100_000, socket=Mock())
+    game_server.zones.update(game_server.players.values())
+    assert game_server.zones.is_active("crystal")
+
+    golem.x, golem.y = 100, 100  # Mort dans les plaines, où personne ne regarde
+    assert not game_server.zones.is_active(game_server.zones.zone_of(golem.x, golem.y))
+    golem.alive = False
+    game_server.monster_respawn_due(golem_id)
+    assert game_server.zones.deferred == {} and game_server.monsters[golem_id].alive
+    print("    ✅ Respawn immédiat dans la zone observée de sa règle")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_observed_zones, test_dormant_zone_catches_up, test_respawn_zone_is_spawn_zone]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test de l'expiration des objets au sol et de leur partition par instance
+"""
+
+import sys
+import time
+from unittest.mock import Mock
+
+sys.path.append('.')
+
+
+def test_buckets_expire_in_order():
+    """Les clés expirent avec leur tranche, jamais avant leur heure"""
+    print("🧪 Test: Tranches d'expiration")
+
+    from expiry import ExpiryBuckets
+
+    buckets = ExpiryBuckets(bucket_seconds=1.0)
+    buckets.add("a", 10.2)
+    buckets.add("b", 10.9)
+    buckets.add("c", 12.5)
+    buckets.add("gone", 11.0)
+    buckets.discard("gone")
+    assert len(buckets) == 3
+
+    assert buckets.pop_expired(10.5) == [], "Rien n'expire avant la fin de la tranche"
+    assert sorted(buckets.pop_expired(11.0)) == ["a", "b"]
+    assert buckets.pop_expired(12.9) == []
+    assert buckets.pop_expired(5000.0) == ["c"], "Un long saut vide les tranches restantes"
+    assert len(buckets) == 0 and buckets.next_bucket is None
+    print("    ✅ Expiration par tranche, sans avance")
+    return True
+
+
+def test_drops_expire_and_stay_in_their_instance():
+    """Objets au sol : expiration, snapshots par instance, ramassage dans son instance"""
+    print("🧪 Test: Objets au sol par instance")
+
+    import config
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    now = time.time()
+    world_drop = server.DroppedItem("drop_w", "health_potion", 100, 100, now)
+    dungeon_drop = server.DroppedItem("drop_d", "health_potion", 100, 100, now, dungeon_instance="dungeon_instance_5")
+    game_server.add_dropped_item(world_drop)
+    game_server.add_dropped_item(dungeon_drop)
+    game_server.dungeon_instances["dungeon_instance_5"] = server.DungeonInstance("dungeon_instance_5", "goblin_cave")
+
+    world = game_server.create_world_game_state()
+    dungeon = game_server.create_dungeon_game_state("dungeon_instance_5")
+    assert list(world['dropped_items']) == ["drop_w"]
+    assert list(dungeon['dropped_items']) == ["drop_d"]
+
+    # Un joueur du monde ne ramasse pas l'objet du donjon, même à la même position
+    player = server.Player(id="player_0", name="Alice", x=100, y=100, socket=Mock())
+    game_server.pickup_item(player, "drop_d")
+    assert "drop_d" in game_server.dropped_items
+    game_server.pickup_item(player, "drop_w")
+    assert "drop_w" not in game_server.dropped_items and "drop_w" not in game_server.drop_expiry
+
+    assert game_server.expire_dropped_items(now + config.DROPPED_ITEM_LIFETIME - 1) == []
+    expired = game_server.expire_dropped_items(now + config.DROPPED_ITEM_LIFETIME + config.DROPPED_ITEM_EXPIRY_BUCKET)
+    assert expired == ["drop_d"] and not game_server.dropped_items
+    print("    ✅ Snapshots limités à l'instance, objets expirés retirés")
+    return True
+
+
+def test_instance_teardown_removes_its_drops():
+    """La suppression d'une instance emporte ses objets au sol"""
+    print("🧪 Test: Objets au sol d'une instance supprimée")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    game_server.dungeon_instances["dungeon_instance_2"] = server.DungeonInstance("dungeon_instance_2", "goblin_cave")
+    for i in range(3):
+        game_server.add_dropped_item(server.DroppedItem(f"drop_{i}", "health_potion", 10, 10, time.time(),
+                                                        dungeon_instance="dungeon_instance_2"))
+    game_server.add_dropped_item(server.DroppedItem("drop_world", "health_potion", 10, 10, time.time()))
+
+    game_server.remove_dungeon_instance("dungeon_instance_2")
+    assert list(game_server.dropped_items) == ["drop_world"]
+    assert len(game_server.drop_expiry) == 1
+    print("    ✅ Seul l'objet du monde reste")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_buckets_expire_in_order, test_drops_expire_and_stay_in_their_instance,
+             test_instance_teardown_removes_its_drops]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test de l'encodage unique des snapshots (mêmes octets pour tous les destinataires)
+"""
+
+import sys
+
+sys.path.append('.')
+
+
+class RecordingConnection:
+    """Connexion factice qui garde les octets envoyés"""
+
+    def __init__(self, snapshot_format="json"):
+        self.wire_format = "framed"
+        self.snapshot_format = snapshot_format
+        self.snapshot_history = None
+        self.snapshots = []
+
+    def send(self, data):
+        return len(data)
+
+    def send_snapshot(self, data):
+        self.snapshots.append(data)
+        return len(data)
+
+    def close(self):
+        pass
+
+
+def join(game_server, name, snapshot_format="json"):
+    connection = RecordingConnection(snapshot_format)
+    game_server.process_message(connection, {'type': 'join', 'name': name, 'snapshot_format': snapshot_format})
+    player = game_server.clients[connection]
+    player.x, player.y = 1600, 1200
+    return connection
+
+
+def test_same_bytes_for_all_recipients():
+    """Un snapshot est encodé une fois et le même objet bytes part à chaque client"""
+    print("🧪 Test: Un encodage par snapshot")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    connections = [join(game_server, f"Bot{i}") for i in range(5)]
+
+    game_server.send_instance_specific_game_states()
+    stats = game_server.get_encode_stats()['last_tick']
+    assert stats['tick'] == game_server.tick
+    assert stats['encodes'] == 1, f"Un seul encodage attendu, {stats['encodes']} faits"
+    assert stats['reused'] == 4, f"Quatre réutilisations attendues: {stats}"
+    assert stats['bytes_saved'] == 4 * stats['bytes_encoded']
+
+    first = connections[0].snapshots[-1]
+    assert all(c.snapshots[-1] is first for c in connections), "Les clients doivent partager les mêmes octets"
+    print(f"    ✅ {stats['bytes_saved']} octets d'encodage évités sur ce tick")
+    return True
+
+
+def test_one_encode_per_format():
+    """Clients JSON et binaires : un encodage par format"""
+    print("🧪 Test: Un encodage par format")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    json_clients = [join(game_server, f"Json{i}") for i in range(3)]
+    binary_clients = [join(game_server, f"Bin{i}", "binary") for i in range(3)]
+
+    game_server.send_instance_specific_game_states()
+    stats = game_server.get_encode_stats()['last_tick']
+    assert stats['encodes'] == 2, f"Deux encodages attendus (JSON + binaire): {stats}"
+    assert json_clients[0].snapshots[-1] is not binary_clients[0].snapshots[-1]
+    assert binary_clients[1].snapshots[-1] is binary_clients[2].snapshots[-1]
+
+    game_server.send_instance_specific_game_states()
+    totals = game_server.get_encode_stats()['total']
+    assert totals['encodes'] == 4 and totals['reused'] == 8, f"Cumul inattendu: {totals}"
+    print("    ✅ Un encodage par format et par tick")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_same_bytes_for_all_recipients, test_one_encode_per_format]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
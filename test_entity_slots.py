@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test des entités à __slots__ (Player, Monster, DroppedItem)
+"""
+
+import sys
+import time
+
+sys.path.append('.')
+
+
+def test_entities_have_no_dict():
+    """Pas de __dict__ par entité, dungeon_instance déclaré partout"""
+    print("🧪 Test: Entités compactes")
+
+    import server
+
+    player = server.Player(id="player_0", name="Alice")
+    monster = server.Monster(id="m", x=1, y=2, hp=10, max_hp=10, attack=1, defense=0, xp_reward=1)
+    drop = server.DroppedItem("drop_0", "health_potion", 5, 5, time.time())
+    for entity in (player, monster, drop):
+        assert not hasattr(entity, '__dict__'), f"{type(entity).__name__} a encore un __dict__"
+    assert player.dungeon_instance == "" and monster.dungeon_instance == ""
+
+    # Une faute de frappe ne crée plus d'attribut fantôme
+    try:
+        monster.dungeon_instanse = "dungeon_instance_1"
+        assert False, "L'attribut inconnu aurait dû être refusé"
+    except AttributeError:
+        pass
+    print("    ✅ Attributs déclarés seulement, dungeon_instance vide par défaut")
+    return True
+
+
+def test_monster_store_after_slots():
+    """Les monstres à __slots__ restent synchronisés avec leur table"""
+    print("🧪 Test: Table des monstres avec __slots__")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    monster_id, monster = next(iter(game_server.monsters.items()))
+    assert monster.store is game_server.monsters
+    monster.hp = 1
+    assert game_server.monsters.table.get(monster_id, 'hp') == 1
+    print("    ✅ Affectations recopiées dans la table")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_entities_have_no_dict, test_monster_store_after_slots]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test du découpage des messages : frames à préfixe de longueur et repli JSON par lignes
+"""
+
+import json
+import socket
+import sys
+import threading
+import time
+
+sys.path.append('.')
+
+
+def test_framed_fragmented_input():
+    """Des frames reçues octet par octet sont reconstituées correctement"""
+    print("🧪 Test: Frames fragmentées")
+
+    from framing import CLIENT_HELLO, WIRE_FRAMED, FrameDecoder, encode_message
+
+    messages = [{'type': 'join', 'name': 'A{}}"{'}, {'type': 'move', 'x': 1.5, 'y': 2}]
+    stream = CLIENT_HELLO + b"".join(encode_message(m, WIRE_FRAMED) for m in messages)
+
+    decoder = FrameDecoder(capacity=16)
+    received = []
+    for i in range(len(stream)):
+        decoder.feed(stream[i:i + 1])
+        received.extend(decoder.messages())
+
+    assert decoder.mode == WIRE_FRAMED, f"Mode attendu framed, trouvé {decoder.mode}"
+    assert received == messages, f"Messages inattendus: {received}"
+    print("    ✅ Accolades dans les chaînes et fragmentation gérées")
+    return True
+
+
+def test_large_frame_growth():
+    """Une frame plus grande que le tampon initial fait grandir le tampon"""
+    print("🧪 Test: Frame plus grande que le tampon")
+
+    from framing import WIRE_FRAMED, FrameDecoder, encode_message
+
+    big = {'type': 'game_state', 'monsters': {f"m{i}": {'x': i, 'y': i} for i in range(5000)}}
+    data = encode_message(big, WIRE_FRAMED)
+    decoder = FrameDecoder(capacity=1024, mode=WIRE_FRAMED)
+    received = []
+    for offset in range(0, len(data), 1500):
+        decoder.feed(data[offset:offset + 1500])
+        received.extend(decoder.messages())
+    assert received == [big], "La grande frame n'a pas été reconstituée"
+    print(f"    ✅ Frame de {len(data)} octets reconstituée")
+    return True
+
+
+def test_json_lines_fallback():
+    """Repli historique : lignes JSON et objets envoyés sans saut de ligne"""
+    print("🧪 Test: Repli JSON par lignes")
+
+    from framing import WIRE_JSON_LINES, FrameDecoder
+
+    decoder = FrameDecoder()
+    decoder.feed(b'{"type": "join", "name": "}{"}\n{"type": "move", "x": 1}')
+    first = list(decoder.messages())
+    assert decoder.mode == WIRE_JSON_LINES
+    assert [m['type'] for m in first] == ['join', 'move'], f"Messages inattendus: {first}"
+
+    # Deux objets collés, coupés au milieu
+    decoder.feed(b'{"type": "a"}{"type": "b", "v": {"n"')
+    assert list(decoder.messages()) == [], "Rien ne doit sortir tant que le second objet est incomplet"
+    decoder.feed(b': 1}}')
+    remaining = [m['type'] for m in decoder.messages()]
+    assert remaining == ['a', 'b'], f"Objets collés non reconstitués: {remaining}"
+    print("    ✅ Anciens scripts de test toujours compris")
+    return True
+
+
+def test_json_lines_limits():
+    """Objets collés consommés au fur et à mesure ; ligne sans fin refusée"""
+    print("🧪 Test: Limites du repli JSON par lignes")
+
+    import framing
+    from framing import FrameDecoder, FrameError
+
+    decoder = FrameDecoder()
+    decoder.feed(b'{"type": "a"} {"type": "b", "v": {"n": 1}')
+    assert [m['type'] for m in decoder.messages()] == ['a'], "Le premier objet complet sort tout de suite"
+    assert bytes(decoder.view[decoder.start:decoder.end]).lstrip() == b'{"type": "b", "v": {"n": 1}'
+    decoder.feed(b'}')
+    assert [m['type'] for m in decoder.messages()] == ['b']
+
+    limit = framing.MAX_FRAME_SIZE
+    framing.MAX_FRAME_SIZE = 1024
+    try:
+        for data in (b'{"type": "move", "pad": "' + b'x' * 2000,  # Jamais de saut de ligne
+                     b'{"pad": "' + b'x' * 2000 + b'"}\n'):  # Ligne complète mais trop grande
+            decoder = FrameDecoder(capacity=256)
+            try:
+                for offset in range(0, len(data), 100):
+                    decoder.feed(data[offset:offset + 100])
+                    list(decoder.messages())
+            except FrameError:
+                continue
+            raise AssertionError("Une ligne trop grande aurait dû être refusée")
+    finally:
+        framing.MAX_FRAME_SIZE = limit
+    print("    ✅ Reprise après le dernier objet lu, MAX_FRAME_SIZE appliqué aux lignes")
+    return True
+
+
+def test_server_negotiation():
+    """Le serveur répond en frames à un client framed et en lignes à un ancien client"""
+    print("🧪 Test: Négociation du format avec le serveur")
+
+    import server
+    from framing import CLIENT_HELLO, WIRE_FRAMED, FrameDecoder, encode_message
+
+    game_server = server.GameServer("localhost", 0)
+    game_server.socket.bind(("localhost", 0))
+    port = game_server.socket.getsockname()[1]
+    game_server.socket.listen(8)
+
+    def accept_loop():
+        while game_server.running:
+            try:
+                client_socket, _ = game_server.socket.accept()
+            except OSError:
+                break
+            threading.Thread(target=game_server.handle_client, args=(client_socket,), daemon=True).start()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+
+    framed = socket.create_connection(("localhost", port), timeout=3.0)
+    legacy = socket.create_connection(("localhost", port), timeout=3.0)
+    try:
+        framed.sendall(CLIENT_HELLO + encode_message({'type': 'join', 'name': 'Framed'}, WIRE_FRAMED))
+        decoder = FrameDecoder(mode=WIRE_FRAMED)
+        joined = None
+        deadline = time.time() + 3.0
+        while joined is None and time.time() < deadline:
+            decoder.recv_into(framed)
+            for message in decoder.messages():
+                if message['type'] == 'joined':
+                    joined = message
+        assert joined is not None, "Le client framed n'a pas reçu 'joined'"
+        print("    ✅ Client framed compris")
+
+        legacy.send(json.dumps({'type': 'join', 'name': 'Legacy'}).encode())
+        line = legacy.recv(65536).split(b"\n", 1)[0]
+        assert json.loads(line)['type'] == 'joined', "L'ancien client devrait recevoir du JSON par lignes"
+        print("    ✅ Ancien client toujours servi en JSON par lignes")
+    finally:
+        framed.close()
+        legacy.close()
+        game_server.stop_server()
+
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_framed_fragmented_input, test_large_frame_growth,
+             test_json_lines_fallback, test_json_lines_limits, test_server_negotiation]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
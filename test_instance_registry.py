@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test des registres de monstres par instance de donjon
+"""
+
+import sys
+from unittest.mock import Mock
+
+sys.path.append('.')
+
+
+def make_server_with_dungeon():
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    player = server.Player(id="player_0", name="Alice", level=10, socket=Mock())
+    game_server.players[player.id] = player
+    game_server.enter_dungeon(player, "goblin_cave")
+    return game_server, player
+
+
+def test_registry_owns_instance_monsters():
+    """Le registre de l'instance rattache ses monstres ; le monde ne les voit jamais"""
+    print("🧪 Test: Registre de l'instance")
+
+    import server
+
+    game_server, player = make_server_with_dungeon()
+    instance = game_server.dungeon_instances[player.dungeon_instance]
+    assert len(instance.monsters) == 5
+    assert all(m.dungeon_instance == instance.instance_id for m in instance.monsters.values())
+
+    # Un monstre ajouté au registre sans instance est rattaché au donjon
+    extra = server.Monster(id="extra", x=10, y=10, hp=5, max_hp=5, attack=1, defense=0, xp_reward=1)
+    instance.monsters["extra"] = extra
+    game_server.monsters["extra"] = extra
+    assert extra.dungeon_instance == instance.instance_id
+
+    world = game_server.create_world_game_state()
+    assert not set(instance.monsters) & set(world['monsters']), "Monstres de donjon visibles dans le monde"
+    dungeon = game_server.create_dungeon_game_state(instance.instance_id)
+    assert set(dungeon['monsters']) == set(instance.monsters)
+    print("    ✅ Monstres du donjon isolés du monde")
+    return True
+
+
+def test_teardown_leaves_world_untouched():
+    """Le départ du dernier joueur retire l'instance et ses monstres, serviteurs compris"""
+    print("🧪 Test: Suppression d'une instance")
+
+    import server
+
+    game_server, player = make_server_with_dungeon()
+    instance_id = player.dungeon_instance
+    instance = game_server.dungeon_instances[instance_id]
+
+    boss = next(iter(instance.monsters.values()))
+    boss.boss_abilities = ["summon_minions"]
+    game_server.use_boss_ability(boss, player)
+    assert len(instance.monsters) == 7, "Les serviteurs rejoignent le registre de l'instance"
+
+    world_before = {mid for mid, _ in game_server.monsters.instance_items('')}
+    game_server.leave_dungeon(player)
+    assert instance_id not in game_server.dungeon_instances
+    assert instance_id not in game_server.monsters.instance_ids()
+    assert not any(mid.startswith(instance_id) for mid in game_server.monsters)
+    assert {mid for mid, _ in game_server.monsters.instance_items('')} == world_before
+    assert game_server.cleanup_orphaned_dungeon_monsters() == [], "Plus rien à nettoyer"
+    print("    ✅ Instance supprimée sans orphelins, monde inchangé")
+    return True
+
+
+def test_dungeon_monster_respawn_does_not_leak():
+    """Un monstre de donjon tué ne réapparaît pas dans le monde"""
+    print("🧪 Test: Pas de respawn de donjon dans le monde")
+
+    import config
+
+    game_server, player = make_server_with_dungeon()
+    player.attack = 10_000
+    instance_id = player.dungeon_instance
+    monster = next(iter(game_server.dungeon_instances[instance_id].monsters.values()))
+    monster.x, monster.y = player.x, player.y
+    game_server.handle_combat(player, monster)
+    assert not monster.alive
+
+    game_server.leave_dungeon(player)
+    for _ in range(11 * config.GAME_UPDATE_RATE):
+        game_server.timers.advance()
+    assert monster.id not in game_server.monsters, "Le respawn a recréé un monstre de donjon"
+    print("    ✅ Aucun monstre de donjon recréé après la fermeture de l'instance")
+    return True
+
+
+def test_orphan_sweep_scheduled():
+    """La boucle balaie les monstres d'instances disparues toutes les ORPHAN_SWEEP_INTERVAL secondes"""
+    print("🧪 Test: Balayage périodique des orphelins")
+
+    import config
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    game_server.run_tick()
+    orphan = server.Monster(id="orphan", x=10, y=10, hp=5, max_hp=5, attack=1, defense=0, xp_reward=1)
+    orphan.dungeon_instance = "dungeon_instance_404"
+    game_server.monsters["orphan"] = orphan
+    for _ in range(config.ORPHAN_SWEEP_INTERVAL * config.GAME_UPDATE_RATE - 1):
+        game_server.run_tick()
+    assert "orphan" in game_server.monsters, "Balayé avant l'intervalle"
+    game_server.run_tick()
+    assert "orphan" not in game_server.monsters
+    print("    ✅ Orphelin retiré au balayage suivant")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_registry_owns_instance_monsters, test_teardown_leaves_world_untouched,
+             test_dungeon_monster_respawn_does_not_leak, test_orphan_sweep_scheduled]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
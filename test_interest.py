@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test du filtrage par zone d'intérêt des snapshots du monde
+"""
+
+import json
+import sys
+
+sys.path.append('.')
+
+
+class RecordingConnection:
+    """Connexion factice qui garde les messages envoyés"""
+
+    def __init__(self):
+        self.wire_format = "json_lines"
+        self.snapshot_format = "json"
+        self.snapshot_history = None
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(json.loads(data))
+        return len(data)
+
+    send_snapshot = send
+
+    def close(self):
+        pass
+
+    def last(self, msg_type):
+        for message in reversed(self.sent):
+            if message['type'] == msg_type:
+                return message
+        return None
+
+
+def make_server():
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    game_server.monsters.clear()
+    for monster_id, x, y in (("near", 1700, 1200), ("far", 2600, 1200), ("outside", 3150, 2350)):
+        game_server.monsters[monster_id] = server.Monster(
+            id=monster_id, x=x, y=y, hp=50, max_hp=50, attack=5, defense=2, xp_reward=10)
+    return game_server
+
+
+def join(game_server, name):
+    connection = RecordingConnection()
+    game_server.process_message(connection, {'type': 'join', 'name': name})
+    player = game_server.clients[connection]
+    player.x, player.y = 1600, 1200
+    return connection, player
+
+
+def test_near_far_and_outside():
+    """Proche à chaque tick, lointain au rythme réduit, hors zone jamais"""
+    print("🧪 Test: Anneaux proche et lointain")
+
+    import config
+
+    game_server = make_server()
+    connection, _ = join(game_server, "Alice")
+
+    game_server.send_instance_specific_game_states()
+    state = connection.last('game_state')
+    assert set(state['monsters']) == {"near", "far"}, f"Monstres visibles inattendus: {set(state['monsters'])}"
+
+    game_server.monsters["near"].hp = 40
+    game_server.monsters["far"].hp = 40
+    # Avancer jusqu'au tick précédant le prochain rafraîchissement lointain
+    while (game_server.tick + 1) % config.INTEREST_FAR_INTERVAL != 0:
+        game_server.send_instance_specific_game_states()
+        state = connection.last('game_state')
+        assert state['monsters']["near"]['hp'] == 40, "Le monstre proche est à jour à chaque tick"
+        assert state['monsters']["far"]['hp'] == 50, "Le monstre lointain attend le rafraîchissement"
+
+    game_server.send_instance_specific_game_states()
+    state = connection.last('game_state')
+    assert state['monsters']["far"]['hp'] == 40, "Le rafraîchissement lointain doit transmettre les HP"
+    print("    ✅ Proche à jour, lointain rafraîchi tous les "
+          f"{config.INTEREST_FAR_INTERVAL} ticks, hors zone exclu")
+    return True
+
+
+def test_enter_leave_events():
+    """Un joueur qui se déplace reçoit les entrées et sorties de sa zone"""
+    print("🧪 Test: Événements d'entrée/sortie")
+
+    game_server = make_server()
+    connection, player = join(game_server, "Bob")
+
+    game_server.send_instance_specific_game_states()
+    assert connection.last('interest_update') is None, "Pas d'événement pour la première vue"
+
+    player.x, player.y = 100, 100
+    game_server.send_instance_specific_game_states()
+    update = connection.last('interest_update')
+    assert update is not None, "Le déplacement doit produire un interest_update"
+    assert set(update['left']['monsters']) == {"near", "far"}, f"Sorties inattendues: {update['left']}"
+    assert "monsters" not in update['entered']
+
+    player.x, player.y = 3000, 1200
+    game_server.send_instance_specific_game_states()
+    update = connection.last('interest_update')
+    assert "outside" in update['entered']['monsters'], f"Entrées inattendues: {update['entered']}"
+    print("    ✅ Entrées et sorties signalées")
+    return True
+
+
+def test_shared_views():
+    """Les joueurs d'une même cellule reçoivent la même vue"""
+    print("🧪 Test: Vues partagées par cellule")
+
+    game_server = make_server()
+    first, _ = join(game_server, "Carol")
+    second, _ = join(game_server, "Dave")
+    lonely, lonely_player = join(game_server, "Eve")
+    lonely_player.x, lonely_player.y = 100, 100
+
+    with game_server.lock:
+        game_server.tick += 1
+        batches = game_server.build_instance_game_states()
+    (_, world_state, recipients), = batches
+    views, _ = game_server.interest.split(world_state, recipients)
+    assert len(views) == 2, f"Deux cellules occupées, {len(views)} vues construites"
+    sockets_by_view = sorted(len(sockets) for _, sockets in views)
+    assert sockets_by_view == [1, 2], f"Répartition inattendue: {sockets_by_view}"
+
+    game_server.send_instance_specific_game_states()
+    assert "Eve" not in [p['name'] for p in first.last('game_state')['players'].values()]
+    assert first.last('game_state') == second.last('game_state')
+    print("    ✅ Une vue par cellule occupée")
+    return True
+
+
+def test_far_ring_membership_is_current():
+    """Entre deux rafraîchissements, l'anneau lointain suit les morts, départs et éloignements"""
+    print("🧪 Test: Membres de l'anneau lointain à jour")
+
+    import config
+
+    game_server = make_server()
+    connection, _ = join(game_server, "Frank")
+    while game_server.tick % config.INTEREST_FAR_INTERVAL != config.INTEREST_FAR_INTERVAL - 2:
+        game_server.send_instance_specific_game_states()  # Rafraîchissement lointain encore loin
+
+    del game_server.monsters["far"]  # Retiré : disparaît tout de suite
+    game_server.monsters["near"].x = 2600  # Passe du proche au lointain : reste visible
+    game_server.send_instance_specific_game_states()
+    state = connection.last('game_state')
+    assert set(state['monsters']) == {"near"}, f"Monstres visibles inattendus: {set(state['monsters'])}"
+    update = connection.last('interest_update')
+    assert update is not None and update['left'] == {'monsters': ['far']} and not update['entered']
+    print("    ✅ Départ signalé aussitôt, entité éloignée toujours visible")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_near_far_and_outside, test_enter_leave_events, test_shared_views, test_far_ring_membership_is_current]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
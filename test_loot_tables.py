@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test des tables de butin (tirage par table d'alias)
+"""
+
+import random
+import sys
+from collections import Counter
+
+sys.path.append('.')
+
+
+def test_alias_matches_weights():
+    """Les fréquences tirées suivent les poids"""
+    print("🧪 Test: Table d'alias")
+
+    from loot import AliasTable
+
+    weights = {'a': 60, 'b': 25, 'c': 12, 'd': 2, 'e': 1}
+    table = AliasTable(list(weights.items()))
+    rng = random.Random(18)
+    draws = 200_000
+    counts = Counter(table.sample(rng) for _ in range(draws))
+    for value, weight in weights.items():
+        expected = weight / 100
+        observed = counts[value] / draws
+        assert abs(observed - expected) < 0.005, f"{value}: {observed:.4f} au lieu de {expected:.4f}"
+
+    assert AliasTable([('seul', 3)]).sample(rng) == 'seul'
+    try:
+        AliasTable([('zero', 0)])
+        assert False, "Une table sans poids doit être refusée"
+    except ValueError:
+        pass
+    print("    ✅ Fréquences conformes aux poids sur 200 000 tirages")
+    return True
+
+
+def test_server_loot_tables():
+    """Butin des monstres selon la rareté, butin des boss légendaire seulement"""
+    print("🧪 Test: Tables de butin du serveur")
+
+    import server
+    from loot import LootTables
+
+    game_server = server.GameServer("localhost", 0)
+    items = game_server.items
+    rng = random.Random(7)
+    loot = LootTables(items, rng=rng)
+
+    counts = Counter(items[loot.draw('monster')].rarity for _ in range(50_000))
+    assert abs(counts['common'] / 50_000 - 0.60) < 0.01
+    assert abs(counts['legendary'] / 50_000 - 0.01) < 0.003
+    assert all(items[loot.draw('boss')].rarity == 'legendary' for _ in range(1000))
+    assert loot.draw('inconnue') is None
+
+    # Recompilation quand le catalogue change
+    legendary = [item_id for item_id, item in items.items() if item.rarity == 'legendary']
+    loot.compile({item_id: item for item_id, item in items.items() if item_id not in legendary})
+    assert loot.draw('boss') is None, "Plus d'objet légendaire : pas de butin de boss"
+    assert game_server.select_random_item() in items
+    print("    ✅ Raretés respectées, tables recompilées avec le catalogue")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_alias_matches_weights, test_server_loot_tables]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
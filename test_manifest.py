@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test du manifeste statique envoyé au join
+"""
+
+import json
+import sys
+
+sys.path.append('.')
+
+
+class RecordingConnection:
+    """Connexion factice qui garde les messages envoyés"""
+
+    def __init__(self):
+        self.wire_format = "json_lines"
+        self.snapshot_format = "json"
+        self.snapshot_history = None
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(json.loads(data))
+        return len(data)
+
+    send_snapshot = send
+
+    def close(self):
+        pass
+
+    def of_type(self, msg_type):
+        return [message for message in self.sent if message['type'] == msg_type]
+
+
+def test_manifest_on_join():
+    """Le manifeste part au join avec donjons, objets, zones et classes"""
+    print("🧪 Test: Manifeste au join")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    connection = RecordingConnection()
+    game_server.process_message(connection, {'type': 'join', 'name': 'Alice'})
+
+    assert [m['type'] for m in connection.sent[:2]] == ['joined', 'manifest'], "joined puis manifeste"
+    manifest = connection.of_type('manifest')[0]
+    assert manifest['version'] == connection.of_type('joined')[0]['manifest_version']
+    assert set(manifest['dungeons']) == set(game_server.dungeons)
+    assert len(manifest['items']) == len(game_server.items)
+    assert len(manifest['zones']) == 9 and manifest['zones'][0]['name'] == 'plains'
+    assert manifest['class_stats'] == game_server.class_stats
+
+    # Un client qui a déjà cette version ne le reçoit pas
+    cached = RecordingConnection()
+    game_server.process_message(cached, {'type': 'join', 'name': 'Bob', 'manifest_version': manifest['version']})
+    assert not cached.of_type('manifest'), "Manifeste déjà en cache : pas de renvoi"
+    print(f"    ✅ Manifeste version {manifest['version']}, {len(manifest['items'])} objets")
+    return True
+
+
+def test_snapshots_reference_manifest():
+    """Les snapshots n'ont plus les donjons et les objets au sol sont des index"""
+    print("🧪 Test: Identifiants compacts dans les snapshots")
+
+    import server
+    from snapshot_codec import decode_snapshot, encode_snapshot
+
+    game_server = server.GameServer("localhost", 0)
+    game_server.dropped_items["drop_x"] = server.DroppedItem("drop_x", "crown_of_kings", 10, 20, 1700000000.0)
+    game_server.dropped_items["drop_y"] = server.DroppedItem("drop_y", "retired_item", 30, 40, 1700000000.0)
+    state = game_server.create_world_game_state()
+
+    assert 'dungeons' not in state, "Les portails sont dans le manifeste"
+    drop = state['dropped_items']["drop_x"]
+    assert set(drop) == {'drop_id', 'item', 'x', 'y', 'drop_time'}, f"Champs inattendus: {set(drop)}"
+    assert game_server.manifest['items'][drop['item']]['id'] == "crown_of_kings"
+    assert state['dropped_items']["drop_y"]['item'] is None, "Objet hors catalogue"
+
+    decoded = decode_snapshot(encode_snapshot(state))
+    assert decoded['dropped_items']["drop_x"]['item'] == drop['item']
+    assert decoded['dropped_items']["drop_y"]['item'] is None
+    print("    ✅ Objets au sol référencés par index du manifeste")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_manifest_on_join, test_snapshots_reference_manifest]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test de l'export des métriques au format Prometheus
+"""
+
+import sys
+import urllib.error
+import urllib.request
+from unittest.mock import Mock
+
+sys.path.append('.')
+
+
+def test_render_format():
+    """Jauges, compteurs par type de message et histogramme cumulé"""
+    print("🧪 Test: Format texte Prometheus")
+
+    from metrics import MAX_MESSAGE_TYPES, ServerMetrics
+
+    metrics = ServerMetrics()
+    metrics.publish({'clients': 2, 'players': {'world': 2}, 'monsters': {'world': 40, 'dungeon_1': 5},
+                     'dropped_items': {}, 'send_queue_max': 3, 'send_queue_total': 5, 'pending_timers': 7})
+    metrics.messages.record('in', 'move', 40)
+    metrics.messages.record('in', 'move', 60)
+    metrics.messages.record('out', 'game_state', 500)
+    for value in (0.0005, 0.004, 0.3):
+        metrics.tick_seconds.observe(value)
+
+    text = metrics.render()
+    for line in ('rpg_connected_clients 2',
+                 'rpg_monsters{instance="dungeon_1"} 5',
+                 'rpg_send_queue_max_depth 3',
+                 'rpg_send_queued_messages 5',
+                 'rpg_pending_timers 7',
+                 'rpg_messages_total{direction="in",type="move"} 2',
+                 'rpg_message_bytes_total{direction="in",type="move"} 100',
+                 'rpg_message_bytes_total{direction="out",type="game_state"} 500',
+                 'rpg_tick_duration_seconds_bucket{le="0.001"} 1',
+                 'rpg_tick_duration_seconds_bucket{le="0.005"} 2',
+                 'rpg_tick_duration_seconds_bucket{le="+Inf"} 3',
+                 'rpg_tick_duration_seconds_count 3'):
+        assert line in text.splitlines(), f"Ligne manquante : {line}"
+    assert "# TYPE rpg_tick_duration_seconds histogram" in text
+
+    # Types envoyés par les clients : cardinalité bornée
+    for i in range(MAX_MESSAGE_TYPES * 2):
+        metrics.messages.record('in', f"junk_{i}", 1)
+    assert len(metrics.messages.snapshot()) <= MAX_MESSAGE_TYPES + 1
+    print("    ✅ Jauges, compteurs et seaux cumulés conformes")
+    return True
+
+
+def test_server_metrics_without_lock():
+    """Le serveur publie ses jauges ; /metrics répond même pendant que le verrou est tenu"""
+    print("🧪 Test: Export HTTP sans le verrou du serveur")
+
+    import server
+    from metrics import MetricsExporter
+
+    game_server = server.GameServer("localhost", 0)
+    client_socket = Mock(spec=['send'])
+    player = server.Player(id="player_0", name="Alice", hp=100_000, socket=client_socket)
+    game_server.players[player.id] = player
+    game_server.clients[client_socket] = player
+    game_server.process_message(client_socket, {'type': 'ack', 'tick': 0}, 24)
+    for _ in range(3):
+        game_server.run_tick()
+
+    exporter = MetricsExporter(game_server.metrics, '127.0.0.1', 0)
+    port = exporter.start()
+    try:
+        with game_server.lock:  # Une boucle de jeu bloquée ne bloque pas le relevé
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+                text = response.read().decode('utf-8')
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=5)
+            assert False, "Seul /metrics est servi"
+        except urllib.error.HTTPError as e:
+            assert e.code == 404
+    finally:
+        exporter.stop()
+
+    lines = text.splitlines()
+    assert 'rpg_connected_clients 1' in lines and 'rpg_players{instance="world"} 1' in lines
+    assert any(line.startswith('rpg_monsters{instance="world"}') for line in lines)
+    assert 'rpg_messages_total{direction="in",type="ack"} 1' in lines
+    assert 'rpg_message_bytes_total{direction="in",type="ack"} 24' in lines
+    assert 'rpg_messages_total{direction="out",type="game_state"} 3' in lines
+    assert 'rpg_tick_duration_seconds_count 3' in lines
+    assert "# TYPE rpg_tick_phase_seconds summary" in lines
+    assert any(line.startswith('rpg_tick_phase_seconds{phase="ai",quantile="0.99"}') for line in lines)
+    assert 'rpg_tick_phase_seconds_count{phase="tick"} 3' in lines
+    assert any(line.startswith('rpg_tick_phase_seconds_sum{phase="ai"}') for line in lines)
+    assert not any('player=' in line for line in lines), "Pas de série par joueur"
+    assert any(line.startswith('rpg_tick_phase_max_seconds{phase="tick"}') for line in lines)
+    assert f"rpg_pending_timers {game_server.metrics.gauges['pending_timers']}" in lines
+    print(f"    ✅ {len(lines)} lignes servies sur le port {port}, verrou tenu")
+    return True
+
+
+def test_broadcasts_counted():
+    """Chaque broadcast compte un message sortant par destinataire, avec sa taille encodée"""
+    print("🧪 Test: Broadcasts comptés dans les métriques")
+
+    import server
+    from framing import WIRE_JSON_LINES, encode_message
+
+    game_server = server.GameServer("localhost", 0)
+    sockets = []
+    for i, instance in enumerate(("", "", "dungeon_1")):
+        client_socket = Mock(spec=['send'])
+        player = server.Player(id=f"player_{i}", name=f"P{i}", socket=client_socket)
+        player.dungeon_instance = instance
+        game_server.players[player.id] = player
+        game_server.clients[client_socket] = player
+        sockets.append(client_socket)
+
+    message = {'type': 'chat', 'text': 'Bonjour'}
+    size = len(encode_message(message, WIRE_JSON_LINES))
+    game_server.broadcast_message(message)
+    game_server.broadcast_to_instance({'type': 'boss_defeated'}, "dungeon_1")
+    traffic = game_server.metrics.messages.snapshot()
+    assert traffic[('out', 'chat')] == (3, 3 * size), traffic
+    assert traffic[('out', 'boss_defeated')][0] == 1
+    print(f"    ✅ {traffic[('out', 'chat')][0]} envois de {size} octets comptés")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_render_format, test_server_metrics_without_lock, test_broadcasts_counted]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
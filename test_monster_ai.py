@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test de l'IA des monstres (aggro, poursuite, attaque, leash, budget)
+"""
+
+import sys
+from unittest.mock import Mock
+
+sys.path.append('.')
+
+
+def make_arena():
+    """Serveur avec un joueur et un monstre seuls dans une instance de test"""
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    player = server.Player(id="player_0", name="Alice", x=500, y=500, hp=500, max_hp=500,
+                           socket=Mock(), dungeon_instance="arena")
+    monster = server.Monster(id="Loup_arena_0", x=600, y=500, hp=50, max_hp=50, attack=12, defense=2,
+                             xp_reward=10, dungeon_instance="arena")
+    game_server.players[player.id] = player
+    game_server.monsters[monster.id] = monster
+    return game_server, player, monster
+
+
+def run(game_server, seconds, start=0.0):
+    """Fait tourner l'IA seule, au rythme de la boucle de jeu"""
+    import config
+
+    steps = int(seconds * config.GAME_UPDATE_RATE)
+    for i in range(1, steps + 1):
+        game_server.ai.tick(start + i / config.GAME_UPDATE_RATE)
+    return start + steps / config.GAME_UPDATE_RATE
+
+
+def test_chase_attack_and_leash():
+    """Le monstre repère le joueur, le poursuit, l'attaque puis rentre chez lui"""
+    print("🧪 Test: Aggro, poursuite, attaque, leash")
+
+    from ai import ATTACK, IDLE
+
+    game_server, player, monster = make_arena()
+    now = run(game_server, 2.5)
+    assert monster.target_player == player.id and monster.ai_state == ATTACK
+    assert monster.x < 600, "Le monstre s'est rapproché"
+    assert game_server.monsters.table.get(monster.id, 'x') == monster.x, "La table suit les déplacements"
+    assert player.hp < 500, "Le monstre a attaqué"
+
+    # Le joueur s'enfuit hors du rayon de leash : le monstre abandonne et revient
+    player.x = 2000
+    game_server.players.relocate(player.id)
+    run(game_server, 10, now)
+    assert monster.ai_state == IDLE and monster.target_player is None
+    assert (round(monster.x), round(monster.y)) == (600, 500)
+    assert not game_server.ai.awake
+    print("    ✅ idle -> chase -> attack -> leash -> idle")
+    return True
+
+
+def test_cost_follows_players():
+    """Sans joueur, aucun monstre n'est examiné ; le budget plafonne le travail d'un tick"""
+    print("🧪 Test: Coût proportionnel aux joueurs")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    assert game_server.ai.tick(1.0) == 0, "Monde sans joueur : rien à faire"
+
+    for i in range(30):
+        game_server.monsters[f"pack_{i}"] = server.Monster(id=f"pack_{i}", x=100 + i, y=100, hp=10, max_hp=10,
+                                                           attack=1, defense=0, xp_reward=1,
+                                                           dungeon_instance="den")
+    game_server.players["player_0"] = server.Player(id="player_0", name="Bob", x=100, y=100, hp=1000,
+                                                    socket=Mock(), dungeon_instance="den")
+    game_server.ai.budget = 8
+    assert game_server.ai.tick(1.0) == 8
+    assert game_server.ai.tick(1.1) == 8
+    assert game_server.ai.deferred_total == 44
+    updated = [m for m in game_server.monsters.values() if m.ai_updated >= 0]
+    assert len(updated) == 16 and all(m.dungeon_instance == "den" for m in updated), \
+        "Les moins récemment mis à jour passent d'abord, seulement près du joueur"
+    print("    ✅ 0 monstre sans joueur, 8 par tick avec budget")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_chase_attack_and_leash, test_cost_follows_players]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
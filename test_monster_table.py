@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test de la table des monstres en colonnes
+"""
+
+import random
+import sys
+
+sys.path.append('.')
+
+
+def make_monster(monster_id, x, y, hp=100):
+    import server
+    return server.Monster(id=monster_id, x=x, y=y, hp=hp, max_hp=100, attack=10, defense=2, xp_reward=5)
+
+
+def backends():
+    """Colonnes en listes Python, puis NumPy s'il est installé"""
+    from monster_table import np
+    if np is None:
+        print("    ⏭️  NumPy absent : seules les listes Python sont testées")
+    return [False] if np is None else [False, True]
+
+
+def test_columns_follow_monsters():
+    """Les affectations sur les monstres sont recopiées dans les colonnes"""
+    print("🧪 Test: Colonnes synchronisées")
+
+    from monster_table import MonsterGrid
+
+    monsters = MonsterGrid(cell_size=100)
+    for i in range(5):
+        monsters[f"m{i}"] = make_monster(f"m{i}", 100 * i, 50)
+    table = monsters.table
+
+    monsters["m1"].hp -= 30
+    monsters["m3"].alive = False
+    monsters["m4"].dungeon_instance = "dungeon_instance_1"
+    monsters["m4"].x = 1000
+    assert table.get("m1", "hp") == 70 and table.get("m1", "last_hit") > 0
+    assert not table.get("m3", "alive")
+    assert table.within(1000, 50, 10, "dungeon_instance_1") == ["m4"]
+    assert monsters.query_radius(1000, 50, 10, "dungeon_instance_1") == [monsters["m4"]]
+
+    # Suppression : la dernière ligne prend la place libérée
+    removed = monsters.pop("m0")
+    assert removed.store is None and len(table) == 4
+    assert table.keys[table.row_of["m4"]] == "m4"
+    monsters["m4"].hp = 5
+    assert table.get("m4", "hp") == 5
+    print("    ✅ HP, mort, position et instance recopiés ; lignes stables après suppression")
+    return True
+
+
+def test_regenerate_out_of_combat():
+    """La régénération ne touche que les monstres vivants, blessés et hors combat"""
+    print("🧪 Test: Régénération en colonnes")
+
+    from monster_table import MonsterGrid
+
+    for use_numpy in backends():
+        monsters = MonsterGrid(use_numpy=use_numpy)
+        assert monsters.table.vectorized == use_numpy
+        monsters["calm"] = make_monster("calm", 0, 0, hp=50)
+        monsters["fighting"] = make_monster("fighting", 0, 0)
+        monsters["dead"] = make_monster("dead", 0, 0, hp=10)
+        monsters["full"] = make_monster("full", 0, 0)
+        monsters["nearly"] = make_monster("nearly", 0, 0, hp=99)
+        monsters["fighting"].hp -= 40
+        monsters["dead"].alive = False
+
+        healed = monsters.table.regenerate(amount=2, delay=5.0)
+        assert sorted(healed) == ["calm", "nearly"], f"Monstres soignés: {healed}"
+        assert monsters["calm"].hp == 52 and monsters["nearly"].hp == 100, "Les objets sont mis à jour"
+        assert monsters["fighting"].hp == 60 and monsters["dead"].hp == 10
+        assert monsters.table.get("calm", "hp") == 52
+        backend = "NumPy" if use_numpy else "listes Python"
+        print(f"    ✅ Seuls les monstres hors combat se régénèrent, sans dépasser leurs HP max ({backend})")
+    return True
+
+
+def test_server_regen_disabled_by_default():
+    """Sans MONSTER_REGEN_ENABLED, le serveur ne soigne pas les monstres"""
+    print("🧪 Test: Régénération des monstres désactivée par défaut")
+
+    import config
+    import server
+
+    assert not config.MONSTER_REGEN_ENABLED
+    game_server = server.GameServer("localhost", 0)
+    monster = next(iter(game_server.monsters.values()))
+    monster.hp = 5
+    table = game_server.monsters.table
+    table.columns['last_hit'][table.row_of[monster.store_key]] = 0.0
+    game_server.zones.active = {game_server.zones.zone_of(monster.x, monster.y)}
+    assert game_server.regenerate_monsters() == [] and monster.hp == 5
+    print("    ✅ HP inchangés")
+    return True
+
+
+def test_area_query_matches_grid():
+    """La recherche par zone en colonnes donne le même résultat que la grille"""
+    print("🧪 Test: Recherche par zone")
+
+    from monster_table import MonsterGrid
+
+    for use_numpy in backends():
+        rng = random.Random(14)
+        monsters = MonsterGrid(cell_size=128, use_numpy=use_numpy)
+        for i in range(300):
+            monster = make_monster(f"m{i}", rng.uniform(0, 3200), rng.uniform(0, 2400))
+            monster.dungeon_instance = "" if i % 3 else "dungeon_instance_7"
+            monsters[f"m{i}"] = monster
+
+        for _ in range(20):
+            x, y, radius = rng.uniform(0, 3200), rng.uniform(0, 2400), rng.uniform(50, 600)
+            for instance in ("", "dungeon_instance_7"):
+                from_grid = {m.id for m in super(MonsterGrid, monsters).query_radius(x, y, radius, instance)}
+                assert set(monsters.table.within(x, y, radius, instance)) == from_grid
+                assert {m.id for m in monsters.query_radius(x, y, radius, instance)} == from_grid
+        backend = "NumPy" if use_numpy else "listes Python"
+        print(f"    ✅ 40 requêtes identiques ({backend})")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_columns_follow_monsters, test_regenerate_out_of_combat, test_server_regen_disabled_by_default,
+             test_area_query_matches_grid]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test des files d'envoi par client (snapshots "dernier seulement", clients lents)
+"""
+
+import socket
+import sys
+import time
+
+sys.path.append('.')
+
+
+def test_snapshot_coalescing():
+    """Un snapshot en attente est remplacé par le suivant, les événements restent"""
+    print("🧪 Test: Coalescence des snapshots")
+
+    from network import OutboundQueue
+
+    queue = OutboundQueue(max_messages=10)
+    queue.put(b"event_1")
+    queue.put(b"snapshot_1", latest_only=True)
+    queue.put(b"event_2")
+    queue.put(b"snapshot_2", latest_only=True)
+    queue.put(b"snapshot_3", latest_only=True)
+
+    assert len(queue) == 3, f"3 messages en attente attendus, trouvé {len(queue)}"
+    batch = queue.get_batch()
+    assert batch == [b"event_1", b"event_2", b"snapshot_3"], f"Ordre inattendu: {batch}"
+    assert queue.dropped_frames == 2, f"2 frames perdues attendues, trouvé {queue.dropped_frames}"
+    assert len(queue) == 0, "La file devrait être vide"
+    print("    ✅ Seul le dernier snapshot est envoyé")
+
+    # Un flot de snapshots sans écrivain ne fait pas grossir la file
+    for i in range(1000):
+        queue.put(b"snapshot", latest_only=True)
+    assert len(queue) == 1 and len(queue.entries) <= queue.max_messages + 1, "La file ne doit pas grossir"
+    print("    ✅ Mémoire bornée pour un client bloqué")
+    return True
+
+
+def test_overflow():
+    """Trop de messages fiables en attente : la file signale le débordement"""
+    print("🧪 Test: Débordement de la file d'envoi")
+
+    from network import OutboundQueue
+
+    queue = OutboundQueue(max_messages=3)
+    results = [queue.put(b"event") for _ in range(4)]
+    assert results == [True, True, True, False], f"Résultats inattendus: {results}"
+    assert queue.overflowed, "La file devrait être marquée en débordement"
+    print("    ✅ Débordement détecté")
+    return True
+
+
+def test_slow_reader_does_not_block_tick():
+    """Un client qui ne lit plus ne bloque ni le tick ni le verrou du monde"""
+    print("🧪 Test: Client lent et verrou du monde")
+
+    import server
+    from network import SocketConnection
+
+    game_server = server.GameServer("localhost", 0)
+    server_side, client_side = socket.socketpair()
+    server_side.settimeout(30.0)
+    connection = SocketConnection(server_side, game_server)
+
+    try:
+        game_server.process_message(connection, {'type': 'join', 'name': 'Lent', 'class': 'Rogue'})
+
+        start = time.time()
+        for tick in range(300):
+            game_server.send_instance_specific_game_states()
+        elapsed = time.time() - start
+        print(f"    ⏱️  300 ticks en {elapsed:.2f}s sans lecture côté client")
+
+        assert not game_server.lock.locked(), "Le verrou du monde ne doit pas rester pris"
+        stats = game_server.get_send_queue_stats()
+        assert stats['connections'] == 1
+        assert stats['dropped_frames'] > 0, "Des snapshots auraient dû être remplacés"
+        assert stats['max_queue_depth'] <= 2, f"File trop profonde: {stats['max_queue_depth']}"
+        print(f"    ✅ {stats['dropped_frames']} snapshots remplacés, file max {stats['max_queue_depth']}")
+    finally:
+        connection.close()
+        client_side.close()
+
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_snapshot_coalescing, test_overflow, test_slow_reader_does_not_block_tick]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
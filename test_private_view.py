@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test de la séparation vue publique / vue privée des joueurs
+"""
+
+import json
+import sys
+
+sys.path.append('.')
+
+
+class RecordingConnection:
+    """Connexion factice qui garde les messages envoyés"""
+
+    def __init__(self):
+        self.wire_format = "json_lines"
+        self.snapshot_format = "json"
+        self.snapshot_history = None
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(json.loads(data))
+        return len(data)
+
+    send_snapshot = send
+
+    def close(self):
+        pass
+
+    def of_type(self, msg_type):
+        return [message for message in self.sent if message['type'] == msg_type]
+
+
+def test_snapshots_are_public():
+    """Les snapshots ne contiennent ni inventaire ni or ni progression"""
+    print("🧪 Test: Snapshots publics")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    alice = RecordingConnection()
+    bob = RecordingConnection()
+    game_server.process_message(alice, {'type': 'join', 'name': 'Alice'})
+    game_server.process_message(bob, {'type': 'join', 'name': 'Bob'})
+    game_server.clients[alice].gold = 500
+
+    game_server.send_instance_specific_game_states()
+    state = bob.of_type('game_state')[-1]
+    alice_id = game_server.clients[alice].id
+    public = state['players'][alice_id]
+    for field in ('inventory', 'equipped', 'gold', 'xp', 'skill_points'):
+        assert field not in public, f"{field} ne doit pas être diffusé"
+    assert {'x', 'y', 'hp', 'player_class', 'level'} <= public.keys()
+
+    privates = bob.of_type('player_private')
+    assert [p['player_id'] for p in privates] == [game_server.clients[bob].id], "Bob ne reçoit que sa vue privée"
+    print("    ✅ Inventaire et or d'Alice invisibles pour Bob")
+    return True
+
+
+def test_private_sent_on_change_only():
+    """La vue privée part au premier tick puis seulement quand elle change"""
+    print("🧪 Test: Vue privée envoyée sur changement")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    connection = RecordingConnection()
+    game_server.process_message(connection, {'type': 'join', 'name': 'Carol'})
+    player = game_server.clients[connection]
+
+    for _ in range(5):
+        game_server.send_instance_specific_game_states()
+    assert len(connection.of_type('player_private')) == 1, "Rien ne change : un seul envoi"
+
+    player.gold += 10
+    player.x += 5  # Public : ne déclenche pas d'envoi privé
+    game_server.send_instance_specific_game_states()
+    game_server.send_instance_specific_game_states()
+    privates = connection.of_type('player_private')
+    assert len(privates) == 2, f"Un envoi après le changement d'or, {len(privates)} au total"
+    assert privates[-1]['private']['gold'] == player.gold
+    assert 'inventory' in privates[-1]['private']
+
+    # L'envoi privé précède le snapshot du même tick
+    types = [m['type'] for m in connection.sent]
+    first_private = types.index('player_private')
+    assert 'game_state' not in types[:first_private], "La vue privée doit arriver avant le premier snapshot"
+    print("    ✅ Un envoi par changement de la vue privée")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_snapshots_are_public, test_private_sent_on_change_only]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
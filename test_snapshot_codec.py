@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test du codec binaire des game_state
+"""
+
+import json
+import sys
+
+sys.path.append('.')
+
+
+def build_world_state():
+    """Game state du monde avec un joueur équipé et un objet au sol"""
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    player = server.Player(id="player_0", name="Élodie", player_class="Rogue", x=1234.56, y=78.9)
+    player.inventory["health_potion"] = server.ItemStack(item=game_server.items["health_potion"], quantity=7)
+    player.equipped["weapon"] = game_server.items["shadow_blade"]
+    player.gold = 42
+    game_server.players[player.id] = player
+    game_server.drop_item(500, 600)
+    game_server.dropped_items["drop_x"] = server.DroppedItem("drop_x", "crown_of_kings", 10.5, 20.25, 1700000000.5)
+    # Monstre blessé au-delà de la mort (HP négatifs)
+    next(iter(game_server.monsters.values())).hp = -7
+    return game_server.create_world_game_state()
+
+
+def test_round_trip():
+    """Le décodage rend la structure JSON (positions quantifiées au 1/16e)"""
+    print("🧪 Test: Aller-retour du codec binaire")
+
+    from snapshot_codec import POSITION_SCALE, decode_snapshot, encode_snapshot
+
+    state = build_world_state()
+    decoded = decode_snapshot(memoryview(encode_snapshot(state)))
+
+    assert decoded.keys() == state.keys(), "Mêmes tables attendues"
+    for table in ('players', 'monsters', 'dropped_items'):
+        assert decoded[table].keys() == state[table].keys(), f"Identifiants différents dans {table}"
+        for entity_id, original in state[table].items():
+            copy = decoded[table][entity_id]
+            assert copy.keys() == original.keys(), f"Champs différents pour {entity_id}"
+            for key, value in original.items():
+                if key in ('x', 'y'):
+                    assert abs(copy[key] - value) <= 1 / POSITION_SCALE, f"{entity_id}.{key}: {copy[key]} != {value}"
+                elif key == 'critical_chance':
+                    assert abs(copy[key] - value) < 1e-4
+                else:
+                    assert copy[key] == value, f"{entity_id}.{key}: {copy[key]} != {value}"
+
+    print(f"    ✅ {len(state['monsters'])} monstres et accents préservés")
+    return True
+
+
+def test_smaller_than_json():
+    """Le snapshot binaire est nettement plus petit que le JSON"""
+    print("🧪 Test: Taille binaire vs JSON")
+
+    from snapshot_codec import encode_snapshot
+
+    state = build_world_state()
+    json_size = len(json.dumps(state).encode('utf-8'))
+    binary_size = len(encode_snapshot(state))
+    print(f"    📏 JSON: {json_size} octets, binaire: {binary_size} octets")
+    assert binary_size * 2 < json_size, "Le binaire devrait faire moins de la moitié du JSON"
+    print("    ✅ Gain de taille confirmé")
+    return True
+
+
+def test_unknown_schema_rejected():
+    """Un identifiant de schéma inconnu est refusé"""
+    print("🧪 Test: Schéma inconnu")
+
+    from snapshot_codec import decode_snapshot, encode_snapshot
+
+    data = bytearray(encode_snapshot(build_world_state()))
+    data[0] = 99
+    try:
+        decode_snapshot(data)
+    except ValueError:
+        print("    ✅ Schéma inconnu refusé")
+        return True
+    raise AssertionError("Un schéma inconnu aurait dû être refusé")
+
+
+def test_long_name_truncated_on_character():
+    """Un nom non ASCII trop long est tronqué sans couper un caractère"""
+    print("🧪 Test: Troncature d'un nom non ASCII")
+
+    from snapshot_codec import decode_snapshot, encode_snapshot
+
+    state = build_world_state()
+    name = "É" + "の騎士" * 40  # 362 octets : la coupure à 255 tombe au milieu d'un caractère
+    state['players']['player_0']['name'] = name
+    decoded = decode_snapshot(memoryview(encode_snapshot(state)))
+    copy = decoded['players']['player_0']['name']
+    assert name.startswith(copy) and 252 < len(copy.encode('utf-8')) <= 255
+    print(f"    ✅ {len(copy)} caractères gardés ({len(copy.encode('utf-8'))} octets)")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_round_trip, test_smaller_than_json, test_unknown_schema_rejected,
+             test_long_name_truncated_on_character]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test de l'index spatial (grille uniforme par instance)
+"""
+
+import random
+import sys
+
+sys.path.append('.')
+
+
+class Entity:
+    """Entité minimale : position et instance"""
+
+    def __init__(self, entity_id, x, y, dungeon_instance=""):
+        self.id = entity_id
+        self.x = x
+        self.y = y
+        self.dungeon_instance = dungeon_instance
+        self.alive = True
+
+
+def test_queries_match_brute_force():
+    """Rayon, rectangle et k plus proches donnent le même résultat qu'un parcours complet"""
+    print("🧪 Test: Requêtes contre parcours complet")
+
+    from spatial import SpatialGrid
+
+    rng = random.Random(13)
+    grid = SpatialGrid(cell_size=100)
+    for i in range(500):
+        instance = "" if i % 5 else "dungeon_instance_1"
+        grid[f"e{i}"] = Entity(f"e{i}", rng.uniform(0, 3200), rng.uniform(0, 2400), instance)
+
+    world = [e for e in grid.values() if not e.dungeon_instance]
+    for _ in range(20):
+        x, y = rng.uniform(0, 3200), rng.uniform(0, 2400)
+        expected = {e.id for e in world if (e.x - x) ** 2 + (e.y - y) ** 2 <= 250 ** 2}
+        assert {e.id for e in grid.query_radius(x, y, 250)} == expected
+
+        expected = {e.id for e in world if x <= e.x <= x + 400 and y <= e.y <= y + 150}
+        assert {e.id for e in grid.query_rect(x, y, x + 400, y + 150)} == expected
+
+        expected = sorted(world, key=lambda e: (e.x - x) ** 2 + (e.y - y) ** 2)[:5]
+        assert [e.id for e in grid.nearest(x, y, 5)] == [e.id for e in expected]
+
+    dungeon = grid.nearest(0, 0, 1000, instance="dungeon_instance_1")
+    assert len(dungeon) == 100 and all(e.dungeon_instance for e in dungeon)
+    print("    ✅ 60 requêtes identiques au parcours complet, instances séparées")
+    return True
+
+
+def test_index_follows_moves_and_removals():
+    """relocate, suppression et remplacement tiennent la grille à jour"""
+    print("🧪 Test: Déplacements et suppressions")
+
+    from spatial import SpatialGrid
+
+    grid = SpatialGrid(cell_size=100)
+    alice = Entity("alice", 50, 50)
+    grid["alice"] = alice
+    assert grid.nearest(60, 60) == [alice]
+
+    alice.x, alice.y = 2000, 2000
+    grid.relocate("alice")
+    assert grid.query_radius(60, 60, 200) == []
+    assert grid.query_radius(2000, 2000, 10) == [alice]
+
+    alice.dungeon_instance = "dungeon_instance_2"
+    grid.relocate("alice")
+    assert grid.instance_items("") == []
+    assert grid.instance_items("dungeon_instance_2") == [("alice", alice)]
+
+    grid["alice"] = Entity("alice", 10, 10)
+    assert len(grid.cells) == 1, "L'ancienne cellule doit être libérée"
+    del grid["alice"]
+    assert not grid.cells and not grid.cell_of and not grid.instances
+    print("    ✅ Grille à jour après déplacement, changement d'instance et suppression")
+    return True
+
+
+def test_multishot_hits_nearest_in_instance():
+    """Le tir multiple vise les 3 monstres les plus proches de la même instance"""
+    print("🧪 Test: Tir multiple ciblé")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    game_server.monsters.clear()
+    archer = server.Player(id="player_0", name="Robin", player_class="Archer", x=1000, y=1000, attack=10)
+    game_server.players[archer.id] = archer
+
+    def add_monster(monster_id, x, y, instance=""):
+        monster = server.Monster(id=monster_id, x=x, y=y, hp=100, max_hp=100, attack=1, defense=0, xp_reward=1)
+        monster.dungeon_instance = instance
+        game_server.monsters[monster_id] = monster
+        return monster
+
+    far = add_monster("far", 100, 100)
+    dungeon = add_monster("dungeon", 1001, 1001, "dungeon_instance_9")
+    near = [add_monster(f"near_{i}", 1000 + 30 * i, 1000) for i in range(1, 5)]
+
+    game_server.use_player_ability(archer, "multishot")
+    hit = {m.id for m in [far, dungeon] + near if m.hp < 100}
+    assert hit == {"near_1", "near_2", "near_3"}, f"Cibles touchées: {hit}"
+    print("    ✅ Seuls les 3 monstres proches du monde principal sont touchés")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_queries_match_brute_force, test_index_follows_moves_and_removals,
+             test_multishot_hits_nearest_in_instance]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
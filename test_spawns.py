@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test des tables d'apparition des monstres
+"""
+
+import random
+import sys
+
+sys.path.append('.')
+
+
+def test_initial_population():
+    """La population initiale garde les mêmes identifiants et respecte les règles"""
+    print("🧪 Test: Population initiale")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    rules = game_server.spawns.rules
+    assert len(game_server.monsters) == sum(rule.count for rule in rules) == 94
+    assert "Slime_plains_0" in game_server.monsters and "monster_random_19" in game_server.monsters
+
+    for monster in game_server.monsters.values():
+        rule = rules[monster.spawn_slot]
+        assert rule.x_range[0] <= monster.x <= rule.x_range[1]
+        assert rule.y_range[0] <= monster.y <= rule.y_range[1]
+        assert rule.hp_range[0] <= monster.hp == monster.max_hp <= rule.hp_range[1]
+        assert rule.attack_range[0] <= monster.attack <= rule.attack_range[1]
+    print("    ✅ 94 monstres, positions et stats dans leurs règles")
+    return True
+
+
+def test_respawn_uses_slot():
+    """Le respawn relit la règle du monstre, sans dépendre de son identifiant"""
+    print("🧪 Test: Respawn par règle")
+
+    import server
+    from spawns import SpawnTable
+
+    game_server = server.GameServer("localhost", 0)
+    game_server.spawns = SpawnTable(rng=random.Random(19))
+    golem_slot = next(slot for slot, rule in enumerate(game_server.spawns.rules) if rule.monster_type == "Golem")
+
+    # Identifiant sans rapport avec la zone : seule la règle compte
+    game_server.spawn_from_slot("mystery", golem_slot)
+    monster = game_server.monsters["mystery"]
+    monster.alive = False
+    game_server.respawn_monster("mystery")
+    respawned = game_server.monsters["mystery"]
+    rule = game_server.spawns.rules[golem_slot]
+    assert respawned is not monster and respawned.alive
+    assert respawned.spawn_slot == golem_slot
+    assert rule.x_range[0] <= respawned.x <= rule.x_range[1] and rule.hp_range[0] <= respawned.hp <= rule.hp_range[1]
+
+    # Sans règle (monstre de donjon, monstre de test), pas de respawn
+    orphan = server.Monster(id="Golem_crystal_99", x=0, y=0, hp=0, max_hp=10, attack=1, defense=0, xp_reward=1,
+                            alive=False)
+    game_server.monsters[orphan.id] = orphan
+    game_server.respawn_monster(orphan.id)
+    assert game_server.monsters[orphan.id] is orphan
+    print("    ✅ Respawn dans la zone de la règle, rien sans règle")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_initial_population, test_respawn_uses_slot]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test des stats de joueur par couches (base, améliorations, équipement, bonus temporaires)
+"""
+
+import sys
+from unittest.mock import Mock
+
+sys.path.append('.')
+
+
+def make_player(player_class="Warrior"):
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    player = server.Player(id="player_0", name="Alice", player_class=player_class, socket=Mock())
+    game_server.players[player.id] = player
+    game_server.calculate_player_stats(player)
+    return game_server, player
+
+
+def test_derived_stats_are_cached():
+    """Les stats dérivées ne sont recalculées que si une couche est sale"""
+    print("🧪 Test: Cache des stats dérivées")
+
+    from stats import PlayerStats
+
+    stats = PlayerStats()
+    stats.set_base("Mage", 3)
+    derived = stats.derive()
+    assert derived['attack'] == 8 + 2 * 2 and derived['max_mana'] == 100 + 2 * 10 + 3 * 2
+    assert derived['max_hp'] == 80 + 2 * 20 + derived['attack'] * 2
+    assert stats.derive() is derived, "Aucune couche sale : le cache est réutilisé"
+
+    stats.set_base("Mage", 3)
+    assert stats.derive() is derived, "Même classe et même niveau : pas de recalcul"
+    stats.upgrade('defense', 2)
+    assert stats.derive() is not derived and stats.derive()['defense'] == derived['defense'] + 2
+    print("    ✅ Recalcul uniquement après un changement de couche")
+    return True
+
+
+def test_buff_survives_equipment_change():
+    """Un bonus temporaire n'est ni effacé ni compté deux fois par un recalcul d'équipement"""
+    print("🧪 Test: Bonus temporaire et équipement")
+
+    import config
+    import server
+
+    game_server, player = make_player("Warrior")
+    player.mana = player.max_mana
+    base_attack = player.attack
+    max_hp = player.max_hp
+
+    game_server.use_player_ability(player, "charge")
+    assert player.attack == base_attack + 5
+    assert player.max_hp == max_hp, "Les HP max ne suivent pas les bonus temporaires"
+
+    player.inventory["iron_sword"] = server.ItemStack(item=game_server.items["iron_sword"])
+    sword_attack = game_server.items["iron_sword"].stats["attack"]
+    game_server.equip_item(player, "iron_sword")
+    assert player.attack == base_attack + 5 + sword_attack, "Le recalcul d'équipement a effacé la charge"
+
+    # Fin de la charge : seul le bonus temporaire disparaît
+    for _ in range(11 * config.GAME_UPDATE_RATE):
+        game_server.timers.advance()
+    assert player.attack == base_attack + sword_attack
+    game_server.unequip_item(player, "weapon")
+    assert player.attack == base_attack
+    print("    ✅ Charge conservée pendant l'équipement, retirée une seule fois")
+    return True
+
+
+def test_upgrades_and_levels_are_permanent():
+    """Les points de compétence et les niveaux survivent aux recalculs"""
+    print("🧪 Test: Améliorations permanentes")
+
+    import server
+
+    game_server, player = make_player("Rogue")
+    player.skill_points = 2
+    crit = player.critical_chance
+    game_server.upgrade_player_stat(player, "critical")
+    game_server.upgrade_player_stat(player, "unknown")
+    assert player.skill_points == 1, "Une stat inconnue ne consomme pas de point"
+
+    player.inventory["leather_armor"] = server.ItemStack(item=game_server.items["leather_armor"])
+    game_server.equip_item(player, "leather_armor")
+    assert abs(player.critical_chance - (crit + 0.05)) < 1e-9, "L'amélioration a été effacée par l'équipement"
+
+    attack = player.attack
+    player.xp = player.xp_to_next
+    game_server.level_up_player(player)
+    assert player.attack == attack + 2 and player.hp == player.max_hp
+    print("    ✅ Améliorations et croissance de niveau conservées")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_derived_stats_are_cached, test_buff_survives_equipment_change,
+             test_upgrades_and_levels_are_permanent]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
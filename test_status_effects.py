@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test des effets d'état temporaires (durée, cumul, modificateurs, expiration)
+"""
+
+import sys
+from unittest.mock import Mock
+
+sys.path.append('.')
+
+
+class Dummy:
+    """Entité minimale portant des effets"""
+
+    def __init__(self):
+        self.attack = 10
+        self.defense = 4
+        self.effects = None  # Créé au premier effet, comme sur Player et Monster
+
+
+def test_stacking_rules():
+    """refresh repousse l'expiration, stack empile, ignore ne change rien"""
+    print("🧪 Test: Règles de cumul")
+
+    from effects import IGNORE, STACK, EffectSpec, StatusEffects
+    from timers import TimerQueue
+
+    timers = TimerQueue(10)
+    changes = []
+    engine = StatusEffects(timers, lambda entity: (changes.append(entity), entity.effects.apply_to(entity)))
+    entity = Dummy()
+
+    buff = EffectSpec('buff', 1.0, add=(('attack', 3),))
+    engine.apply(entity, buff)
+    assert entity.attack == 13 and len(changes) == 1
+    for _ in range(5):
+        timers.advance()
+    engine.apply(entity, buff)
+    assert len(changes) == 1, "Rafraîchir ne recalcule pas les stats"
+    for _ in range(9):
+        timers.advance()
+    assert entity.attack == 13, "L'expiration a été repoussée"
+    timers.advance()
+    assert entity.attack == 10 and entity.effects is None and len(changes) == 2, "Ensemble vide libéré"
+
+    stack = EffectSpec('stack', 1.0, add=(('attack', 2),), stacking=STACK, max_stacks=2)
+    for _ in range(3):
+        engine.apply(entity, stack)
+    assert entity.attack == 14 and entity.effects['stack'].stacks == 2
+
+    shield = EffectSpec('shield', 1.0, mult=(('defense', 2.0),), stacking=IGNORE)
+    first = engine.apply(entity, shield)
+    assert engine.apply(entity, shield) is first and entity.defense == 8
+    for _ in range(10):
+        timers.advance()
+    assert (entity.attack, entity.defense) == (10, 4) and entity.effects is None
+    print("    ✅ Cumul, expiration et restauration exacte")
+    return True
+
+
+def test_boss_buffs_restore_exactly():
+    """Rage et Invisibilité superposées : les stats du boss reviennent exactement"""
+    print("🧪 Test: Effets de boss")
+
+    import config
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    boss = server.Monster(id="boss", x=0, y=0, hp=500, max_hp=500, attack=25, defense=7, xp_reward=1,
+                          is_boss=True, boss_abilities=["rage"])
+    player = server.Player(id="player_0", name="Alice", socket=Mock())
+    game_server.monsters[boss.id] = boss
+    assert boss.effects is None, "Pas d'ensemble d'effets avant le premier effet"
+
+    game_server.use_boss_ability(boss, player)
+    game_server.use_boss_ability(boss, player)
+    assert boss.attack == 37, "Deux rages superposées ne se cumulent pas"
+    boss.boss_abilities = ["invisibility"]
+    game_server.use_boss_ability(boss, player)
+    assert boss.defense == 14
+    assert game_server.monsters.table.get(boss.id, 'attack') == 37, "La table des monstres suit l'effet"
+
+    for _ in range(11 * config.GAME_UPDATE_RATE):
+        game_server.timers.advance()
+    assert (boss.attack, boss.defense) == (25, 7) and boss.effects is None
+    print("    ✅ 25 ATK / 7 DEF restaurés après les effets")
+    return True
+
+
+def test_player_effects_follow_layers():
+    """Une Charge relancée avant sa fin ne double pas le bonus"""
+    print("🧪 Test: Effets de joueur")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    player = server.Player(id="player_0", name="Alice", player_class="Warrior", socket=Mock(dropped_frames=0))
+    game_server.players[player.id] = player
+    game_server.clients[player.socket] = player
+    game_server.calculate_player_stats(player)
+    base_attack = player.attack
+
+    player.mana = 100
+    game_server.use_player_ability(player, "charge")
+    player.last_ability_use = 0  # Ignorer le temps de recharge
+    game_server.use_player_ability(player, "charge")
+    assert player.attack == base_attack + 5
+
+    game_server.remove_client(player.socket)
+    assert all(t.cancelled for t in game_server.timers.heap if t.owner == player.id), \
+        "Les effets d'un joueur déconnecté sont annulés"
+    print("    ✅ Bonus unique, effets annulés à la déconnexion")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_stacking_rules, test_boss_buffs_restore_exactly, test_player_effects_follow_layers]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
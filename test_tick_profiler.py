@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test du profileur des phases de tick
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from unittest.mock import Mock
+
+sys.path.append('.')
+
+
+def test_phase_percentiles():
+    """Durées cumulées par tick, percentiles sur la fenêtre, autres threads ignorés"""
+    print("🧪 Test: Percentiles par phase")
+
+    from profiler import TickProfiler
+
+    now = [0.0]
+    profiler = TickProfiler(window=100, clock=lambda: now[0])
+    for i in range(1, 101):
+        profiler.begin_tick()
+        with profiler.phase('build'):
+            now[0] += i / 1000  # 1 ms, 2 ms, ... 100 ms
+        profiler.add('send', 0.001)
+        profiler.add('send', 0.002)  # Plusieurs envois : cumulés dans le tick
+        profiler.add_bytes(10)
+        other = threading.Thread(target=profiler.add, args=('send', 5.0))
+        other.start()
+        other.join()
+        profiler.end_tick()
+
+    stats = profiler.stats()
+    build = stats['phases']['build']
+    assert [round(build[key], 6) for key in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms')] == [50, 95, 99, 100]
+    assert abs(stats['phases']['send']['max_ms'] - 3.0) < 1e-9, "Les envois d'un autre thread sont ignorés"
+    assert stats['ticks'] == 100 and stats['bytes_per_tick']['total'] == 1000
+    print("    ✅ p50/p95/p99/max exacts")
+    return True
+
+
+def test_nested_phases_exclusive():
+    """Une phase imbriquée n'est pas recomptée dans la phase qui l'englobe"""
+    print("🧪 Test: Phases imbriquées disjointes")
+
+    from profiler import TickProfiler
+
+    now = [0.0]
+    profiler = TickProfiler(clock=lambda: now[0])
+    profiler.begin_tick()
+    with profiler.phase('dispatch'):
+        now[0] += 0.002
+        with profiler.phase('encode'):
+            now[0] += 0.003
+        started = profiler.clock()
+        now[0] += 0.001
+        profiler.add('send', profiler.clock() - started)
+    profiler.end_tick()
+
+    phases = profiler.stats()['phases']
+    assert [round(phases[name]['max_ms'], 6) for name in ('dispatch', 'encode', 'send', 'tick')] == [2, 3, 1, 6]
+    print("    ✅ dispatch 2 ms + encode 3 ms + send 1 ms = tick 6 ms")
+    return True
+
+
+def test_broadcast_bytes_profiled():
+    """Les octets des broadcasts entrent dans les octets envoyés du tick"""
+    print("🧪 Test: Octets des broadcasts")
+
+    import server
+    from framing import encode_message
+
+    game_server = server.GameServer("localhost", 0)
+    for i in range(2):
+        client_socket = Mock(spec=['send'])
+        player = server.Player(id=f"player_{i}", name=f"P{i}", socket=client_socket)
+        game_server.players[player.id] = player
+        game_server.clients[client_socket] = player
+
+    message = {'type': 'chat', 'text': 'Bonjour'}
+    game_server.profiler.begin_tick()
+    game_server.broadcast_message(message)
+    game_server.broadcast_to_instance(message)
+    game_server.profiler.end_tick()
+    assert game_server.get_profile_stats()['bytes_per_tick']['total'] == 4 * len(encode_message(message))
+    print("    ✅ 4 envois comptés")
+    return True
+
+
+def test_server_tick_phases():
+    """Un tick du serveur remplit les phases, l'attente du verrou et les octets envoyés"""
+    print("🧪 Test: Phases d'un tick du serveur")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    client_socket = Mock(spec=['send'])
+    player = server.Player(id="player_0", name="Alice", hp=100_000, socket=client_socket)
+    game_server.players[player.id] = player
+    game_server.clients[client_socket] = player
+    for _ in range(5):
+        game_server.run_tick()
+
+    stats = game_server.get_profile_stats()
+    for name in ('tick', 'lock_wait', 'timers', 'ai', 'snapshot_build', 'dispatch', 'encode', 'send'):
+        assert stats['phases'][name]['samples'] == 5, f"Phase {name} manquante"
+    assert stats['bytes_per_tick']['p50'] > 0
+
+    path = os.path.join(tempfile.mkdtemp(), "profile.json")
+    game_server.profile_dump_path = path
+    game_server.stop_server()
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['ticks'] == 5
+    print(f"    ✅ {len(stats['phases'])} phases, {stats['bytes_per_tick']['p50']} octets par tick, profil écrit")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_phase_percentiles, test_nested_phases_exclusive, test_broadcast_bytes_profiled,
+             test_server_tick_phases]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test des minuteries exécutées par la boucle de jeu
+"""
+
+import sys
+import threading
+
+sys.path.append('.')
+
+
+def test_due_order_and_cancel():
+    """Les rappels partent au bon tick, dans l'ordre, sauf s'ils sont annulés"""
+    print("🧪 Test: Échéances et annulation")
+
+    from timers import TimerQueue
+
+    timers = TimerQueue(tick_rate=10)
+    fired = []
+    timers.schedule(0.3, fired.append, "c")
+    timers.schedule(0.1, fired.append, "a")
+    cancelled = timers.schedule(0.2, fired.append, "x")
+    timers.schedule(0.2, fired.append, "b")
+    assert len(timers) == 4
+
+    assert cancelled.cancel() is True
+    assert cancelled.cancel() is False, "Une seconde annulation ne fait rien"
+    assert len(timers) == 3
+
+    timers.advance()
+    assert fired == ["a"]
+    timers.advance()
+    timers.advance()
+    assert fired == ["a", "b", "c"], f"Ordre inattendu: {fired}"
+    assert len(timers) == 0
+    assert timers.stats()['fired'] == 3 and timers.stats()['cancelled'] == 1
+    print("    ✅ Rappels au bon tick, annulation respectée")
+    return True
+
+
+def test_cancel_owner_and_compaction():
+    """Annulation par propriétaire ; le tas est compacté quand les annulées dominent"""
+    print("🧪 Test: Annulation par propriétaire")
+
+    from timers import TimerQueue
+
+    timers = TimerQueue(tick_rate=30)
+    fired = []
+    for i in range(200):
+        timers.schedule(5.0, fired.append, i, owner="player_1" if i % 4 else "player_2")
+    assert timers.cancel_owner("player_1") == 150
+    assert len(timers) == 50
+    assert timers.stats()['heap_size'] == 50, "Le tas doit être compacté"
+
+    for _ in range(150):
+        timers.advance()
+    assert sorted(fired) == list(range(0, 200, 4)), "Seules les minuteries de player_2 s'exécutent"
+    print("    ✅ 150 minuteries annulées d'un coup, tas compacté")
+    return True
+
+
+def test_server_uses_timers_not_threads():
+    """Un monstre tué est replanifié dans la file, sans nouveau thread"""
+    print("🧪 Test: Respawn sans thread")
+
+    import config
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    # Assez de HP pour survivre aux monstres voisins (IA) pendant les 10 s
+    player = server.Player(id="player_0", name="Alice", attack=1000, hp=100_000)
+    game_server.players[player.id] = player
+    monster_id, monster = next(iter(game_server.monsters.items()))
+    monster.x, monster.y = player.x, player.y
+
+    threads_before = threading.active_count()
+    with game_server.lock:
+        game_server.handle_combat(player, monster)
+    assert not monster.alive
+    assert threading.active_count() == threads_before, "Aucun thread ne doit être créé"
+    assert len(game_server.timers) == 1
+
+    for _ in range(10 * config.GAME_UPDATE_RATE):
+        game_server.run_tick()
+    assert game_server.monsters[monster_id].alive, "Le monstre doit réapparaître après 10 s de ticks"
+    assert game_server.get_timer_stats()['pending'] == 0
+    print("    ✅ Respawn exécuté par la boucle de jeu")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_due_order_and_cancel, test_cancel_owner_and_compaction, test_server_uses_timers_not_threads]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test du pas de temps fixe de la boucle de jeu
+"""
+
+import sys
+
+sys.path.append('.')
+
+
+class FakeClock:
+    """Horloge manuelle : sleep() avance le temps"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, duration):
+        self.slept += duration
+        self.now += duration
+
+
+def make_timestep(clock, max_catch_up=3):
+    from timestep import FixedTimestep
+    return FixedTimestep(rate=10, max_catch_up=max_catch_up, clock=clock, sleep=clock.sleep)
+
+
+def test_no_drift():
+    """Le temps de travail est pris sur l'attente : la fréquence ne dérive pas"""
+    print("🧪 Test: Pas de dérive")
+
+    clock = FakeClock()
+    timestep = make_timestep(clock)
+    start = clock.now
+    for _ in range(50):
+        assert timestep.wait() == 1
+        clock.now += 0.04  # Travail de 40 ms sur un budget de 100 ms
+        timestep.record(0.04)
+
+    # 50 ticks à 10 Hz : le 50e démarre à 4,9 s, et il a fini à 4,94 s
+    assert abs(clock.now - start - 4.94) < 1e-9, f"Dérive: {clock.now - start:.3f} s"
+    stats = timestep.stats()
+    assert stats['ticks'] == 50 and stats['overruns'] == 0
+    assert abs(stats['budget_used'] - 0.4) < 1e-9
+    print("    ✅ 50 ticks en 4,9 s malgré 40 ms de travail par tick")
+    return True
+
+
+def test_catch_up_and_skip():
+    """Un petit retard est rattrapé, un gros retard est abandonné"""
+    print("🧪 Test: Rattrapage et ticks sautés")
+
+    clock = FakeClock()
+    timestep = make_timestep(clock, max_catch_up=3)
+    assert timestep.wait() == 1
+
+    # Tick de 350 ms : trois échéances dépassées, on les enchaîne
+    clock.now += 0.35
+    timestep.record(0.35)
+    assert timestep.wait() == 3, "Le retard doit être rattrapé"
+    assert timestep.overruns == 1 and timestep.catch_up_ticks == 2
+
+    # Pause d'une seconde : seuls max_catch_up ticks sont lancés
+    clock.now += 1.0
+    due = timestep.wait()
+    assert due == 3, f"Au plus 3 ticks d'affilée, {due} demandés"
+    assert timestep.skipped_ticks == 7, f"Ticks sautés: {timestep.skipped_ticks}"
+
+    # Ensuite, la cadence normale reprend
+    slept = clock.slept
+    assert timestep.wait() == 1
+    assert abs(clock.slept - slept - 0.1) < 1e-9, "Un tick d'attente après le saut"
+    print("    ✅ Retard rattrapé, puis abandonné au-delà de 3 ticks")
+    return True
+
+
+def test_server_tick_stats():
+    """Le serveur expose ses statistiques de tick"""
+    print("🧪 Test: Statistiques de tick du serveur")
+
+    import server
+
+    game_server = server.GameServer("localhost", 0)
+    game_server.run_tick()
+    game_server.timestep.record(0.002)
+    stats = game_server.get_tick_stats()
+    assert stats['tick'] == game_server.tick == 1
+    assert stats['ticks'] == 1 and stats['overruns'] == 0
+    assert abs(stats['budget_ms'] - 1000 / 30) < 1e-6
+    print(f"    ✅ Budget {stats['budget_ms']:.1f} ms, travail {stats['last_work_ms']:.1f} ms")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_no_drift, test_catch_up_and_skip, test_server_tick_stats]
+    passed = sum(1 for test in tests if test())
+    print(f"=== RÉSULTATS : {passed}/{len(tests)} tests réussis ===")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,147 @@
+"""
+Minuteries du serveur, exécutées par la boucle de jeu.
+
+Remplace les threading.Timer (un thread par respawn ou effet temporaire) :
+les échéances sont rangées dans un tas et comptées en ticks de la boucle
+de jeu. advance() est appelé une fois par tick et lance les rappels arrivés
+à échéance, dans le thread de la boucle (sous le verrou du serveur).
+
+Une annulation marque la minuterie ; elle est retirée du tas quand elle
+arrive en tête, ou lors d'un compactage si les annulées s'accumulent.
+"""
+import heapq
+import itertools
+import math
+import threading
+import traceback
+from typing import Any, Callable, Dict, List
+
+
+class Timer:
+    """Rappel planifié ; cancel() l'empêche de s'exécuter"""
+
+    __slots__ = ('due_tick', 'seq', 'callback', 'args', 'owner', 'cancelled', 'queue')
+
+    def __init__(self, due_tick: int, seq: int, callback: Callable, args: tuple, owner: Any, queue):
+        self.due_tick = due_tick
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.owner = owner
+        self.cancelled = False
+        self.queue = queue
+
+    def __lt__(self, other):
+        return (self.due_tick, self.seq) < (other.due_tick, other.seq)
+
+    def cancel(self) -> bool:
+        queue = self.queue
+        return queue.cancel(self) if queue is not None else False
+
+
+class TimerQueue:
+    """Tas de minuteries cadencé par les ticks de la boucle de jeu"""
+
+    def __init__(self, tick_rate: float):
+        self.tick_rate = tick_rate
+        self.tick = 0
+        self.heap: List[Timer] = []
+        self.by_owner: Dict[Any, set] = {}
+        self.counter = itertools.count()
+        self.lock = threading.Lock()  # Planification possible depuis les threads réseau
+        self.pending = 0
+        self.cancelled_in_heap = 0
+        self.scheduled_total = 0
+        self.fired_total = 0
+        self.cancelled_total = 0
+
+    def schedule(self, delay: float, callback: Callable, *args, owner: Any = None) -> Timer:
+        """Lance callback(*args) dans delay secondes (arrondi au tick, au moins un tick)"""
+        ticks = max(1, math.ceil(delay * self.tick_rate - 1e-9))
+        with self.lock:
+            timer = Timer(self.tick + ticks, next(self.counter), callback, args, owner, self)
+            heapq.heappush(self.heap, timer)
+            if owner is not None:
+                self.by_owner.setdefault(owner, set()).add(timer)
+            self.pending += 1
+            self.scheduled_total += 1
+        return timer
+
+    def cancel(self, timer: Timer) -> bool:
+        with self.lock:
+            if timer.cancelled or timer.queue is None:
+                return False  # Déjà annulée ou déjà exécutée
+            self.mark_cancelled(timer)
+            self.compact_if_needed()
+        return True
+
+    def cancel_owner(self, owner: Any) -> int:
+        """Annule toutes les minuteries d'un propriétaire (joueur déconnecté...)"""
+        with self.lock:
+            timers = self.by_owner.pop(owner, ())
+            for timer in timers:
+                self.mark_cancelled(timer, forget_owner=False)
+            self.compact_if_needed()
+        return len(timers)
+
+    def mark_cancelled(self, timer: Timer, forget_owner: bool = True):
+        timer.cancelled = True
+        timer.queue = None
+        self.pending -= 1
+        self.cancelled_in_heap += 1
+        self.cancelled_total += 1
+        if forget_owner:
+            self.forget_owner(timer)
+
+    def forget_owner(self, timer: Timer):
+        if timer.owner is None:
+            return
+        timers = self.by_owner.get(timer.owner)
+        if timers is not None:
+            timers.discard(timer)
+            if not timers:
+                del self.by_owner[timer.owner]
+
+    def compact_if_needed(self):
+        # Les annulées restent dans le tas ; le reconstruire quand elles y sont majoritaires
+        if self.cancelled_in_heap > 64 and self.cancelled_in_heap * 2 > len(self.heap):
+            self.heap = [timer for timer in self.heap if not timer.cancelled]
+            heapq.heapify(self.heap)
+            self.cancelled_in_heap = 0
+
+    def advance(self) -> int:
+        """Passe au tick suivant et exécute les rappels échus, retourne leur nombre"""
+        due = []
+        with self.lock:
+            self.tick += 1
+            while self.heap and self.heap[0].due_tick <= self.tick:
+                timer = heapq.heappop(self.heap)
+                if timer.cancelled:
+                    self.cancelled_in_heap -= 1
+                    continue
+                timer.queue = None
+                self.pending -= 1
+                self.forget_owner(timer)
+                due.append(timer)
+
+        # Hors du verrou : un rappel peut planifier ou annuler d'autres minuteries
+        for timer in due:
+            try:
+                timer.callback(*timer.args)
+            except Exception as e:
+                print(f"Erreur minuterie {getattr(timer.callback, '__name__', timer.callback)}: {e}")
+                traceback.print_exc()
+        self.fired_total += len(due)
+        return len(due)
+
+    def __len__(self):
+        return self.pending
+
+    def stats(self) -> dict:
+        return {
+            'pending': self.pending,
+            'scheduled': self.scheduled_total,
+            'fired': self.fired_total,
+            'cancelled': self.cancelled_total,
+            'heap_size': len(self.heap)
+        }
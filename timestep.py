@@ -0,0 +1,76 @@
+"""
+Pas de temps fixe pour la boucle de jeu du serveur.
+
+Les ticks sont cadencés sur une horloge monotone : l'échéance du tick suivant
+est calculée depuis l'échéance précédente (et non depuis la fin du travail),
+donc la fréquence ne dérive pas quand un tick prend du temps. En retard de
+quelques ticks, la boucle rattrape en les enchaînant sans dormir ; au-delà
+de max_catch_up, le retard est abandonné et compté comme ticks sautés.
+
+Chaque tick enregistre son temps de travail par rapport au budget (la durée
+d'un tick), pour voir quand le serveur ne suit plus.
+"""
+import time
+from collections import deque
+
+
+class FixedTimestep:
+    """Cadence des ticks et comptabilité du budget par tick"""
+
+    def __init__(self, rate: float, max_catch_up: int = 3, window: int = 300,
+                 clock=time.perf_counter, sleep=time.sleep):
+        self.interval = 1.0 / rate
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.sleep = sleep
+        self.next_deadline = None
+        self.ticks = 0  # Ticks exécutés
+        self.overruns = 0  # Ticks plus longs que le budget
+        self.catch_up_ticks = 0  # Ticks lancés en retard, sans attendre
+        self.skipped_ticks = 0  # Ticks abandonnés pour rattraper l'horloge
+        self.last_work = 0.0
+        self.max_work = 0.0
+        self.work_times = deque(maxlen=window)  # Derniers temps de travail (secondes)
+
+    def wait(self) -> int:
+        """Attend la prochaine échéance, retourne le nombre de ticks à exécuter"""
+        now = self.clock()
+        if self.next_deadline is None:
+            self.next_deadline = now
+        if now < self.next_deadline:
+            self.sleep(self.next_deadline - now)
+            now = self.clock()
+
+        due = int((now - self.next_deadline) / self.interval) + 1
+        if due > self.max_catch_up:
+            # Trop en retard : repartir de maintenant plutôt que d'enchaîner les ticks
+            self.skipped_ticks += due - self.max_catch_up
+            self.next_deadline = now - (self.max_catch_up - 1) * self.interval
+            due = self.max_catch_up
+        self.catch_up_ticks += due - 1
+        self.next_deadline += due * self.interval
+        return due
+
+    def record(self, work_time: float):
+        """Temps de travail d'un tick"""
+        self.ticks += 1
+        self.last_work = work_time
+        self.max_work = max(self.max_work, work_time)
+        self.work_times.append(work_time)
+        if work_time > self.interval:
+            self.overruns += 1
+
+    def stats(self) -> dict:
+        recent = list(self.work_times)
+        average = sum(recent) / len(recent) if recent else 0.0
+        return {
+            'ticks': self.ticks,
+            'budget_ms': self.interval * 1000,
+            'last_work_ms': self.last_work * 1000,
+            'avg_work_ms': average * 1000,
+            'max_work_ms': self.max_work * 1000,
+            'budget_used': average / self.interval,
+            'overruns': self.overruns,
+            'catch_up_ticks': self.catch_up_ticks,
+            'skipped_ticks': self.skipped_ticks
+        }
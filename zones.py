@@ -0,0 +1,106 @@
+"""
+Activité des zones du monde et des instances de donjon.
+
+Une zone (une case de la grille 3 x 3 des ZONES, ou une instance de donjon)
+est observée si un joueur s'y trouve ou en est à moins de radius pixels.
+Une zone sans observateur est endormie : ses respawns sont mis de côté et sa
+régénération suspendue. Au réveil, update() signale la zone avec l'heure de
+son endormissement pour que le serveur rattrape d'un coup ce qui était dû
+(respawns en attente, régénération calculée sur la durée écoulée).
+"""
+import time
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from spawns import WORLD_HEIGHT, WORLD_WIDTH, ZONES
+
+
+class ZoneActivity:
+    """Zones observées, zones endormies depuis quand, respawns en attente"""
+
+    def __init__(self, radius: float, zones=ZONES, width: int = WORLD_WIDTH, height: int = WORLD_HEIGHT,
+                 now: Optional[float] = None):
+        now = time.time() if now is None else now
+        self.radius = radius
+        self.names = {(column, row): name for name, column, row, *_ in zones}
+        self.columns = max(column for column, _ in self.names) + 1
+        self.rows = max(row for _, row in self.names) + 1
+        self.zone_width = width // self.columns
+        self.zone_height = height // self.rows
+        self.rects = {name: self.cell_rect(column, row, width, height) for (column, row), name in self.names.items()}
+        self.active: Set[Hashable] = set()
+        # Zones du monde endormies depuis le démarrage ; une instance inconnue n'a rien à rattraper
+        self.dormant_since: Dict[Hashable, float] = dict.fromkeys(self.names.values(), now)
+        self.deferred: Dict[Hashable, List[str]] = {}  # zone -> monstres à faire réapparaître
+        self.woken_total = 0
+
+    def cell(self, x: float, y: float) -> Tuple[int, int]:
+        column = min(self.columns - 1, max(0, int(x // self.zone_width)))
+        row = min(self.rows - 1, max(0, int(y // self.zone_height)))
+        return column, row
+
+    def zone_of(self, x: float, y: float, instance: str = '') -> Hashable:
+        """Zone d'une position : l'instance si elle est dans un donjon, sinon la case du monde"""
+        if instance:
+            return instance
+        return self.names.get(self.cell(x, y))
+
+    def cell_rect(self, column: int, row: int, width: int, height: int) -> Tuple[float, float, float, float]:
+        """Rectangle (x0, y0, x1, y1) d'une case ; la dernière ligne et la dernière colonne vont jusqu'au bord"""
+        x1 = width if column == self.columns - 1 else (column + 1) * self.zone_width
+        y1 = height if row == self.rows - 1 else (row + 1) * self.zone_height
+        return column * self.zone_width, row * self.zone_height, x1, y1
+
+    def observed(self, players: Iterable) -> Set[Hashable]:
+        """Zones observées par au moins un joueur"""
+        zones = set()
+        radius = self.radius
+        for player in players:
+            instance = player.dungeon_instance
+            if instance:
+                zones.add(instance)
+                continue
+            c0, r0 = self.cell(player.x - radius, player.y - radius)
+            c1, r1 = self.cell(player.x + radius, player.y + radius)
+            for column in range(c0, c1 + 1):
+                for row in range(r0, r1 + 1):
+                    name = self.names.get((column, row))
+                    if name is not None:
+                        zones.add(name)
+        return zones
+
+    def update(self, players: Iterable, now: Optional[float] = None) -> List[Tuple[Hashable, float]]:
+        """Recalcule les zones observées ; retourne les zones réveillées et l'heure de leur endormissement"""
+        now = time.time() if now is None else now
+        active = self.observed(players)
+        if active == self.active:
+            return []
+        for zone in self.active - active:
+            self.dormant_since[zone] = now
+        woken = [(zone, self.dormant_since.pop(zone, now)) for zone in active - self.active]
+        self.active = active
+        self.woken_total += len(woken)
+        return woken
+
+    def is_active(self, zone: Hashable) -> bool:
+        return zone in self.active
+
+    def defer(self, zone: Hashable, monster_id: str):
+        """Met de côté le respawn d'un monstre d'une zone endormie"""
+        self.deferred.setdefault(zone, []).append(monster_id)
+
+    def take_deferred(self, zone: Hashable) -> List[str]:
+        return self.deferred.pop(zone, [])
+
+    def forget(self, zone: Hashable):
+        """Oublie une zone supprimée (instance de donjon fermée)"""
+        self.active.discard(zone)
+        self.dormant_since.pop(zone, None)
+        self.deferred.pop(zone, None)
+
+    def stats(self) -> dict:
+        return {
+            'active': len(self.active),
+            'dormant': len(self.dormant_since),
+            'deferred_respawns': sum(len(ids) for ids in self.deferred.values()),
+            'woken_total': self.woken_total
+        }